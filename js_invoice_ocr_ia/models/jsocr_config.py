@@ -50,6 +50,247 @@ class JsocrConfig(models.Model):
         help='Timeout en secondes pour les requetes Ollama (default: 120s)'
     )
 
+    ollama_stream = fields.Boolean(
+        string='Ollama Streaming',
+        default=True,
+        help='Recevoir la reponse Ollama au fil de la generation et l\'arreter des que '
+             'l\'objet JSON est complet, sans attendre le texte que le modele ajoute apres'
+    )
+
+    ollama_output_format = fields.Selection(
+        selection=[
+            ('schema', 'JSON Schema'),
+            ('json', 'JSON'),
+            ('text', 'Text'),
+        ],
+        string='Ollama Output Format',
+        default='schema',
+        help='Contrainte de sortie envoyee a Ollama: schema JSON de la facture (Ollama 0.5+), '
+             'JSON quelconque, ou texte libre analyse a posteriori. Une reponse qui n\'est '
+             'pas un objet JSON est toujours analysee comme du texte'
+    )
+
+    ollama_connect_timeout = fields.Integer(
+        string='Ollama Connect Timeout',
+        default=10,
+        help='Timeout en secondes pour etablir la connexion au serveur Ollama, '
+             'separe du temps de generation (default: 10s)'
+    )
+
+    ollama_pool_size = fields.Integer(
+        string='Ollama Connection Pool Size',
+        default=4,
+        help='Connexions maintenues ouvertes (keep-alive) vers le serveur Ollama par '
+             'processus Odoo. Evite une connexion TCP/TLS par requete (default: 4)'
+    )
+
+    table_extraction_enabled = fields.Boolean(
+        string='Table Line Extraction',
+        default=True,
+        help='PDF natifs: lire les lignes de facture dans les tableaux du PDF. Si leur '
+             'somme correspond a un total du document, l\'IA ne recoit que l\'en-tete '
+             '(prompt plus court et plus rapide)'
+    )
+
+    prompt_compaction_enabled = fields.Boolean(
+        string='Prompt Compaction',
+        default=True,
+        help='Reduire le texte envoye a l\'IA: marqueurs de page, en-tetes et pieds de '
+             'page repetes sur chaque page, espaces multiples et conditions generales '
+             'sont retires (prompt plus court et plus rapide)'
+    )
+
+    prompt_max_tokens = fields.Integer(
+        string='Prompt Token Budget',
+        default=0,
+        help='Nombre maximal de tokens (estimation) du texte de facture dans le prompt. '
+             'Au-dela, les lignes du milieu du document sont retirees. '
+             '0 = illimite, sinon au moins 500'
+    )
+
+    # Extraction OCR
+    ocr_extraction_mode = fields.Selection(
+        selection=[
+            ('auto', 'Document entier'),
+            ('hybrid', 'Hybride (par page)'),
+        ],
+        string='OCR Extraction Mode',
+        default='hybrid',
+        required=True,
+        help='Document entier: une seule decision natif/scanne pour tout le PDF. '
+             'Hybride: texte natif par page, seules les pages image passent par Tesseract.'
+    )
+
+    ocr_max_workers = fields.Integer(
+        string='OCR Worker Processes',
+        default=1,
+        help='Nombre de processus Tesseract en parallele pour les pages scannees '
+             '(1 = traitement sequentiel). Plus de 1 uniquement avec un serveur '
+             'Odoo multi-processus (--workers)'
+    )
+
+    ocr_page_timeout = fields.Integer(
+        string='OCR Page Timeout',
+        default=60,
+        help='Duree maximale en secondes de l\'OCR d\'une page (0 = illimite)'
+    )
+
+    ocr_document_timeout = fields.Integer(
+        string='OCR Document Timeout',
+        default=120,
+        help='Duree maximale en secondes de l\'OCR d\'un document, pour tenir l\'objectif '
+             'de 2 minutes par facture (NFR1) (0 = illimite)'
+    )
+
+    ocr_timeout_policy = fields.Selection(
+        selection=[
+            ('degrade', 'Ignorer la page (degradee)'),
+            ('fail', 'Echec du job'),
+        ],
+        string='OCR Timeout Policy',
+        default='degrade',
+        required=True,
+        help='Traitement des pages qui depassent la duree maximale: ignorees et signalees '
+             'sur le job, ou echec du job (nouvelle tentative selon la politique de retry)'
+    )
+
+    ocr_strategy = fields.Selection(
+        selection=[
+            ('single', 'Passe unique (300 DPI)'),
+            ('tiered', 'Rapide puis escalade'),
+        ],
+        string='OCR Strategy',
+        default='tiered',
+        required=True,
+        help='Rapide puis escalade: premiere passe a basse resolution, nouvelle passe '
+             'plus precise uniquement pour les pages de faible qualite.'
+    )
+
+    ocr_min_confidence = fields.Integer(
+        string='OCR Min Confidence',
+        default=75,
+        help='Confiance moyenne des mots (0-100) en dessous de laquelle une page est re-OCRisee'
+    )
+
+    ocr_fast_tessdata_dir = fields.Char(
+        string='Fast Tessdata Folder',
+        help='Dossier des modeles tessdata_fast pour la premiere passe (optionnel)'
+    )
+
+    ocr_narrow_language = fields.Boolean(
+        string='Narrow OCR Language',
+        default=True,
+        help='Detecter la langue sur la premiere page et traiter les pages suivantes '
+             'avec cette seule langue (toutes les langues si la detection est ambigue)'
+    )
+
+    ocr_auto_rotate = fields.Boolean(
+        string='OCR Auto Rotate',
+        default=True,
+        help='Detecte l\'orientation des pages mal lues (scans tournes ou a l\'envers), '
+             'les redresse et relance l\'OCR'
+    )
+
+    ocr_searchable_pdf = fields.Boolean(
+        string='Searchable PDF',
+        default=False,
+        help='Ajoute le texte reconnu par l\'OCR comme couche de texte invisible dans le '
+             'PDF conserve, archive et joint a la facture: le PDF devient cherchable et '
+             'un nouveau traitement lit ce texte sans relancer l\'OCR'
+    )
+
+    ocr_word_index = fields.Boolean(
+        string='OCR Word Index',
+        default=True,
+        help='Conserve la position de chaque mot (texte natif et OCR) avec le travail '
+             'd\'import, pour retrouver l\'origine d\'une valeur ou relire une zone '
+             'sans nouvel OCR'
+    )
+
+    ocr_preprocess_binarize = fields.Boolean(
+        string='OCR Binarize Scans',
+        default=False,
+        help='Convertit les pages scannees en noir et blanc (seuil adaptatif) avant '
+             'l\'OCR, utile pour les fonds gris ou un eclairage inegal (NumPy requis)'
+    )
+
+    ocr_preprocess_despeckle = fields.Boolean(
+        string='OCR Despeckle Scans',
+        default=False,
+        help='Supprime les points isoles (bruit de scan) avant l\'OCR (NumPy requis)'
+    )
+
+    ocr_preprocess_deskew = fields.Boolean(
+        string='OCR Deskew Scans',
+        default=False,
+        help='Detecte l\'inclinaison des lignes de texte et redresse la page avant '
+             'l\'OCR (NumPy requis)'
+    )
+
+    ocr_engine = fields.Selection(
+        selection=[
+            ('auto', 'Automatique'),
+            ('pytesseract', 'Tesseract (processus externe)'),
+            ('tesserocr', 'Tesseract (en memoire)'),
+        ],
+        string='OCR Engine',
+        default='auto',
+        required=True,
+        help='Moteur Tesseract. En memoire (tesserocr) evite de lancer un processus '
+             'et de recharger les modeles a chaque page. Automatique l\'utilise '
+             'lorsqu\'il est installe.'
+    )
+
+    # Cache des resultats OCR
+    ocr_cache_enabled = fields.Boolean(
+        string='OCR Result Cache',
+        default=True,
+        help='Reutiliser le texte extrait d\'un PDF identique deja traite avec les memes '
+             'parametres OCR (retraitement, renvoi du meme fichier)'
+    )
+
+    ocr_cache_path = fields.Char(
+        string='OCR Cache Folder',
+        default='/opt/jsocr/cache',
+        help='Dossier local du cache des resultats OCR'
+    )
+
+    ocr_cache_max_size_mb = fields.Integer(
+        string='OCR Cache Max Size (MB)',
+        default=500,
+        help='Taille maximale du cache OCR, les entrees les moins recemment utilisees '
+             'sont supprimees au-dela (0 = illimite)'
+    )
+
+    ocr_page_cache_size = fields.Integer(
+        string='OCR Page Cache Size',
+        default=200,
+        help='Nombre de pages OCR gardees en memoire par processus: les pages recurrentes '
+             '(conditions generales, bulletins de versement) ne sont OCRisees qu\'une fois '
+             '(0 = desactive)'
+    )
+
+    ocr_page_memory_mb = fields.Integer(
+        string='OCR Page Memory Budget (MB)',
+        default=64,
+        help='Memoire maximale du rendu d\'une page: la resolution est reduite pour les '
+             'pages trop grandes (0 = illimite)'
+    )
+
+    ocr_large_document_mb = fields.Integer(
+        string='Large Document Threshold (MB)',
+        default=20,
+        help='Les PDFs plus gros sont traites par une file separee de basse priorite, '
+             'un seul a la fois (0 = pas de file separee)'
+    )
+
+    ocr_large_max_pages = fields.Integer(
+        string='Large Document Max Pages',
+        default=50,
+        help='Nombre maximal de pages extraites des gros documents, les pages suivantes '
+             'sont ignorees (0 = toutes)'
+    )
+
     # Chemins des dossiers de traitement
     watch_folder_path = fields.Char(
         string='Watch Folder',
@@ -112,6 +353,72 @@ class JsocrConfig(models.Model):
                     "L'URL Ollama n'est pas valide. Format attendu: http(s)://host:port"
                 )
 
+    @api.constrains('ollama_connect_timeout', 'ollama_pool_size')
+    def _check_ollama_connection_settings(self):
+        """Validate Ollama connect timeout and connection pool size"""
+        for record in self:
+            if record.ollama_connect_timeout < 1:
+                raise ValidationError(
+                    "Le timeout de connexion Ollama doit etre au moins 1 seconde."
+                )
+            if record.ollama_pool_size < 1:
+                raise ValidationError(
+                    "La taille du pool de connexions Ollama doit etre au moins 1."
+                )
+
+    @api.constrains('prompt_max_tokens')
+    def _check_prompt_max_tokens(self):
+        """Validate that the prompt token budget is 0 or leaves room for the invoice"""
+        from odoo.addons.js_invoice_ocr_ia.services.prompt_compaction import PromptCompactor
+
+        for record in self:
+            if record.prompt_max_tokens < 0:
+                raise ValidationError(
+                    "Le budget de tokens du prompt ne peut pas etre negatif."
+                )
+            if 0 < record.prompt_max_tokens < PromptCompactor.MIN_MAX_TOKENS:
+                raise ValidationError(
+                    "Le budget de tokens du prompt doit etre 0 (illimite) ou au moins "
+                    f"{PromptCompactor.MIN_MAX_TOKENS}."
+                )
+
+    @api.constrains('ocr_max_workers', 'ocr_page_timeout', 'ocr_document_timeout',
+                    'ocr_min_confidence',
+                    'ocr_cache_max_size_mb', 'ocr_page_cache_size', 'ocr_page_memory_mb',
+                    'ocr_large_document_mb', 'ocr_large_max_pages')
+    def _check_ocr_limits(self):
+        """Validate OCR worker count, page timeout, confidence, cache and memory limits"""
+        for record in self:
+            if record.ocr_max_workers < 1:
+                raise ValidationError(
+                    "Le nombre de processus OCR doit etre au moins 1."
+                )
+            if record.ocr_page_timeout < 0:
+                raise ValidationError(
+                    "Le timeout OCR par page ne peut pas etre negatif."
+                )
+            if record.ocr_document_timeout < 0:
+                raise ValidationError(
+                    "Le timeout OCR par document ne peut pas etre negatif."
+                )
+            if not 0 <= record.ocr_min_confidence <= 100:
+                raise ValidationError(
+                    "La confiance OCR minimale doit etre comprise entre 0 et 100."
+                )
+            if record.ocr_cache_max_size_mb < 0:
+                raise ValidationError(
+                    "La taille maximale du cache OCR ne peut pas etre negative."
+                )
+            if record.ocr_page_cache_size < 0:
+                raise ValidationError(
+                    "La taille du cache OCR des pages ne peut pas etre negative."
+                )
+            if min(record.ocr_page_memory_mb, record.ocr_large_document_mb,
+                   record.ocr_large_max_pages) < 0:
+                raise ValidationError(
+                    "Les limites des gros documents ne peuvent pas etre negatives."
+                )
+
     @api.constrains('alert_amount_threshold')
     def _check_alert_amount_threshold(self):
         """Validate that alert_amount_threshold is positive"""
@@ -196,6 +503,21 @@ class JsocrConfig(models.Model):
             config = self.sudo().create({})
         return config
 
+    def _get_ocr_preprocessing_steps(self):
+        """Return the enabled image pre-processing steps.
+
+        Returns:
+            tuple: Step names for OCRService(preprocessing=...), empty when
+                   pre-processing is disabled
+        """
+        self.ensure_one()
+        steps = (
+            ('binarize', self.ocr_preprocess_binarize),
+            ('despeckle', self.ocr_preprocess_despeckle),
+            ('deskew', self.ocr_preprocess_deskew),
+        )
+        return tuple(step for step, enabled in steps if enabled)
+
     def _get_ollama_models(self):
         """Retourne la liste des modeles disponibles pour le champ Selection.
 
@@ -241,9 +563,9 @@ class JsocrConfig(models.Model):
             return []
 
         try:
-            response = requests.get(
+            response = self._get_ollama_session().get(
                 f"{self.ollama_url}/api/tags",
-                timeout=10
+                timeout=self._get_ollama_test_timeout()
             )
             if response.status_code == 200:
                 data = response.json()
@@ -256,6 +578,24 @@ class JsocrConfig(models.Model):
 
         return []
 
+    def _get_ollama_session(self):
+        """Return the pooled HTTP session of this process for the Ollama URL.
+
+        Returns:
+            requests.Session: Session shared with the AI analysis of jobs
+        """
+        from odoo.addons.js_invoice_ocr_ia.services.ai_service import get_http_session
+
+        return get_http_session(self.ollama_url, self.ollama_pool_size)
+
+    def _get_ollama_test_timeout(self):
+        """Return the (connect, read) timeout of the Ollama connection test."""
+        from odoo.addons.js_invoice_ocr_ia.services.ai_service import (
+            CONNECTION_TEST_TIMEOUT, DEFAULT_CONNECT_TIMEOUT,
+        )
+
+        return (self.ollama_connect_timeout or DEFAULT_CONNECT_TIMEOUT, CONNECTION_TEST_TIMEOUT)
+
     # Button action method - no decorator needed, called via type="object" in view
     def test_ollama_connection(self):
         """Test Ollama server connection and retrieve available models.
@@ -263,8 +603,10 @@ class JsocrConfig(models.Model):
         Sends GET request to {ollama_url}/api/tags to verify connectivity
         and list available models. Results displayed via Odoo notification.
 
-        Note: Uses 10s timeout (hardcoded) for connection test, while ollama_timeout
-        field (120s default) is used for actual AI processing requests.
+        Note: Uses ollama_connect_timeout to connect and a 10s read timeout
+        (hardcoded) for connection test, while ollama_timeout field (120s
+        default) is used for actual AI processing requests. The request goes
+        through the pooled session of the process (see _get_ollama_session()).
 
         Example:
             config = self.env['jsocr.config'].get_config()
@@ -285,9 +627,9 @@ class JsocrConfig(models.Model):
         _logger.info("JSOCR: Testing Ollama connection")
 
         try:
-            response = requests.get(
+            response = self._get_ollama_session().get(
                 f"{self.ollama_url}/api/tags",
-                timeout=10
+                timeout=self._get_ollama_test_timeout()
             )
 
             if response.status_code == 200:
@@ -55,6 +55,13 @@ class JsocrImportJob(models.Model):
         help='Original filename of the PDF',
     )
 
+    pdf_size = fields.Integer(
+        string='PDF Size (bytes)',
+        compute='_compute_pdf_size',
+        store=True,
+        help='Size of the PDF file, large documents are processed by their own cron',
+    )
+
     state = fields.Selection(
         selection=[
             ('draft', 'Draft'),
@@ -78,12 +85,47 @@ class JsocrImportJob(models.Model):
         help='Raw text extracted from PDF via OCR',
     )
 
+    extraction_page_data = fields.Text(
+        string='Extraction Page Data (JSON)',
+        copy=False,
+        help='Per-page extraction method, OCR tier and confidence in JSON format',
+    )
+
+    word_index = fields.Binary(
+        string='Word Index',
+        attachment=True,
+        copy=False,
+        help='Word bounding boxes of the extracted pages (compressed columnar format, '
+             'see services/word_index.py)',
+    )
+
+    degraded_pages = fields.Char(
+        string='Degraded Pages',
+        copy=False,
+        help='Pages skipped because their OCR exceeded the time budget (e.g. "3, 7")',
+    )
+
+    skipped_pages = fields.Char(
+        string='Skipped Pages',
+        copy=False,
+        help='Pages of a large document not extracted, past the configured page cap '
+             '(e.g. "51-120")',
+    )
+
     ai_response = fields.Text(
         string='AI Response (JSON)',
         copy=False,
         help='Raw JSON response from Ollama AI analysis',
     )
 
+    prompt_tokens_removed = fields.Integer(
+        string='Prompt Tokens Removed',
+        copy=False,
+        help='Estimated tokens removed from the text sent to the AI by prompt compaction '
+             '(page markers, repeated headers and footers, whitespace, boilerplate and '
+             'token budget)',
+    )
+
     confidence_data = fields.Text(
         string='Confidence Data (JSON)',
         copy=False,
@@ -157,6 +199,17 @@ class JsocrImportJob(models.Model):
         help='Invoice lines extracted by AI in JSON format',
     )
 
+    extracted_lines_source = fields.Selection(
+        selection=[
+            ('ai', 'AI'),
+            ('table', 'PDF Table'),
+        ],
+        string='Lines Source',
+        copy=False,
+        help='Lines extracted by AI or read from the PDF tables (native PDFs, '
+             'lines matching a document total)',
+    )
+
     extracted_amount_untaxed = fields.Float(
         string='Extracted Amount Untaxed',
         digits='Account',
@@ -217,6 +270,16 @@ class JsocrImportJob(models.Model):
             filename = job.pdf_filename or 'Unnamed'
             job.name = f"Job #{job_id} - {filename}"
 
+    @api.depends('pdf_file')
+    def _compute_pdf_size(self):
+        """Compute the PDF size from its attachment, without reading the file."""
+        sizes = {
+            attachment.res_id: attachment.file_size
+            for attachment in self._get_pdf_attachments()
+        }
+        for job in self:
+            job.pdf_size = sizes.get(job.id, 0)
+
     @api.depends('state', 'retry_count')
     def _compute_can_retry(self):
         """Compute if retry is possible (error state and retries < 3)."""
@@ -525,7 +588,12 @@ class JsocrImportJob(models.Model):
 
         Uses OCRService to extract text from the job's PDF file and stores
         the result in the extracted_text field. Also detects and stores
-        the document language.
+        the document language. The result of an identical PDF already
+        extracted with the same OCR settings is reused from the OCR cache.
+
+        When the supplier is already known and its mask defines OCR zones,
+        only those zones are extracted; whole pages are extracted if the
+        zones give no text.
 
         Returns:
             str: Extracted text from PDF
@@ -534,31 +602,100 @@ class JsocrImportJob(models.Model):
             UserError: If PDF file is missing or extraction fails
         """
         self.ensure_one()
+        from odoo.addons.js_invoice_ocr_ia.services.word_index import WordIndex
 
-        if not self.pdf_file:
+        pdf_binary = self._get_pdf_binary()
+        if not pdf_binary:
             raise UserError("Cannot extract text: PDF file is missing")
 
         _logger.info("JSOCR: Job %s starting text extraction", self.id)
 
         try:
-            # Import OCR service
-            from odoo.addons.js_invoice_ocr_ia.services.ocr_service import OCRService
-
-            # Decode base64 PDF to bytes
-            pdf_binary = base64.b64decode(self.pdf_file)
-
-            # Extract text using OCR service
-            ocr = OCRService()
-            extracted_text = ocr.extract_text_from_pdf(pdf_binary)
-
-            # Detect language from extracted text (Story 3.3)
-            detected_lang = ocr.detect_language(extracted_text)
+            ocr = self._get_ocr_service()
+            zones = self._get_mask_zones()
+            signature = ocr.get_cache_signature()
+            if zones:
+                signature = dict(signature, zones=zones)
+
+            # Identical PDF already extracted with the same OCR settings
+            cache = self._get_ocr_cache()
+            cache_key = cache.make_key(pdf_binary, signature) if cache else None
+            cached = cache.get(cache_key) if cache else None
+
+            if cached:
+                pages = cached['pages']
+                detected_lang = cached['detected_language']
+                extracted_text = ocr.format_pages(pages)
+                _logger.info("JSOCR: Job %s text reused from OCR cache", self.id)
+            else:
+                pages = None
+                if zones:
+                    # Supplier mask: OCR only the regions holding the data
+                    pages = ocr.extract_zones(pdf_binary, zones)
+                    if not any(page['text'] for page in pages):
+                        _logger.info(
+                            "JSOCR: Job %s mask zones gave no text, extracting full pages",
+                            self.id
+                        )
+                        pages = None
+
+                if pages is None:
+                    # Extract text using OCR service
+                    pages = ocr.extract_pages(pdf_binary)
+                extracted_text = ocr.format_pages(pages)
+
+                # Detect language from a sample of each page (Story 3.3)
+                detected_lang = ocr.detect_language([page['text'] for page in pages])
+
+                # Degraded pages may succeed next time: do not cache them
+                if cache and not any(page['method'] == 'timeout' for page in pages):
+                    cache.put(cache_key, {
+                        'pages': pages,
+                        'detected_language': detected_lang,
+                    })
+
+            # Per-page metadata: how each page was read (text and words are
+            # stored apart)
+            page_data = [
+                {key: value for key, value in page.items() if key not in ('text', 'words')}
+                for page in pages
+            ]
+            config = self.env['jsocr.config'].get_config()
+            word_index = WordIndex.from_pages(pages if config.ocr_word_index else [])
+
+            degraded_pages = ", ".join(
+                str(page['page']) for page in pages if page['method'] == 'timeout'
+            )
+            skipped_pages = self._get_skipped_pages(ocr, pdf_binary)
 
             # Store results
-            self.write({
+            vals = {
                 'extracted_text': extracted_text,
+                'extraction_page_data': json.dumps(page_data),
                 'detected_language': detected_lang,
-            })
+                'degraded_pages': degraded_pages or False,
+                'skipped_pages': skipped_pages or False,
+                'word_index': base64.b64encode(word_index.to_bytes()) if len(word_index) else False,
+            }
+            if config.ocr_searchable_pdf:
+                searchable_pdf = self._add_text_layer(ocr, pdf_binary, pages)
+                if searchable_pdf:
+                    vals['pdf_file'] = base64.b64encode(searchable_pdf)
+            self.write(vals)
+            if degraded_pages:
+                _logger.warning("JSOCR: Job %s degraded pages (OCR timeout): %s",
+                                self.id, degraded_pages)
+                self.message_post(
+                    body=f"Pages ignorees (delai OCR depasse): {degraded_pages}"
+                )
+            if skipped_pages:
+                _logger.warning("JSOCR: Job %s pages not extracted (page cap): %s",
+                                self.id, skipped_pages)
+                self.message_post(
+                    body=f"Pages non extraites (limite de {ocr.max_pages} pages des gros "
+                         f"documents): {skipped_pages}. Verifier les totaux et les "
+                         "donnees de paiement."
+                )
 
             _logger.info("JSOCR: Job %s text extraction complete (lang=%s)", self.id, detected_lang)
             return extracted_text
@@ -571,6 +708,168 @@ class JsocrImportJob(models.Model):
             _logger.error("JSOCR: Job %s unexpected extraction error: %s", self.id, type(e).__name__)
             raise UserError(f"Unexpected error during text extraction: {type(e).__name__}") from e
 
+    def _get_skipped_pages(self, ocr, pdf_binary):
+        """Return the pages left out by the page cap of large documents.
+
+        Args:
+            ocr (OCRService): Service used for the extraction
+            pdf_binary (bytes): PDF file content
+
+        Returns:
+            str: Page range (e.g. "51-120"), empty if every page was extracted
+        """
+        if not ocr.max_pages:
+            return ""
+        with ocr.open_document(pdf_binary) as session:
+            page_count = session.page_count
+        if page_count <= ocr.max_pages:
+            return ""
+        if page_count == ocr.max_pages + 1:
+            return str(page_count)
+        return f"{ocr.max_pages + 1}-{page_count}"
+
+    def _add_text_layer(self, ocr, pdf_binary, pages):
+        """Return the PDF with the OCR text written back as a text layer.
+
+        The stored PDF is replaced by this searchable copy, so the archived
+        and attached PDFs carry the text, and reprocessing the job reads it
+        natively instead of running OCR again. A failure only keeps the
+        original PDF.
+
+        Args:
+            ocr (OCRService): Service used for the extraction
+            pdf_binary (bytes): Original PDF content
+            pages (list): Page results of the extraction
+
+        Returns:
+            bytes or None: Searchable PDF, None if no page was OCR'd or the
+                           text layer could not be written
+        """
+        try:
+            return ocr.add_text_layer(pdf_binary, pages)
+        except Exception as e:
+            _logger.warning("JSOCR: Job %s text layer not written: %s", self.id, type(e).__name__)
+            return None
+
+    def _get_word_index(self):
+        """Return the word boxes stored by the last text extraction.
+
+        Use WordIndex.find_in_rect() and WordIndex.find_value() to read the
+        words of a region or locate an extracted value.
+
+        Returns:
+            WordIndex or None: Index of the job's words, None if not stored
+        """
+        self.ensure_one()
+        from odoo.addons.js_invoice_ocr_ia.services.word_index import WordIndex
+
+        if not self.word_index:
+            return None
+        try:
+            return WordIndex.from_bytes(base64.b64decode(self.word_index))
+        except ValueError as e:
+            _logger.warning("JSOCR: Job %s word index unreadable: %s", self.id, e)
+            return None
+
+    def _get_pdf_attachments(self):
+        """Return the attachments holding the PDF files of the jobs."""
+        return self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'pdf_file'),
+            ('res_id', 'in', self.ids),
+        ])
+
+    def _get_pdf_binary(self):
+        """Return the PDF content as bytes.
+
+        The raw attachment content is read directly: going through the
+        pdf_file field would also keep its base64 encoding in memory.
+
+        Returns:
+            bytes or None: PDF content, None if the job has no PDF
+        """
+        self.ensure_one()
+        attachment = self._get_pdf_attachments()[:1]
+        if attachment:
+            return attachment.raw
+        return base64.b64decode(self.pdf_file) if self.pdf_file else None
+
+    def _is_large_document(self):
+        """Check if the job belongs to the large documents lane.
+
+        Returns:
+            bool: True if the PDF exceeds the configured size threshold
+        """
+        self.ensure_one()
+        config = self.env['jsocr.config'].get_config()
+        threshold = config.ocr_large_document_mb * 1024 * 1024
+        return bool(threshold) and self.pdf_size > threshold
+
+    def _get_ocr_service(self):
+        """Return the OCR service configured from jsocr.config.
+
+        The service is shared by all jobs of the worker process, one per
+        document lane, and rebuilt only when the configuration changes.
+        Large documents are extracted page by page in the calling process
+        (no worker pool holding copies of the PDF), up to the configured
+        page cap.
+
+        Returns:
+            OCRService: Service instance using the configured extraction mode
+        """
+        from odoo.addons.js_invoice_ocr_ia.services.ocr_service import get_ocr_service
+
+        config = self.env['jsocr.config'].get_config()
+        large = self._is_large_document()
+        return get_ocr_service(
+            extraction_mode=config.ocr_extraction_mode,
+            max_workers=1 if large else config.ocr_max_workers,
+            page_timeout=config.ocr_page_timeout,
+            ocr_strategy=config.ocr_strategy,
+            min_confidence=config.ocr_min_confidence,
+            fast_tessdata_dir=config.ocr_fast_tessdata_dir,
+            narrow_language=config.ocr_narrow_language,
+            ocr_engine=config.ocr_engine,
+            page_cache_size=config.ocr_page_cache_size,
+            max_pages=config.ocr_large_max_pages if large else 0,
+            page_memory_mb=config.ocr_page_memory_mb,
+            document_timeout=config.ocr_document_timeout,
+            timeout_policy=config.ocr_timeout_policy,
+            auto_rotate=config.ocr_auto_rotate,
+            preprocessing=config._get_ocr_preprocessing_steps(),
+            # Word boxes also place the searchable PDF text on the image
+            collect_words=config.ocr_word_index or config.ocr_searchable_pdf,
+        )
+
+    def _get_mask_zones(self):
+        """Return the OCR zones of the mask of the job's supplier.
+
+        Only available when the supplier is known before extraction (set
+        manually or kept from a previous extraction).
+
+        Returns:
+            dict or None: Zone definitions, None if there is no zoned mask
+        """
+        if not self.partner_id:
+            return None
+        mask = self.env['jsocr.mask'].get_mask_for_partner(self.partner_id.id)
+        if not mask:
+            return None
+        return mask.get_ocr_zones() or None
+
+    def _get_ocr_cache(self):
+        """Build the OCR result cache configured in jsocr.config.
+
+        Returns:
+            OCRResultCache or None: Cache instance, None if disabled
+        """
+        from odoo.addons.js_invoice_ocr_ia.services.ocr_cache import OCRResultCache
+
+        config = self.env['jsocr.config'].get_config()
+        if not config.ocr_cache_enabled or not config.ocr_cache_path:
+            return None
+        return OCRResultCache(config.ocr_cache_path, max_size_mb=config.ocr_cache_max_size_mb)
+
     # -------------------------------------------------------------------------
     # FILE MOVEMENT METHODS (Story 3.6, 3.7)
     # -------------------------------------------------------------------------
@@ -743,19 +1042,37 @@ class JsocrImportJob(models.Model):
         # Get config
         config = self.env['jsocr.config'].get_config()
 
-        # Initialize Ollama service
-        from odoo.addons.js_invoice_ocr_ia.services.ai_service import OllamaService
+        # Get the Ollama service of this worker process
+        from odoo.addons.js_invoice_ocr_ia.services.ai_service import get_ollama_service
 
-        ollama = OllamaService(
+        ollama = get_ollama_service(
             url=config.ollama_url,
             model=config.ollama_model,
             timeout=config.ollama_timeout,
+            connect_timeout=config.ollama_connect_timeout,
+            pool_size=config.ollama_pool_size,
+            stream=config.ollama_stream,
+            output_format=config.ollama_output_format,
         )
 
+        # Line items read from the PDF tables: the AI only gets the header
+        table = self._extract_table_lines()
+        text = table['header_text'] if table else self.extracted_text
+
+        # Fewer input tokens, faster prompt evaluation
+        prompt_tokens_removed = 0
+        if config.prompt_compaction_enabled:
+            from odoo.addons.js_invoice_ocr_ia.services.prompt_compaction import PromptCompactor
+
+            compaction = PromptCompactor(max_tokens=config.prompt_max_tokens).compact(text)
+            text = compaction['text']
+            prompt_tokens_removed = compaction['tokens_removed']
+
         # Extract data
         result = ollama.extract_invoice_data(
-            self.extracted_text,
-            language=self.detected_language or 'fr'
+            text,
+            language=self.detected_language or 'fr',
+            lines=table['lines'] if table else None,
         )
 
         if not result.get('success'):
@@ -767,6 +1084,8 @@ class JsocrImportJob(models.Model):
 
         # Store raw AI response
         self.ai_response = result.get('raw_response', '')
+        self.extracted_lines_source = 'table' if table else 'ai'
+        self.prompt_tokens_removed = prompt_tokens_removed
         self.confidence_data = json.dumps(confidence_data) if confidence_data else ''
 
         # Extract and store individual fields (Story 4.3-4.6)
@@ -775,6 +1094,47 @@ class JsocrImportJob(models.Model):
         _logger.info("JSOCR: Job %s AI analysis complete", self.id)
         return result
 
+    def _extract_table_lines(self):
+        """Read the line items from the tables of a native PDF.
+
+        Only used when every page was extracted natively and the table rows
+        add up to a total printed in the document; otherwise the AI extracts
+        the lines from the full text.
+
+        Returns:
+            dict or None: Result of TableExtractor.extract_line_items() with
+                          'lines' and 'header_text', None if not usable
+        """
+        self.ensure_one()
+        from odoo.addons.js_invoice_ocr_ia.services.table_extraction import TableExtractor
+
+        if not self.env['jsocr.config'].get_config().table_extraction_enabled:
+            return None
+        try:
+            page_data = json.loads(self.extraction_page_data or '[]')
+        except (json.JSONDecodeError, TypeError):
+            return None
+        if not page_data or any(page.get('method') != 'native' for page in page_data):
+            return None
+
+        pdf_binary = self._get_pdf_binary()
+        if not pdf_binary:
+            return None
+        try:
+            with self._get_ocr_service().open_document(pdf_binary) as session:
+                table = TableExtractor().extract_line_items(session)
+        except Exception as e:
+            _logger.warning("JSOCR: Job %s table extraction failed: %s", self.id, type(e).__name__)
+            return None
+
+        if not table or not table['reconciled']:
+            return None
+        _logger.info(
+            "JSOCR: Job %s %d line(s) read from PDF tables, AI asked for header only",
+            self.id, len(table['lines'])
+        )
+        return table
+
     def _store_extracted_data(self, data, ollama_service):
         """Store extracted data in job fields.
 
@@ -1773,12 +2133,58 @@ class JsocrImportJob(models.Model):
 
         Called by ir.cron to process jobs that are in 'pending' state.
         Processes jobs one by one to respect NFR10 (one failure doesn't block others).
+        Large documents are left to cron_process_large_jobs().
+
+        Returns:
+            int: Number of jobs processed
+        """
+        pending_jobs = self.search(
+            [('state', '=', 'pending')] + self._get_lane_domain(large=False), limit=10
+        )
+        return self._process_pending_jobs(pending_jobs)
+
+    @api.model
+    def cron_process_large_jobs(self):
+        """Cron method to process pending large documents, one per run.
+
+        Runs as a separate, lower priority cron so that a long document does
+        not delay the normal invoices queued behind it.
 
         Returns:
             int: Number of jobs processed
         """
-        pending_jobs = self.search([('state', '=', 'pending')], limit=10)
+        large_jobs = self.search(
+            [('state', '=', 'pending')] + self._get_lane_domain(large=True), limit=1
+        )
+        return self._process_pending_jobs(large_jobs)
+
+    @api.model
+    def _get_lane_domain(self, large):
+        """Return the domain selecting the jobs of a processing lane.
+
+        Args:
+            large (bool): True for the large documents lane
+
+        Returns:
+            list: Search domain on pdf_size
+        """
+        config = self.env['jsocr.config'].get_config()
+        threshold = config.ocr_large_document_mb * 1024 * 1024
+        if not threshold:
+            # No separate lane: every job is a normal one
+            return [(0, '=', 1)] if large else []
+        return [('pdf_size', '>', threshold)] if large else [('pdf_size', '<=', threshold)]
 
+    @api.model
+    def _process_pending_jobs(self, pending_jobs):
+        """Process pending jobs one by one (NFR10).
+
+        Args:
+            pending_jobs (recordset): Jobs in 'pending' state
+
+        Returns:
+            int: Number of jobs processed
+        """
         if not pending_jobs:
             return 0
 
@@ -16,6 +16,14 @@ class JsocrMask(models.Model):
     This model stores JSON-based extraction masks that define how to extract
     invoice data for specific suppliers. Each mask can define field patterns,
     zones, and expected values for a supplier's invoice format.
+
+    OCR zones ('zones' key) limit OCR to the regions of the invoice that hold
+    the data, rectangles being relative to the page size:
+        "zones": {
+            "header": {"page": 1, "rect": [0.0, 0.0, 1.0, 0.3]},
+            "totals": {"page": -1, "rect": [0.5, 0.7, 1.0, 0.95]},
+            "lines": {"page": 1, "rect": [0.0, 0.3, 1.0, 0.7], "psm": 4}
+        }
     """
 
     _name = 'jsocr.mask'
@@ -94,6 +102,44 @@ class JsocrMask(models.Model):
                             "JSOCR: Mask %s (%s) missing 'fields' key in mask_data",
                             mask.id, mask.name
                         )
+                    if 'zones' in data:
+                        mask._check_ocr_zones(data['zones'])
+
+    def _check_ocr_zones(self, zones):
+        """Validate the OCR zones of a mask.
+
+        Args:
+            zones: Value of the 'zones' key of mask_data
+
+        Raises:
+            ValidationError: If a zone has no valid page, relative rectangle
+                or Tesseract page segmentation mode
+        """
+        if not isinstance(zones, dict):
+            raise ValidationError(
+                f"Mask '{self.name}': 'zones' must be an object of named zones"
+            )
+        for name, zone in zones.items():
+            if not isinstance(zone, dict):
+                raise ValidationError(f"Mask '{self.name}': zone '{name}' must be an object")
+            page = zone.get('page', 1)
+            if not isinstance(page, int) or isinstance(page, bool) or page == 0:
+                raise ValidationError(
+                    f"Mask '{self.name}': zone '{name}' page must be a non-zero integer"
+                )
+            rect = zone.get('rect')
+            if (not isinstance(rect, list) or len(rect) != 4
+                    or not all(isinstance(v, (int, float)) and 0 <= v <= 1 for v in rect)
+                    or rect[0] >= rect[2] or rect[1] >= rect[3]):
+                raise ValidationError(
+                    f"Mask '{self.name}': zone '{name}' rect must be [x0, y0, x1, y1] "
+                    "with relative coordinates between 0 and 1"
+                )
+            psm = zone.get('psm', 6)
+            if not isinstance(psm, int) or isinstance(psm, bool) or not 0 <= psm <= 13:
+                raise ValidationError(
+                    f"Mask '{self.name}': zone '{name}' psm must be an integer between 0 and 13"
+                )
 
     # -------------------------------------------------------------------------
     # ACTION METHODS
@@ -193,6 +239,21 @@ class JsocrMask(models.Model):
         )
         return mask
 
+    def get_ocr_zones(self):
+        """Return the OCR zones defined in mask_data.
+
+        Returns:
+            dict: {zone_name: zone definition}, empty if the mask has no zones
+        """
+        self.ensure_one()
+        try:
+            data = json.loads(self.mask_data or '{}')
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(data, dict) or not isinstance(data.get('zones'), dict):
+            return {}
+        return data['zones']
+
     @api.model
     def get_mask_for_partner(self, partner_id):
         """Get the most used active mask for a given partner.
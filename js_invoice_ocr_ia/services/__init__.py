@@ -3,5 +3,9 @@
 
 # Services will be imported here as they are created
 from . import ocr_service
+from . import ocr_cache
+from . import image_preprocessing
+from . import table_extraction
+from . import word_index
 from . import ai_service
 # from . import file_watcher
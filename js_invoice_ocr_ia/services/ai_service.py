@@ -14,9 +14,13 @@ Story 4.3-4.7: Data extraction and confidence calculation
 import json
 import logging
 import re
+import threading
+import time
 from datetime import datetime
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
 _logger = logging.getLogger(__name__)
 
@@ -27,6 +31,22 @@ RETRY_DELAYS = [5, 15, 30]  # seconds
 # Default timeout for Ollama requests (NFR1: < 2 minutes)
 DEFAULT_TIMEOUT = 120
 
+# Connections: TCP/TLS connection establishment is bounded separately from
+# the (long) generation time, and connections to an endpoint are kept alive
+# in a pool shared by the process (see get_http_session())
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_POOL_SIZE = 4
+# Read timeout of the connection test and of the model list
+CONNECTION_TEST_TIMEOUT = 10
+
+
+class OllamaHTTPError(Exception):
+    """Ollama answered with an HTTP error status."""
+
+    def __init__(self, status_code):
+        super().__init__(f"Ollama returned HTTP {status_code}")
+        self.status_code = status_code
+
 
 class OllamaService:
     """Service for AI-powered invoice data extraction via Ollama.
@@ -42,6 +62,37 @@ class OllamaService:
     # Swiss VAT rates for validation
     SWISS_VAT_RATES = [7.7, 2.5, 0.0]
 
+    # Output formats:
+    # - 'schema': the invoice JSON schema is sent as 'format', Ollama (0.5+)
+    #   constrains the generation to it
+    # - 'json': 'format': 'json', any valid JSON object
+    # - 'text': no constraint, JSON found in the text by _parse_ai_response()
+    # With 'schema' and 'json', a response that is not a JSON object still
+    # goes through _parse_ai_response() (models without support). Ollama
+    # before 0.5 rejects a schema with HTTP 400: the request is sent again
+    # with 'json', which the service then keeps using.
+    OUTPUT_FORMATS = ('schema', 'json', 'text')
+    DEFAULT_OUTPUT_FORMAT = 'text'
+
+    # Typed fields of the extraction result ('lines' items use LINE_FIELDS)
+    INVOICE_FIELDS = (
+        ('supplier_name', 'string'),
+        ('invoice_date', 'string'),
+        ('invoice_number', 'string'),
+        ('lines', 'lines'),
+        ('amount_untaxed', 'number'),
+        ('amount_tax', 'number'),
+        ('amount_total', 'number'),
+        ('currency', 'string'),
+        ('payment_reference', 'string'),
+    )
+    LINE_FIELDS = (
+        ('description', 'string'),
+        ('quantity', 'number'),
+        ('unit_price', 'number'),
+        ('amount', 'number'),
+    )
+
     # Date format patterns for parsing
     DATE_PATTERNS = [
         # European formats (DD.MM.YYYY, DD/MM/YYYY)
@@ -55,17 +106,35 @@ class OllamaService:
          r'novembre|november|decembre|december)\s+(\d{4})', 'text'),
     ]
 
-    def __init__(self, url=None, model=None, timeout=None):
+    def __init__(self, url=None, model=None, timeout=None, connect_timeout=None,
+                 pool_size=None, stream=False, output_format=None):
         """Initialize Ollama service.
 
         Args:
             url (str): Ollama API URL (e.g., 'http://localhost:11434')
             model (str): Model name to use (e.g., 'llama3', 'mistral')
-            timeout (int): Request timeout in seconds (default: 120)
+            timeout (int): Read timeout of a request in seconds (default: 120)
+            connect_timeout (int): Connection timeout in seconds (default: 10)
+            pool_size (int): Connections kept alive to the Ollama endpoint
+                             (default: 4)
+            stream (bool): Stream the generation and stop it as soon as a
+                           complete JSON object was produced (default: False)
+            output_format (str): 'schema', 'json' or 'text' (default: 'text')
+
+        Raises:
+            ValueError: If output_format is unknown
         """
         self.url = url or 'http://localhost:11434'
         self.model = model or 'llama3'
         self.timeout = timeout or DEFAULT_TIMEOUT
+        self.connect_timeout = connect_timeout or DEFAULT_CONNECT_TIMEOUT
+        self.pool_size = pool_size or DEFAULT_POOL_SIZE
+        self.stream = bool(stream)
+        self.output_format = output_format or self.DEFAULT_OUTPUT_FORMAT
+        if self.output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Unknown Ollama output format: {self.output_format}")
+        self._schema_rejected = False
+        self.session = get_http_session(self.url, self.pool_size)
         _logger.info("JSOCR: OllamaService initialized (model=%s)", self.model)
 
     def test_connection(self):
@@ -75,9 +144,9 @@ class OllamaService:
             tuple: (success: bool, message: str, models: list)
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.url}/api/tags",
-                timeout=10
+                timeout=(self.connect_timeout, CONNECTION_TEST_TIMEOUT)
             )
             if response.status_code == 200:
                 data = response.json()
@@ -92,7 +161,7 @@ class OllamaService:
         except Exception as e:
             return False, f"Error: {str(e)}", []
 
-    def extract_invoice_data(self, text, language='fr'):
+    def extract_invoice_data(self, text, language='fr', lines=None):
         """Extract structured invoice data from OCR text using AI.
 
         Sends the text to Ollama with a specialized prompt to extract:
@@ -104,9 +173,14 @@ class OllamaService:
         - amount_tax
         - amount_total
 
+        When the line items are already known (e.g. read from the PDF
+        tables), the AI is only asked for the other fields and the given
+        lines are returned in the data.
+
         Args:
             text (str): Extracted text from invoice PDF
             language (str): Detected language ('fr', 'de', 'en')
+            lines (list, optional): Line items extracted without AI
 
         Returns:
             dict: Extracted data with structure:
@@ -132,11 +206,11 @@ class OllamaService:
         _logger.info("JSOCR: Starting AI extraction (lang=%s)", language)
 
         # Build the extraction prompt
-        prompt = self._build_extraction_prompt(text, language)
+        prompt = self._build_extraction_prompt(text, language, header_only=bool(lines))
 
         # Send request to Ollama
         try:
-            response = self._send_request(prompt)
+            response = self._send_request(prompt, header_only=bool(lines))
         except requests.Timeout:
             _logger.warning("JSOCR: Ollama request timeout after %ds", self.timeout)
             return {
@@ -170,7 +244,16 @@ class OllamaService:
 
         # Parse the response
         raw_response = response.get('response', '')
-        parsed_data = self._parse_ai_response(raw_response)
+        parsed_data = None
+        if self.output_format != 'text':
+            parsed_data = self._parse_structured_response(raw_response)
+            if parsed_data is None:
+                _logger.warning(
+                    "JSOCR: AI response is not a JSON object (format '%s'), "
+                    "falling back to text parsing", self.output_format
+                )
+        if parsed_data is None:
+            parsed_data = self._parse_ai_response(raw_response)
 
         if not parsed_data:
             _logger.warning("JSOCR: Failed to parse AI response")
@@ -183,6 +266,9 @@ class OllamaService:
                 'error_type': 'parse_error',
             }
 
+        if lines:
+            parsed_data['lines'] = lines
+
         # Calculate confidence scores
         confidence_data = self._calculate_confidence(parsed_data)
 
@@ -196,7 +282,7 @@ class OllamaService:
             'error_type': None,
         }
 
-    def _build_extraction_prompt(self, text, language='fr'):
+    def _build_extraction_prompt(self, text, language='fr', header_only=False):
         """Build the extraction prompt for Ollama (Story 4.2).
 
         Creates an optimized prompt that instructs the LLM to extract
@@ -205,6 +291,8 @@ class OllamaService:
         Args:
             text (str): Invoice text
             language (str): Document language
+            header_only (bool): Leave the invoice lines out of the requested
+                                fields (lines already extracted)
 
         Returns:
             str: Complete prompt for Ollama
@@ -215,6 +303,21 @@ class OllamaService:
             'en': 'anglais',
         }.get(language, 'francais (Suisse)')
 
+        if header_only:
+            lines_instruction = "3. N'extrait PAS les lignes de facture (deja connues)"
+            lines_schema = ""
+        else:
+            lines_instruction = "3. Pour les lignes de facture, extrait autant de lignes que possible"
+            lines_schema = """
+    "lines": [
+        {
+            "description": "Description du produit/service",
+            "quantity": 1.0,
+            "unit_price": 100.00,
+            "amount": 100.00
+        }
+    ],"""
+
         prompt = f"""Tu es un assistant specialise dans l'extraction de donnees de factures.
 Analyse le texte de facture suivant et extrait les informations dans un format JSON strict.
 
@@ -232,7 +335,7 @@ TEXTE DE LA FACTURE:
 INSTRUCTIONS:
 1. Extrait UNIQUEMENT les informations presentes dans le document
 2. Si une information n'est pas trouvee, utilise null
-3. Pour les lignes de facture, extrait autant de lignes que possible
+{lines_instruction}
 4. Les montants doivent etre des nombres (pas de texte)
 5. La date doit etre au format YYYY-MM-DD
 
@@ -240,15 +343,7 @@ REPONDS UNIQUEMENT avec un objet JSON valide (sans texte avant ou apres):
 {{
     "supplier_name": "Nom du fournisseur ou null",
     "invoice_date": "YYYY-MM-DD ou null",
-    "invoice_number": "Numero de facture ou null",
-    "lines": [
-        {{
-            "description": "Description du produit/service",
-            "quantity": 1.0,
-            "unit_price": 100.00,
-            "amount": 100.00
-        }}
-    ],
+    "invoice_number": "Numero de facture ou null",{lines_schema}
     "amount_untaxed": 100.00,
     "amount_tax": 7.70,
     "amount_total": 107.70,
@@ -258,11 +353,12 @@ REPONDS UNIQUEMENT avec un objet JSON valide (sans texte avant ou apres):
 
         return prompt
 
-    def _send_request(self, prompt):
+    def _send_request(self, prompt, header_only=False):
         """Send request to Ollama API (Story 4.1).
 
         Args:
             prompt (str): The prompt to send
+            header_only (bool): Invoice lines left out of the output schema
 
         Returns:
             dict: Ollama API response
@@ -270,30 +366,265 @@ REPONDS UNIQUEMENT avec un objet JSON valide (sans texte avant ou apres):
         Raises:
             requests.Timeout: If request times out
             requests.ConnectionError: If connection fails
+            OllamaHTTPError: If Ollama answers with an HTTP error
         """
         payload = {
             'model': self.model,
             'prompt': prompt,
-            'stream': False,
+            'stream': self.stream,
             'options': {
                 'temperature': 0.1,  # Low temperature for consistent extraction
                 'num_predict': 2000,  # Enough for JSON response
             }
         }
+        if self.output_format == 'schema' and not self._schema_rejected:
+            payload['format'] = self._get_output_schema(header_only)
+        elif self.output_format != 'text':
+            payload['format'] = 'json'
 
         _logger.info("JSOCR: Sending request to Ollama (model=%s)", self.model)
 
-        response = requests.post(
+        try:
+            return self._post_generate(payload)
+        except OllamaHTTPError as e:
+            if e.status_code != 400 or not isinstance(payload.get('format'), dict):
+                raise
+            _logger.warning(
+                "JSOCR: Ollama rejected the JSON schema output format (HTTP 400), "
+                "retrying with 'json'"
+            )
+            self._schema_rejected = True
+            payload['format'] = 'json'
+            return self._post_generate(payload)
+
+    def _post_generate(self, payload):
+        """Post a generation request, streamed or not.
+
+        Args:
+            payload (dict): Request payload
+
+        Returns:
+            dict: Ollama API response
+
+        Raises:
+            OllamaHTTPError: If Ollama answers with an HTTP error
+        """
+        if self.stream:
+            return self._send_streaming_request(payload)
+
+        response = self.session.post(
             f"{self.url}/api/generate",
             json=payload,
-            timeout=self.timeout
+            timeout=(self.connect_timeout, self.timeout)
         )
 
         if response.status_code != 200:
-            raise Exception(f"Ollama returned HTTP {response.status_code}")
+            raise OllamaHTTPError(response.status_code)
 
         return response.json()
 
+    def _send_streaming_request(self, payload):
+        """Send a streaming request to Ollama and stop at the end of the JSON.
+
+        Ollama streams the generation as NDJSON, one chunk of tokens per
+        line. The chunks are fed to a JSONObjectTracker and the connection
+        is closed as soon as the first top-level JSON object is complete,
+        instead of waiting for the model to finish (up to num_predict tokens)
+        when it keeps writing after the closing brace. Closing a stream
+        before its end also drops its pooled keep-alive connection (see
+        get_http_session()): the next request connects again, which costs
+        far less than the tokens not generated.
+
+        The timeout is checked when a chunk arrives, and the read timeout
+        applies between two chunks: a server stalling between chunks is
+        detected after the read timeout, so a generation takes at most the
+        timeout plus one read timeout (twice the configured timeout).
+
+        Args:
+            payload (dict): Request payload with 'stream' set
+
+        Returns:
+            dict: Ollama API response, with the generated text up to the end
+                  of the JSON object in 'response'
+
+        Raises:
+            requests.Timeout: If the generation exceeds the timeout
+            requests.ConnectionError: If connection fails
+            OllamaHTTPError: If Ollama answers with an HTTP error
+        """
+        # The read timeout applies between two chunks: the whole generation
+        # is bounded by a deadline, checked at every chunk
+        deadline = time.monotonic() + self.timeout
+        tracker = JSONObjectTracker()
+        parts = []
+        result = {}
+
+        response = self.session.post(
+            f"{self.url}/api/generate",
+            json=payload,
+            timeout=(self.connect_timeout, self.timeout),
+            stream=True
+        )
+        try:
+            if response.status_code != 200:
+                raise OllamaHTTPError(response.status_code)
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get('error'):
+                    raise Exception(f"Ollama error: {chunk['error']}")
+                token = chunk.get('response', '')
+                end = tracker.feed(token)
+                if end != -1:
+                    parts.append(token[:end])
+                    result = dict(chunk, done=True, done_reason='json_complete')
+                    _logger.info(
+                        "JSOCR: Ollama stream stopped at the end of the JSON object "
+                        "(%d chunks)", tracker.chunks
+                    )
+                    break
+                parts.append(token)
+                if chunk.get('done'):
+                    result = chunk
+                    break
+                if time.monotonic() > deadline:
+                    raise requests.Timeout(f"Ollama generation exceeded {self.timeout}s")
+        finally:
+            # Closing the stream early makes Ollama stop the generation, the
+            # connection is not reused
+            response.close()
+
+        result['response'] = ''.join(parts)
+        return result
+
+    def _get_output_schema(self, header_only=False):
+        """Build the JSON schema of the extraction result.
+
+        Args:
+            header_only (bool): Leave the invoice lines out
+
+        Returns:
+            dict: JSON schema, every field required and nullable
+        """
+        def property_schema(kind):
+            if kind == 'lines':
+                return {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            name: property_schema(line_kind)
+                            for name, line_kind in self.LINE_FIELDS
+                        },
+                        'required': [name for name, _line_kind in self.LINE_FIELDS],
+                    },
+                }
+            return {'type': [kind, 'null']}
+
+        fields = [
+            (name, kind) for name, kind in self.INVOICE_FIELDS
+            if not (header_only and kind == 'lines')
+        ]
+        return {
+            'type': 'object',
+            'properties': {name: property_schema(kind) for name, kind in fields},
+            'required': [name for name, _kind in fields],
+        }
+
+    def _parse_structured_response(self, response_text):
+        """Decode and validate a schema-constrained AI response in one pass.
+
+        The response is decoded once and every field of INVOICE_FIELDS is
+        checked against its type: a missing or mistyped value becomes None
+        (0% confidence) instead of failing the whole extraction. Numbers
+        given as strings are converted when they parse.
+
+        Args:
+            response_text (str): Raw response from Ollama
+
+        Returns:
+            dict or None: Typed data, or None if the response is not a JSON
+                          object holding at least one invoice field
+        """
+        try:
+            data = json.loads(response_text or '')
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        if not any(name in data for name, _kind in self.INVOICE_FIELDS):
+            # '{}' or another object: not an extraction result
+            return None
+
+        invalid = []
+        result = {}
+        for name, kind in self.INVOICE_FIELDS:
+            value = data.get(name)
+            if kind == 'lines':
+                if name not in data:
+                    continue
+                value = self._get_typed_lines(value, invalid)
+            else:
+                value = self._get_typed_value(value, kind, name, invalid)
+            result[name] = value
+
+        if invalid:
+            _logger.warning("JSOCR: AI response fields with invalid type: %s", ', '.join(invalid))
+        return result
+
+    def _get_typed_lines(self, lines, invalid):
+        """Validate the 'lines' of a structured response.
+
+        Args:
+            lines: Value of the 'lines' field
+            invalid (list): Invalid field names, updated in place
+
+        Returns:
+            list: Line dicts with typed fields, non-object items dropped
+        """
+        if not isinstance(lines, list):
+            invalid.append('lines')
+            return []
+        typed_lines = []
+        for index, line in enumerate(lines):
+            if not isinstance(line, dict):
+                invalid.append(f'lines[{index}]')
+                continue
+            typed_lines.append({
+                name: self._get_typed_value(line.get(name), kind, f'lines[{index}].{name}', invalid)
+                for name, kind in self.LINE_FIELDS
+            })
+        return typed_lines
+
+    def _get_typed_value(self, value, kind, name, invalid):
+        """Return a field value of the expected type, or None.
+
+        Args:
+            value: Decoded value
+            kind (str): 'string' or 'number'
+            name (str): Field name, for the report
+            invalid (list): Invalid field names, updated in place
+
+        Returns:
+            str, float or None: Typed value
+        """
+        if value is None:
+            return None
+        if kind == 'number':
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return float(value)
+            if isinstance(value, str):
+                try:
+                    return float(value.replace("'", '').replace(' ', '').replace(',', '.'))
+                except ValueError:
+                    pass
+        elif isinstance(value, str):
+            return value if value.strip() else None
+        invalid.append(name)
+        return None
+
     def _parse_ai_response(self, response_text):
         """Parse the AI response to extract JSON data.
 
@@ -715,3 +1046,136 @@ REPONDS UNIQUEMENT avec un objet JSON valide (sans texte avant ou apres):
             parsed_lines.append(parsed_line)
 
         return parsed_lines
+
+
+class JSONObjectTracker:
+    """Incremental detection of the end of the first JSON object of a text.
+
+    Text is fed chunk by chunk as it is generated. Braces are counted
+    outside JSON strings only (escaped quotes are handled), text before the
+    first opening brace is ignored.
+
+    Example usage:
+        tracker = JSONObjectTracker()
+        tracker.feed('Voici: {"a": "}')   # -1, not complete
+        tracker.feed('"} et plus')        # 2, object ends after '"}'
+    """
+
+    def __init__(self):
+        """Initialize the tracker before any text."""
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+        self.chunks = 0
+
+    def feed(self, chunk):
+        """Feed the next chunk of generated text.
+
+        Args:
+            chunk (str): Text following the previous chunks
+
+        Returns:
+            int: Offset in the chunk just after the closing brace of the
+                 top-level object, -1 if the object is not complete yet
+        """
+        self.chunks += 1
+        for offset, char in enumerate(chunk):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '{':
+                self.depth += 1
+                self.started = True
+            elif not self.started:
+                continue
+            elif char == '"':
+                self.in_string = True
+            elif char == '}':
+                self.depth -= 1
+                if not self.depth:
+                    return offset + 1
+        return -1
+
+
+# Pooled HTTP sessions of the current process, see get_http_session()
+_session_state = {}
+_session_lock = threading.Lock()
+
+
+def get_http_session(url, pool_size=None):
+    """Return the pooled HTTP session of the current process for an endpoint.
+
+    Sessions keep their connections alive, so consecutive requests to the
+    same Ollama server (scheme, host and port) reuse an open TCP/TLS
+    connection instead of connecting again. A session is replaced, and the
+    old one closed with its idle connections, when its pool size changes.
+
+    Args:
+        url (str): Ollama API URL, any path is ignored
+        pool_size (int): Connections kept alive to the endpoint (default: 4)
+
+    Returns:
+        requests.Session: Shared session
+    """
+    parts = urlsplit(url)
+    endpoint = (parts.scheme.lower(), parts.netloc.lower())
+    pool_size = max(1, pool_size or DEFAULT_POOL_SIZE)
+    with _session_lock:
+        current = _session_state.get(endpoint)
+        if current and current[0] == pool_size:
+            return current[1]
+        if current:
+            current[1].close()
+
+        session = requests.Session()
+        # Failed requests are retried by the import job, not by urllib3
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _session_state[endpoint] = (pool_size, session)
+        _logger.info(
+            "JSOCR: HTTP session created for %s://%s (pool size %d)",
+            endpoint[0], endpoint[1], pool_size
+        )
+        return session
+
+
+# Long-lived service of the current process, see get_ollama_service()
+_service_state = {}
+_service_lock = threading.Lock()
+
+
+def get_ollama_service(url=None, model=None, timeout=None, connect_timeout=None,
+                       pool_size=None, stream=False, output_format=None):
+    """Return the Ollama service of the current process for given settings.
+
+    The instance is kept for the life of the process and only replaced when
+    the settings change, e.g. after a configuration update.
+
+    Args:
+        url (str): Ollama API URL
+        model (str): Model name to use
+        timeout (int): Read timeout of a request in seconds
+        connect_timeout (int): Connection timeout in seconds
+        pool_size (int): Connections kept alive to the Ollama endpoint
+        stream (bool): Stream the generation, stopped at the end of the JSON
+        output_format (str): 'schema', 'json' or 'text'
+
+    Returns:
+        OllamaService: Shared service instance
+    """
+    key = (url, model, timeout, connect_timeout, pool_size, stream, output_format)
+    with _service_lock:
+        if _service_state.get('key') != key:
+            _service_state['service'] = OllamaService(
+                url=url, model=model, timeout=timeout,
+                connect_timeout=connect_timeout, pool_size=pool_size, stream=stream,
+                output_format=output_format,
+            )
+            _service_state['key'] = key
+        return _service_state['service']
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Part of js_invoice_ocr_ia. See LICENSE file for full copyright and licensing details.
+
+"""Language detection of extracted invoice text.
+
+The text is tokenized once and every whole word is looked up in per-language
+frequency profiles: invoice keywords weigh more than common function words
+('le', 'und', 'the'), which tell the languages apart on ordinary sentences.
+Matching whole words avoids the false hits of substring matching ('net' in
+'internet', 'ht' in 'nacht').
+
+Only a bounded sample is read: the beginning of each page, up to a total
+budget. Detection therefore costs the same for a 2-page and a 200-page
+document, and can run on the first OCR'd page alone.
+
+Example usage:
+    detector = LanguageDetector(OCRService.LANGUAGE_KEYWORDS)
+    lang, confidence, scores = detector.detect(page_texts)
+"""
+
+import re
+import unicodedata
+
+
+def _build_accent_table():
+    """Return a str.translate() table removing the accents of Latin letters."""
+    table = {}
+    for code in range(0xC0, 0x250):
+        char = chr(code)
+        base = ''.join(
+            part for part in unicodedata.normalize('NFKD', char)
+            if not unicodedata.combining(part)
+        )
+        if base and base != char:
+            table[code] = base
+    table[ord('ß')] = 'ss'
+    return table
+
+
+class LanguageDetector:
+    """Single-pass, bounded-cost language scoring over whole tokens."""
+
+    # Sample: first characters of each page, and of the whole document
+    PAGE_SAMPLE_CHARS = 4000
+    MAX_SAMPLE_CHARS = 40000
+
+    # Score of a token found in a language profile
+    KEYWORD_WEIGHT = 3
+    STOPWORD_WEIGHT = 1
+
+    # Score of the best language from which its evidence is complete: below
+    # it, the confidence is reduced proportionally (about four keywords)
+    FULL_EVIDENCE_SCORE = 12
+
+    # Common function words (accents removed, lower case) per language
+    STOPWORDS = {
+        'fr': (
+            'le', 'la', 'les', 'un', 'une', 'des', 'du', 'de', 'et', 'pour',
+            'par', 'sur', 'avec', 'dans', 'au', 'aux', 'votre', 'vos',
+            'nous', 'vous', 'est', 'sont', 'merci', 'jours', 'selon',
+        ),
+        'de': (
+            'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'und',
+            'fur', 'mit', 'von', 'zu', 'zur', 'auf', 'bei', 'ihre', 'ihr',
+            'wir', 'sie', 'ist', 'sind', 'bitte', 'danke', 'tage', 'gemass',
+        ),
+        'en': (
+            'the', 'and', 'of', 'for', 'to', 'on', 'with', 'by',
+            'your', 'our', 'we', 'you', 'is', 'are', 'please', 'thank',
+            'days', 'this', 'from', 'as', 'per',
+        ),
+    }
+
+    TOKEN_PATTERN = re.compile(r"[^\W\d_]{2,}")
+    ACCENT_TABLE = _build_accent_table()
+
+    def __init__(self, keywords, default_language=None):
+        """Build the language profiles.
+
+        Args:
+            keywords (dict): Invoice keywords per ISO 639-1 language code
+                (see OCRService.LANGUAGE_KEYWORDS)
+            default_language (str, optional): Language preferred on ties
+                (default: first language of keywords)
+        """
+        self.languages = tuple(keywords)
+        self.default_language = default_language or self.languages[0]
+        # token -> tuple of (language, weight), a token shared by several
+        # languages scores for each of them
+        profiles = {}
+        for lang in self.languages:
+            weights = dict.fromkeys(
+                (self._normalize(word) for word in self.STOPWORDS.get(lang, ())),
+                self.STOPWORD_WEIGHT
+            )
+            weights.update(dict.fromkeys(
+                (self._normalize(word) for word in keywords[lang]), self.KEYWORD_WEIGHT
+            ))
+            for token, weight in weights.items():
+                profiles.setdefault(token, []).append((lang, weight))
+        self.profiles = {token: tuple(entries) for token, entries in profiles.items()}
+
+    def detect(self, texts):
+        """Detect the language of a text.
+
+        Args:
+            texts (str or iterable of str): Whole text, or text of each page.
+                A whole text is sampled at regular intervals, pages from
+                their beginning.
+
+        Returns:
+            tuple: (str language code or None when no profile token was
+                    found, float confidence 0.0 to 1.0, dict score per
+                    language)
+        """
+        scores = self.score(texts)
+        best_score = max(scores.values())
+        if not best_score:
+            return None, 0.0, scores
+
+        best_langs = [lang for lang in self.languages if scores[lang] == best_score]
+        lang = self.default_language if self.default_language in best_langs else best_langs[0]
+        return lang, self.get_confidence(scores), scores
+
+    def score(self, texts):
+        """Score the profile tokens of a text sample for each language.
+
+        Args:
+            texts (str or iterable of str): See detect()
+
+        Returns:
+            dict: {language: int score}
+        """
+        totals = dict.fromkeys(self.languages, 0)
+        profiles = self.profiles
+        for sample in self._iter_samples(texts):
+            for token in self.TOKEN_PATTERN.findall(self._normalize(sample)):
+                for lang, weight in profiles.get(token, ()):
+                    totals[lang] += weight
+        return totals
+
+    def get_confidence(self, scores):
+        """Return how clearly the scores designate one language.
+
+        The confidence is the lead of the best language over the runner-up
+        (share of the best score), reduced when the best score is below
+        FULL_EVIDENCE_SCORE.
+
+        Args:
+            scores (dict): Scores from score()
+
+        Returns:
+            float: 0.0 (no evidence or tie) to 1.0
+        """
+        ranked = sorted(scores.values(), reverse=True)
+        best = ranked[0]
+        if not best:
+            return 0.0
+        second = ranked[1] if len(ranked) > 1 else 0
+        evidence = min(1.0, best / self.FULL_EVIDENCE_SCORE)
+        return round((best - second) / best * evidence, 3)
+
+    def _iter_samples(self, texts):
+        """Yield the text chunks read for detection, within the budgets."""
+        if isinstance(texts, str):
+            # Evenly spaced windows over the whole text
+            text = texts
+            windows = self.MAX_SAMPLE_CHARS // self.PAGE_SAMPLE_CHARS
+            step = max(self.PAGE_SAMPLE_CHARS, len(text) // windows)
+            texts = [
+                text[start:start + self.PAGE_SAMPLE_CHARS]
+                for start in range(0, len(text), step)
+            ]
+
+        budget = self.MAX_SAMPLE_CHARS
+        for text in texts:
+            if not text:
+                continue
+            chunk = text[:min(self.PAGE_SAMPLE_CHARS, budget)]
+            yield chunk
+            budget -= len(chunk)
+            if budget <= 0:
+                return
+
+    def _normalize(self, text):
+        """Lower case text without accents."""
+        return text.lower().translate(self.ACCENT_TABLE)
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+# Part of js_invoice_ocr_ia. See LICENSE file for full copyright and licensing details.
+
+"""Caches for OCR extraction results.
+
+OCRResultCache - content-addressed disk cache of whole-document results:
+The same PDF often comes back (reprocessing after an AI failure, re-uploads,
+supplier reminders with the identical file). Results are stored under a key
+made of the SHA-256 of the PDF bytes and of the OCR settings, so an identical
+file processed with identical settings is never rendered or OCR'd twice.
+
+The cache is a directory of small JSON files, bounded in size with least
+recently used eviction (file modification time is refreshed on every hit).
+It is fail-soft: any I/O error is logged and treated as a cache miss, the
+extraction then simply runs as usual.
+
+PageOCRCache - in-memory cache of single page OCR results:
+Many suppliers append the same general terms or remittance page to every
+invoice. Pages are keyed on an exact hash of their rendered pixels plus the
+OCR settings, so a recurring page is OCR'd once per process and served from
+memory afterwards.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+_logger = logging.getLogger(__name__)
+
+# Default maximum size of the cache directory
+DEFAULT_MAX_SIZE_MB = 500
+
+# Default number of page results kept in memory per process
+DEFAULT_PAGE_CACHE_SIZE = 200
+
+
+class OCRResultCache:
+    """Size-bounded LRU cache of OCR results on local disk.
+
+    Example usage:
+        cache = OCRResultCache('/opt/jsocr/cache', max_size_mb=500)
+        key = cache.make_key(pdf_binary, ocr.get_cache_signature())
+        result = cache.get(key)
+        if result is None:
+            result = {'pages': ocr.extract_pages(pdf_binary), ...}
+            cache.put(key, result)
+    """
+
+    # Bumped when the stored result layout changes: old entries become misses
+    CACHE_FORMAT = 1
+    FILE_SUFFIX = '.json'
+    # Eviction frees space down to this share of the maximum size, so that
+    # the directory is not scanned again on the very next write
+    EVICTION_TARGET_RATIO = 0.9
+
+    def __init__(self, cache_dir, max_size_mb=None):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str): Cache directory, created on first write
+            max_size_mb (int): Maximum size of the cache in MB (default: 500,
+                               0 = unbounded)
+        """
+        self.cache_dir = cache_dir
+        if max_size_mb is None:
+            max_size_mb = DEFAULT_MAX_SIZE_MB
+        self.max_size_bytes = max(0, max_size_mb) * 1024 * 1024
+
+    def make_key(self, pdf_binary, signature):
+        """Build the cache key of a PDF for given OCR settings.
+
+        Args:
+            pdf_binary (bytes): PDF file content as bytes
+            signature (dict): OCR settings affecting the result
+                              (see OCRService.get_cache_signature())
+
+        Returns:
+            str: Hexadecimal cache key
+        """
+        settings = json.dumps(
+            {'format': self.CACHE_FORMAT, 'settings': signature}, sort_keys=True
+        )
+        digest = hashlib.sha256()
+        digest.update(hashlib.sha256(pdf_binary).digest())
+        digest.update(settings.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached result of a key and mark it as recently used.
+
+        Args:
+            key (str): Cache key from make_key()
+
+        Returns:
+            dict or None: Cached result, None on miss or unreadable entry
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as cache_file:
+                result = json.load(cache_file)
+            # Refresh the modification time used as LRU order
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            _logger.warning("JSOCR: OCR cache read failed for %s: %s", key[:12], e)
+            return None
+
+        _logger.info("JSOCR: OCR cache hit %s", key[:12])
+        return result
+
+    def put(self, key, result):
+        """Store a result, then evict old entries if the cache is too large.
+
+        The entry is written to a temporary file and renamed, so concurrent
+        readers never see a partial file.
+
+        Args:
+            key (str): Cache key from make_key()
+            result (dict): JSON-serializable result
+        """
+        path = self._get_path(key)
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path), suffix='.tmp'
+            )
+            with os.fdopen(fd, 'w', encoding='utf-8') as cache_file:
+                json.dump(result, cache_file)
+            os.replace(tmp_path, path)
+            tmp_path = None
+        except (OSError, TypeError, ValueError) as e:
+            _logger.warning("JSOCR: OCR cache write failed for %s: %s", key[:12], e)
+            return
+        finally:
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the size limit is met.
+
+        Returns:
+            int: Number of entries removed
+        """
+        if not self.max_size_bytes:
+            return 0
+
+        entries = []
+        total_size = 0
+        try:
+            for dir_path, _dir_names, file_names in os.walk(self.cache_dir):
+                for file_name in file_names:
+                    if not file_name.endswith(self.FILE_SUFFIX):
+                        continue
+                    path = os.path.join(dir_path, file_name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total_size += stat.st_size
+        except OSError as e:
+            _logger.warning("JSOCR: OCR cache scan failed: %s", e)
+            return 0
+
+        if total_size <= self.max_size_bytes:
+            return 0
+
+        target_size = self.max_size_bytes * self.EVICTION_TARGET_RATIO
+        removed = 0
+        for _mtime, size, path in sorted(entries):
+            if total_size <= target_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            removed += 1
+
+        _logger.info("JSOCR: OCR cache evicted %d entries", removed)
+        return removed
+
+    def _get_path(self, key):
+        """Return the file path of a key (sharded on its first 2 characters)."""
+        return os.path.join(self.cache_dir, key[:2], key + self.FILE_SUFFIX)
+
+
+class PageOCRCache:
+    """In-memory LRU cache of page OCR results, with hit-rate counters.
+
+    One instance is shared by the whole process (see get_page_cache()) and
+    is safe to use from several threads.
+
+    Example usage:
+        cache = get_page_cache()
+        key = cache.make_key(page_hash, signature)
+        result = cache.get(key)
+        if result is None:
+            result = ocr_page(page)
+            cache.put(key, result)
+    """
+
+    def __init__(self, max_entries=DEFAULT_PAGE_CACHE_SIZE):
+        """Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of page results kept
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, page_hash, signature):
+        """Build the cache key of a rendered page for given OCR settings.
+
+        Args:
+            page_hash (str): Hash of the rendered page pixels
+            signature (dict): OCR settings affecting the result
+
+        Returns:
+            str: Hexadecimal cache key
+        """
+        settings = json.dumps(signature, sort_keys=True)
+        return hashlib.sha256(f"{page_hash}:{settings}".encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return a copy of the cached page result and count the lookup.
+
+        Args:
+            key (str): Cache key from make_key()
+
+        Returns:
+            dict or None: Page OCR result, None on miss
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(result)
+
+    def put(self, key, result):
+        """Store a page result, evicting the least recently used ones.
+
+        Args:
+            key (str): Cache key from make_key()
+            result (dict): Page OCR result
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = dict(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def resize(self, max_entries):
+        """Change the maximum number of entries, evicting if needed.
+
+        Args:
+            max_entries (int): New maximum (0 disables the cache)
+        """
+        with self._lock:
+            self.max_entries = max_entries
+            while len(self._entries) > max(0, max_entries):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def get_stats(self):
+        """Return the cache counters.
+
+        Returns:
+            dict: {'entries', 'hits', 'misses', 'evictions', 'hit_rate'}
+                  with hit_rate between 0.0 and 1.0
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Process-wide page cache, created on first use
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache(max_entries=None):
+    """Return the page OCR cache of the current process.
+
+    Args:
+        max_entries (int, optional): Resize the cache to this many entries
+
+    Returns:
+        PageOCRCache: Shared cache instance
+    """
+    global _page_cache
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageOCRCache(
+                DEFAULT_PAGE_CACHE_SIZE if max_entries is None else max_entries
+            )
+        elif max_entries is not None and max_entries != _page_cache.max_entries:
+            _page_cache.resize(max_entries)
+        return _page_cache
@@ -5,13 +5,23 @@
 
 This service handles both native PDFs (with selectable text) and scanned PDFs:
 - Native PDFs: Uses PyMuPDF (fitz) for fast text extraction
-- Scanned PDFs: Uses Tesseract OCR via pytesseract
+- Scanned PDFs: Uses Tesseract OCR via pytesseract, or in-process through
+  tesserocr when it is installed (no process spawn per page)
 
 The service automatically detects the PDF type and uses the appropriate method.
+Each PDF is opened only once per extraction (see PDFDocumentSession).
 """
 
-import io
+import concurrent.futures
+import hashlib
 import logging
+import math
+import multiprocessing
+import re
+import threading
+import time
+
+from . import image_preprocessing, language_detection, ocr_cache
 
 _logger = logging.getLogger(__name__)
 
@@ -23,19 +33,191 @@ except ImportError:
     PYMUPDF_AVAILABLE = False
     _logger.warning("JSOCR: PyMuPDF not installed. PDF processing will not work.")
 
-# Check Tesseract availability
+# Check pytesseract availability. Whether the Tesseract binary is installed
+# is probed lazily on first use (see probe_tesseract()): running it at import
+# time would spawn a subprocess in every Odoo worker on each registry load.
 try:
     import pytesseract
     from PIL import Image
-    # Verify Tesseract is actually installed
-    pytesseract.get_tesseract_version()
-    TESSERACT_AVAILABLE = True
+    PYTESSERACT_INSTALLED = True
 except ImportError:
-    TESSERACT_AVAILABLE = False
+    PYTESSERACT_INSTALLED = False
     _logger.warning("JSOCR: pytesseract or Pillow not installed. Scanned PDF OCR disabled.")
+
+# None until probed, then True/False (see probe_tesseract())
+TESSERACT_AVAILABLE = None if PYTESSERACT_INSTALLED else False
+TESSERACT_VERSION = None
+_tesseract_probe_lock = threading.Lock()
+
+# Optional in-process Tesseract bindings (libtesseract, no subprocess)
+try:
+    import tesserocr
+    from PIL import Image  # noqa: F811 - tesserocr takes PIL images
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
 except Exception:
-    TESSERACT_AVAILABLE = False
-    _logger.warning("JSOCR: Tesseract not found on system. Scanned PDF OCR disabled.")
+    # tesserocr installed but libtesseract could not be loaded
+    TESSEROCR_AVAILABLE = False
+    _logger.warning("JSOCR: tesserocr could not be loaded. Using pytesseract.")
+
+
+class OCRTimeoutError(ValueError):
+    """OCR of a page exceeded the page or document time budget."""
+
+
+class PDFDocumentSession:
+    """A PDF document opened once and shared by detection and extraction.
+
+    Opening a PDF with PyMuPDF parses its whole cross-reference table, so the
+    service opens each document a single time and routes every step (type
+    detection, page count, text extraction) through this session. Page text
+    extracted while classifying pages is kept and reused by the extraction
+    step instead of being computed twice.
+
+    The session is a context manager and guarantees the underlying document
+    is closed on every exit path, including errors.
+
+    Example usage:
+        with PDFDocumentSession(pdf_binary) as session:
+            if session.is_native():
+                text = session.get_page_text(0)
+    """
+
+    # Minimum number of characters for a page to count as having a text layer
+    NATIVE_TEXT_MIN_CHARS = 50
+    # Number of leading pages inspected to decide if the whole PDF is native
+    NATIVE_DETECTION_PAGES = 3
+
+    def __init__(self, pdf_binary):
+        """Prepare a session for the given PDF content.
+
+        Args:
+            pdf_binary (bytes): PDF file content as bytes
+        """
+        self.pdf_binary = pdf_binary
+        self.doc = None
+        self._page_texts = {}
+        self._page_kinds = {}
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def open(self):
+        """Open the PDF document. Does nothing if it is already open.
+
+        Returns:
+            PDFDocumentSession: self, for chaining
+
+        Raises:
+            ValueError: If PDF is corrupted or invalid
+            ValueError: If PDF is password protected
+        """
+        if self.doc is not None:
+            return self
+
+        try:
+            self.doc = fitz.open(stream=self.pdf_binary, filetype="pdf")
+        except Exception as e:
+            _logger.error("JSOCR: Failed to open PDF: %s", type(e).__name__)
+            raise ValueError(f"Invalid or corrupted PDF file: {str(e)}") from e
+
+        if self.doc.is_encrypted:
+            self.close()
+            _logger.warning("JSOCR: PDF is password protected")
+            raise ValueError("PDF is password protected and cannot be processed")
+
+        return self
+
+    def close(self):
+        """Close the document and drop cached page data. Safe to call twice."""
+        if self.doc is not None:
+            self.doc.close()
+            self.doc = None
+        self._page_texts.clear()
+        self._page_kinds.clear()
+
+    @property
+    def page_count(self):
+        """int: Number of pages in the opened document."""
+        return self.doc.page_count
+
+    def get_page(self, page_num):
+        """Return the PyMuPDF page object for a 0-based page number."""
+        return self.doc[page_num]
+
+    def get_page_text(self, page_num):
+        """Return the native text layer of a page, extracting it only once.
+
+        Args:
+            page_num (int): 0-based page number
+
+        Returns:
+            str: Text returned by page.get_text() (may be empty)
+        """
+        if page_num not in self._page_texts:
+            self._page_texts[page_num] = self.doc[page_num].get_text() or ""
+        return self._page_texts[page_num]
+
+    def classify_page(self, page_num):
+        """Classify a page from cheap signals before any rendering.
+
+        Font and image presence are read from the page resources without
+        extracting text. The text layer is only extracted when the page
+        references fonts, and is then cached for the extraction step.
+
+        Args:
+            page_num (int): 0-based page number
+
+        Returns:
+            str: 'native' (usable text layer), 'scanned' (image without
+                 usable text) or 'empty' (neither text nor images)
+        """
+        if page_num in self._page_kinds:
+            return self._page_kinds[page_num]
+
+        page = self.doc[page_num]
+        has_fonts = bool(page.get_fonts())
+        has_images = bool(page.get_images())
+
+        if not has_fonts:
+            # No font resource means no text layer: skip get_text() entirely
+            kind = 'scanned' if has_images else 'empty'
+        else:
+            text = self.get_page_text(page_num).strip()
+            if len(text) > self.NATIVE_TEXT_MIN_CHARS:
+                kind = 'native'
+            elif has_images:
+                kind = 'scanned'
+            elif text:
+                kind = 'native'
+            else:
+                kind = 'empty'
+
+        self._page_kinds[page_num] = kind
+        return kind
+
+    def is_native(self):
+        """Check if the document contains selectable text (native PDF).
+
+        Checks the first few pages for meaningful text (> 50 chars). The
+        text extracted here stays cached for the extraction step.
+
+        Returns:
+            bool: True if one of the first pages has a text layer
+        """
+        pages_to_check = min(self.NATIVE_DETECTION_PAGES, self.page_count)
+        for page_num in range(pages_to_check):
+            if not self.doc[page_num].get_fonts():
+                continue
+            text = self.get_page_text(page_num).strip()
+            if len(text) > self.NATIVE_TEXT_MIN_CHARS:
+                return True
+        return False
 
 
 class OCRService:
@@ -54,12 +236,103 @@ class OCRService:
 
     # Default OCR configuration for Swiss multilingual context
     TESSERACT_LANG = 'fra+deu+eng'
-    TESSERACT_CONFIG = '--psm 3'  # Fully automatic page segmentation
+    TESSERACT_PSM = 3  # Fully automatic page segmentation
+    TESSERACT_CONFIG = f'--psm {TESSERACT_PSM}'
     DEFAULT_DPI = 300  # Resolution for page-to-image conversion
     DEFAULT_LANGUAGE = 'fr'  # Default to French for Swiss Romandie context
 
+    # Extraction modes:
+    # - 'auto': one native/scanned decision for the whole file (first pages)
+    # - 'hybrid': per-page routing, only image-only pages go to Tesseract
+    EXTRACTION_MODES = ('auto', 'hybrid')
+    DEFAULT_EXTRACTION_MODE = 'auto'
+    DEFAULT_MAX_WORKERS = 1  # Sequential OCR unless configured otherwise
+    DEFAULT_PAGE_TIMEOUT = 0  # Seconds per page, 0 = no limit
+    DEFAULT_DOCUMENT_TIMEOUT = 0  # Seconds of OCR per document, 0 = no limit
+
+    # Time budget policies, when a page exceeds the page or document budget:
+    # - 'degrade': the page is recorded with method 'timeout' and no text,
+    #   extraction continues with the next pages
+    # - 'fail': the extraction fails with OCRTimeoutError
+    TIMEOUT_POLICIES = ('degrade', 'fail')
+    DEFAULT_TIMEOUT_POLICY = 'degrade'
+    # Extra seconds a pool worker gets over the budget enforced by Tesseract
+    # itself, before its pool is killed
+    POOL_TIMEOUT_GRACE = 10
+
+    # OCR engines:
+    # - 'pytesseract': runs the tesseract binary for every page
+    # - 'tesserocr': warm libtesseract API kept per thread/worker process
+    # - 'auto': tesserocr when installed, pytesseract otherwise
+    OCR_ENGINES = ('auto', 'pytesseract', 'tesserocr')
+    DEFAULT_OCR_ENGINE = 'auto'
+
+    # Page OCR cache: scanned pages are identified by a hash of a cheap
+    # low-resolution render, recurring pages skip Tesseract entirely
+    DEFAULT_PAGE_CACHE_SIZE = 0  # Pages kept per process, 0 = disabled
+    PAGE_HASH_DPI = 100
+
+    # Embedded scans: a page holding a single upright image and nothing else
+    # is OCR'd from the image itself at its native resolution, without
+    # rasterising the page again. Pages are re-rendered when the image is
+    # below MIN_EMBEDDED_DPI, or far above the requested resolution.
+    MIN_EMBEDDED_DPI = 150
+    MAX_EMBEDDED_DPI_RATIO = 2.0
+
+    # Large documents: only the first max_pages pages are extracted, and a
+    # page is rendered at a lower resolution when its pixels would exceed
+    # page_memory_mb. A gray render costs 1 byte per pixel, counted twice as
+    # the pixmap and the image copied from it are alive together.
+    DEFAULT_MAX_PAGES = 0  # 0 = all pages
+    DEFAULT_PAGE_MEMORY_MB = 0  # 0 = no limit
+    RENDER_BYTES_PER_PIXEL = 2
+
+    # Searchable PDF: OCR text written back as an invisible text layer, one
+    # line per OCR line from the top of the page, shrunk to fit the page
+    TEXT_LAYER_FONT = 'helv'
+    TEXT_LAYER_MAX_FONTSIZE = 10
+    TEXT_LAYER_LINE_HEIGHT = 1.2  # Line spacing, in font sizes
+
+    # Zone OCR (supplier masks): crops are rendered at ZONE_DPI and read as a
+    # single block of text unless the zone defines its own 'psm'
+    ZONE_DPI = 300
+    ZONE_PSM = 6
+
+    # OCR strategies:
+    # - 'single': one Tesseract pass per page at DEFAULT_DPI with all languages
+    # - 'tiered': cheap first pass, escalation only for low-quality pages
+    OCR_STRATEGIES = ('single', 'tiered')
+    DEFAULT_OCR_STRATEGY = 'single'
+
+    # Tiers of the 'tiered' strategy, tried in order until quality is good
+    # enough. 'lang' None means TESSERACT_LANG; 'fast_models' uses the
+    # tessdata_fast directory when one is configured.
+    OCR_TIERS = (
+        {'name': 'fast', 'dpi': 200, 'psm': 3, 'lang': 'fra+deu', 'fast_models': True},
+        {'name': 'accurate', 'dpi': 300, 'psm': 3, 'lang': None, 'fast_models': False},
+        {'name': 'block', 'dpi': 400, 'psm': 6, 'lang': None, 'fast_models': False},
+    )
+    DEFAULT_MIN_CONFIDENCE = 75  # Mean word confidence (0-100) to accept a pass
+    MIN_TEXT_CHARS = 30  # Alphanumeric characters to accept a pass
+
+    # Orientation: with auto_rotate, a page whose first pass has a low
+    # confidence or few dictionary-like words goes through Tesseract OSD
+    # (orientation and script detection) and is OCR'd again upright.
+    OSD_PSM = 0  # Orientation and script detection only
+    OSD_MIN_CONFIDENCE = 2.0  # OSD orientation confidence to trust a rotation
+    ORIENTATION_MIN_WORD_RATIO = 0.6  # Share of word-like tokens of upright text
+    WORD_PATTERN = re.compile(r"[^\W\d_]{2,}")
+    VOWELS = frozenset('aeiouyàâäéèêëîïôöùûü')
+
+    # Language narrowing: once the document language is known, the remaining
+    # pages are OCR'd with that single Tesseract model instead of three.
+    # The detection confidence must reach this level, otherwise all languages
+    # are kept (see LanguageDetector.get_confidence()).
+    NARROWING_MIN_CONFIDENCE = 0.5
+
     # Language detection keywords for Swiss invoice context
-    # Each language has characteristic words found in invoices
+    # Each language has characteristic words found in invoices, matched as
+    # whole words (see language_detection.LanguageDetector)
     LANGUAGE_KEYWORDS = {
         'fr': [
             'facture', 'tva', 'montant', 'total', 'date', 'numero',
@@ -88,18 +361,114 @@ class OCRService:
         'en': 'eng',
     }
 
-    def __init__(self):
-        """Initialize OCR service and verify dependencies."""
+    def __init__(self, extraction_mode=None, max_workers=None, page_timeout=None,
+                 ocr_strategy=None, min_confidence=None, fast_tessdata_dir=None,
+                 narrow_language=False, ocr_engine=None, page_cache_size=None,
+                 max_pages=None, page_memory_mb=None, document_timeout=None,
+                 timeout_policy=None, auto_rotate=False, preprocessing=None,
+                 collect_words=False):
+        """Initialize OCR service and verify dependencies.
+
+        Args:
+            extraction_mode (str): 'auto' or 'hybrid' (default: 'auto')
+            max_workers (int): Worker processes for scanned pages (default: 1,
+                               i.e. sequential OCR in the calling process)
+            page_timeout (int): Max seconds of OCR per page (default: 0 = none)
+            ocr_strategy (str): 'single' or 'tiered' (default: 'single')
+            min_confidence (int): Mean word confidence under which a tiered
+                                  pass is escalated (default: 75)
+            fast_tessdata_dir (str): Directory of tessdata_fast models used by
+                                     the first tier (optional)
+            narrow_language (bool): OCR pages with the document language only,
+                                    once it is detected (default: False)
+            ocr_engine (str): 'auto', 'pytesseract' or 'tesserocr'
+                              (default: 'auto')
+            page_cache_size (int): Page OCR results kept in memory per process
+                                   for recurring pages (default: 0 = disabled)
+            max_pages (int): Pages extracted at most, the following ones are
+                             skipped (default: 0 = all pages)
+            page_memory_mb (int): Memory budget of a rendered page, the render
+                                  resolution is lowered to fit it
+                                  (default: 0 = no limit)
+            document_timeout (int): Max seconds of OCR per document
+                                    (default: 0 = none)
+            timeout_policy (str): 'degrade' or 'fail', what to do with pages
+                                  over the time budgets (default: 'degrade')
+            auto_rotate (bool): Detect the orientation of badly read pages and
+                                OCR them again upright (default: False)
+            preprocessing (iterable): Image pre-processing steps run before
+                                      Tesseract, among 'binarize',
+                                      'despeckle' and 'deskew' (default: none)
+            collect_words (bool): Return the word boxes of each page
+                                  (default: False)
+
+        Raises:
+            ValueError: If extraction_mode, ocr_strategy, ocr_engine,
+                        timeout_policy or a pre-processing step is unknown
+        """
+        self.extraction_mode = extraction_mode or self.DEFAULT_EXTRACTION_MODE
+        self.max_workers = max(1, max_workers or self.DEFAULT_MAX_WORKERS)
+        self.page_timeout = page_timeout or self.DEFAULT_PAGE_TIMEOUT
+        self.ocr_strategy = ocr_strategy or self.DEFAULT_OCR_STRATEGY
+        self.min_confidence = min_confidence or self.DEFAULT_MIN_CONFIDENCE
+        self.fast_tessdata_dir = fast_tessdata_dir or None
+        self.narrow_language = bool(narrow_language)
+        self.page_cache_size = max(0, page_cache_size or self.DEFAULT_PAGE_CACHE_SIZE)
+        self.max_pages = max(0, max_pages or self.DEFAULT_MAX_PAGES)
+        self.page_memory_mb = max(0, page_memory_mb or self.DEFAULT_PAGE_MEMORY_MB)
+        self.document_timeout = document_timeout or self.DEFAULT_DOCUMENT_TIMEOUT
+        self.timeout_policy = timeout_policy or self.DEFAULT_TIMEOUT_POLICY
+        self.auto_rotate = bool(auto_rotate)
+        self.collect_words = bool(collect_words)
+        self._language_detector = language_detection.LanguageDetector(
+            self.LANGUAGE_KEYWORDS, default_language=self.DEFAULT_LANGUAGE
+        )
+        self.preprocessing = tuple(preprocessing or ())
+        self._preprocessor = None
+        if self.preprocessing:
+            # Validates the step names
+            self._preprocessor = image_preprocessing.ImagePreprocessor(self.preprocessing)
+            self.preprocessing = self._preprocessor.steps
+            if not image_preprocessing.NUMPY_AVAILABLE:
+                _logger.warning("JSOCR: NumPy not installed, image pre-processing skipped")
+        if self.extraction_mode not in self.EXTRACTION_MODES:
+            raise ValueError(f"Unknown OCR extraction mode: {self.extraction_mode}")
+        if self.ocr_strategy not in self.OCR_STRATEGIES:
+            raise ValueError(f"Unknown OCR strategy: {self.ocr_strategy}")
+        if self.timeout_policy not in self.TIMEOUT_POLICIES:
+            raise ValueError(f"Unknown OCR timeout policy: {self.timeout_policy}")
+        self.ocr_engine = self._resolve_engine(ocr_engine or self.DEFAULT_OCR_ENGINE)
         if not PYMUPDF_AVAILABLE:
             _logger.error("JSOCR: PyMuPDF is required but not installed")
-        if not TESSERACT_AVAILABLE:
-            _logger.info("JSOCR: Tesseract not available - scanned PDF OCR disabled")
+
+    def _resolve_engine(self, ocr_engine):
+        """Return the OCR engine actually used for a configured engine.
+
+        Args:
+            ocr_engine (str): 'auto', 'pytesseract' or 'tesserocr'
+
+        Returns:
+            str: 'pytesseract' or 'tesserocr'
+
+        Raises:
+            ValueError: If ocr_engine is unknown
+        """
+        if ocr_engine not in self.OCR_ENGINES:
+            raise ValueError(f"Unknown OCR engine: {ocr_engine}")
+        if ocr_engine == 'pytesseract':
+            return ocr_engine
+        if TESSEROCR_AVAILABLE:
+            return 'tesserocr'
+        if ocr_engine == 'tesserocr':
+            _logger.warning("JSOCR: tesserocr not installed, falling back to pytesseract")
+        return 'pytesseract'
 
     def extract_text_from_pdf(self, pdf_binary):
         """Extract text from a PDF binary (native or scanned).
 
         Automatically detects if the PDF contains selectable text (native)
         or is a scanned document (images), and uses the appropriate method.
+        Thin wrapper around iter_page_texts().
 
         Args:
             pdf_binary (bytes): PDF file content as bytes
@@ -114,6 +483,62 @@ class OCRService:
             ValueError: If PDF is password protected
             ValueError: If Tesseract needed but not available
         """
+        return self.format_pages(self.iter_page_texts(pdf_binary))
+
+    def extract_pages(self, pdf_binary):
+        """Extract text from a PDF binary, page by page, with page metadata.
+
+        Args:
+            pdf_binary (bytes): PDF file content as bytes
+
+        Returns:
+            list[dict]: One dict per page, in page order (see iter_page_texts())
+
+        Raises:
+            ValueError: Same cases as extract_text_from_pdf()
+        """
+        return list(self.iter_page_texts(pdf_binary))
+
+    def iter_page_texts(self, pdf_binary):
+        """Yield the text of each page of a PDF as soon as it is available.
+
+        Pages are yielded in page order: a native page is yielded right away,
+        a scanned page as soon as its OCR finishes (while the next pages are
+        still being OCR'd when a worker pool is used). The document stays open
+        until the generator is exhausted or closed.
+
+        OCR is bounded by page_timeout per page and document_timeout for the
+        whole document. With the 'degrade' policy, a page over budget is
+        yielded with method 'timeout' and no text.
+
+        Args:
+            pdf_binary (bytes): PDF file content as bytes
+
+        Yields:
+            dict: One dict per page:
+                {
+                    'page': int,          # 1-based page number
+                    'text': str,          # Stripped page text
+                    'method': str,        # 'native', 'tesseract', 'empty'
+                                          # or 'timeout' (degraded page)
+                    'tier': str or None,  # OCR tier that produced the text
+                    'confidence': int or None,  # Mean OCR word confidence
+                    'dpi': int or None,   # Render resolution used for OCR
+                    'rotation': int,      # Clockwise degrees applied before
+                                          # OCR (OCR'd pages only)
+                    'preprocessing': dict or None,  # Step timings and skew
+                                          # angle (OCR'd pages only)
+                    'lang': str or None,  # Tesseract languages used for OCR
+                    'words': list,        # [x0, y0, x1, y1, text, confidence]
+                                          # relative to the page (collect_words
+                                          # only, native and OCR'd pages)
+                    'duration': float,    # Seconds spent on the page
+                }
+
+        Raises:
+            ValueError: Same cases as extract_text_from_pdf()
+            OCRTimeoutError: If a page is over budget with the 'fail' policy
+        """
         # Validate PyMuPDF availability
         if not PYMUPDF_AVAILABLE:
             raise ValueError(
@@ -126,133 +551,1206 @@ class OCRService:
 
         _logger.info("JSOCR: Starting text extraction from PDF")
 
-        # Detect PDF type and route to appropriate method
-        if self._is_native_pdf(pdf_binary):
-            _logger.info("JSOCR: Detected native PDF (selectable text)")
-            return self._extract_native_text(pdf_binary)
-        else:
-            _logger.info("JSOCR: Detected scanned PDF (images)")
-            return self._extract_scanned_text(pdf_binary)
+        deadline = None
+        if self.document_timeout:
+            deadline = time.monotonic() + self.document_timeout
+
+        # Open the document once; detection and extraction share the session
+        with self.open_document(pdf_binary) as session:
+            yield from self._iter_pages(session, deadline=deadline)
 
-    def _extract_native_text(self, pdf_binary):
-        """Extract text from a native PDF using PyMuPDF.
+    def extract_zones(self, pdf_binary, zones):
+        """Extract only the regions of a PDF described by a supplier mask.
+
+        Zones on native pages are read from the text layer inside the zone
+        rectangle. Zones on scanned pages are rendered as crops and OCR'd
+        concurrently (up to max_workers threads), instead of OCR'ing whole
+        pages that are mostly empty.
 
         Args:
             pdf_binary (bytes): PDF file content as bytes
+            zones (dict): {zone_name: {'page': int, 'rect': [x0, y0, x1, y1]}}
+                          with 1-based page numbers (negative counts from the
+                          last page), rectangles relative to the page size
+                          (0.0 to 1.0) and an optional Tesseract 'psm'
 
         Returns:
-            str: Extracted text from all pages
+            list[dict]: One dict per zone found in the document, in mask order,
+                        with the keys of iter_page_texts() plus 'zone'
+
+        Raises:
+            ValueError: Same cases as extract_text_from_pdf()
+            OCRTimeoutError: If a zone is over budget with the 'fail' policy
         """
-        try:
-            doc = fitz.open(stream=pdf_binary, filetype="pdf")
-        except Exception as e:
-            _logger.error("JSOCR: Failed to open PDF: %s", type(e).__name__)
-            raise ValueError(f"Invalid or corrupted PDF file: {str(e)}") from e
+        if not PYMUPDF_AVAILABLE:
+            raise ValueError(
+                "PyMuPDF is not installed. Please install with: pip install pymupdf"
+            )
 
-        try:
-            if doc.is_encrypted:
-                doc.close()
-                _logger.warning("JSOCR: PDF is password protected")
-                raise ValueError("PDF is password protected and cannot be processed")
+        if not pdf_binary:
+            raise ValueError("PDF binary data is empty or None")
 
-            text_parts = []
-            page_count = doc.page_count
+        _logger.info("JSOCR: Starting zone extraction of %d zone(s)", len(zones))
 
-            _logger.info("JSOCR: Processing native PDF with %d page(s)", page_count)
+        deadline = None
+        if self.document_timeout:
+            deadline = time.monotonic() + self.document_timeout
 
-            for page_num in range(page_count):
-                page = doc[page_num]
-                page_text = page.get_text()
+        with self.open_document(pdf_binary) as session:
+            return self._extract_zones(session, zones, deadline=deadline)
 
-                text_parts.append(f"--- Page {page_num + 1} ---")
-                text_parts.append(page_text.strip() if page_text else "")
+    def format_pages(self, pages):
+        """Concatenate page results into the text stored on import jobs.
 
-            doc.close()
-            full_text = "\n".join(text_parts)
+        Args:
+            pages (iterable of dict): Page results from iter_page_texts() or
+                                      zone results from extract_zones()
 
-            _logger.info("JSOCR: Native text extraction complete - %d page(s)", page_count)
-            return full_text
+        Returns:
+            str: Page texts, each preceded by a '--- Page N ---' marker
+                 (or '--- Zone name (page N) ---' for zones)
+        """
+        text_parts = []
+        for page in pages:
+            if page.get('zone'):
+                text_parts.append(f"--- Zone {page['zone']} (page {page['page']}) ---")
+            else:
+                text_parts.append(f"--- Page {page['page']} ---")
+            text_parts.append(page['text'])
+        return "\n".join(text_parts)
+
+    def add_text_layer(self, pdf_binary, pages):
+        """Write the OCR text of scanned pages back into the PDF.
+
+        The text is added as an invisible text layer (render mode 3): the
+        page looks unchanged, its text can be searched and copied, and a
+        later extraction reads it as native text instead of running OCR
+        again. Each word is placed on its box (see collect_words), so search
+        hits and selections line up with the image; pages without word
+        boxes get their lines stacked from the top of the page.
 
-        except ValueError:
-            raise
-        except Exception as e:
-            doc.close()
-            _logger.error("JSOCR: Error during native extraction: %s", type(e).__name__)
-            raise ValueError(f"Error extracting text from PDF: {str(e)}") from e
+        Args:
+            pdf_binary (bytes): PDF file content as bytes
+            pages (iterable of dict): Page results from iter_page_texts()
 
-    def _extract_scanned_text(self, pdf_binary):
-        """Extract text from a scanned PDF using Tesseract OCR.
+        Returns:
+            bytes or None: PDF with the text layer, None if no page was
+                           OCR'd (zone results and degraded pages are
+                           ignored)
 
-        Converts each page to an image and runs Tesseract OCR.
+        Raises:
+            ValueError: If PDF is corrupted, invalid or password protected
+        """
+        ocr_pages = {
+            page['page'] - 1: page
+            for page in pages
+            if page['method'] == 'tesseract' and not page.get('zone') and page['text'].strip()
+        }
+        if not ocr_pages:
+            return None
+
+        with self.open_document(pdf_binary) as session:
+            font = fitz.Font(self.TEXT_LAYER_FONT)
+            for page_num, result in ocr_pages.items():
+                if page_num >= session.page_count:
+                    continue
+                page = session.get_page(page_num)
+                if result.get('words'):
+                    self._insert_text_words(page, result['words'], font)
+                else:
+                    self._insert_text_layer(page, result['text'], font)
+            pdf_binary = session.doc.tobytes(garbage=1, deflate=True)
+
+        _logger.info("JSOCR: Text layer added to %d OCR'd page(s)", len(ocr_pages))
+        return pdf_binary
+
+    def _insert_text_words(self, page, words, font):
+        """Insert invisible words on a page, each on its OCR box.
+
+        Args:
+            page: PyMuPDF page object
+            words (list): [x0, y0, x1, y1, text, confidence] per word,
+                          coordinates relative to the displayed page
+            font (fitz.Font): Font used for the text layer
+        """
+        rect = page.rect
+        writer = fitz.TextWriter(rect)
+        for x0, y0, x1, y1, text, _confidence in words:
+            width = (x1 - x0) * rect.width
+            height = (y1 - y0) * rect.height
+            text_width = font.text_length(text, fontsize=1)
+            if not text.strip() or width <= 0 or height <= 0 or not text_width:
+                continue
+            # Fit the box height, narrowed so the word does not overflow it
+            fontsize = min(height, width / text_width)
+            baseline = rect.y0 + y1 * rect.height + font.descender * fontsize
+            writer.append(
+                (rect.x0 + x0 * rect.width, baseline), text, font=font, fontsize=fontsize,
+            )
+        # Boxes are in display coordinates, also on rotated pages
+        writer.write_text(page, render_mode=3, matrix=page.rotation_matrix)
+
+    def _insert_text_layer(self, page, text, font):
+        """Insert invisible text lines on a page, stacked from the top.
+
+        Used for pages without word boxes.
+
+        Args:
+            page: PyMuPDF page object
+            text (str): OCR text of the page
+            font (fitz.Font): Font used for the text layer
+        """
+        lines = [line for line in text.splitlines() if line.strip()]
+        if not lines:
+            return
+        rect = page.rect
+        widest = max(font.text_length(line, fontsize=1) for line in lines)
+        fontsize = min(
+            self.TEXT_LAYER_MAX_FONTSIZE,
+            rect.height / (len(lines) * self.TEXT_LAYER_LINE_HEIGHT),
+            rect.width / widest if widest else self.TEXT_LAYER_MAX_FONTSIZE,
+        )
+        line_height = fontsize * self.TEXT_LAYER_LINE_HEIGHT
+
+        writer = fitz.TextWriter(rect)
+        for index, line in enumerate(lines):
+            writer.append(
+                (rect.x0, rect.y0 + fontsize + index * line_height), line,
+                font=font, fontsize=fontsize,
+            )
+        # Lines are laid out in display coordinates, also on rotated pages
+        writer.write_text(page, render_mode=3, matrix=page.rotation_matrix)
+
+    def open_document(self, pdf_binary):
+        """Open a PDF once for detection, page count and extraction.
 
         Args:
             pdf_binary (bytes): PDF file content as bytes
 
         Returns:
-            str: OCR-extracted text from all pages
+            PDFDocumentSession: Opened session, to be used as a context manager
+
+        Raises:
+            ValueError: If PDF is corrupted, invalid or password protected
+        """
+        return PDFDocumentSession(pdf_binary).open()
+
+    def _route_pages(self, session):
+        """Decide for each page whether it is read natively or OCR'd.
+
+        In 'auto' mode one decision is made for the whole file from its first
+        pages. In 'hybrid' mode every page is classified on its own.
+
+        Args:
+            session (PDFDocumentSession): Opened document session
+
+        Only the first max_pages pages are routed when a page cap is set.
+
+        Returns:
+            list[str]: 'native', 'scanned' or 'empty' for each processed page
+        """
+        page_count = session.page_count
+        if self.max_pages and page_count > self.max_pages:
+            _logger.warning(
+                "JSOCR: PDF has %d pages, only the first %d are extracted",
+                page_count, self.max_pages
+            )
+            page_count = self.max_pages
+
+        if self.extraction_mode == 'hybrid':
+            _logger.info("JSOCR: Processing PDF with %d page(s) in hybrid mode", page_count)
+            return [session.classify_page(page_num) for page_num in range(page_count)]
+
+        # Detect PDF type and route all pages to the same method
+        if session.is_native():
+            _logger.info("JSOCR: Detected native PDF (selectable text)")
+            return ['native'] * page_count
+
+        _logger.info("JSOCR: Detected scanned PDF (images)")
+        return ['scanned'] * page_count
+
+    def _iter_pages(self, session, deadline=None):
+        """Yield the results of all pages of an opened document, in order.
+
+        Native pages reuse the text cached by the session; scanned pages are
+        OCR'd (in parallel when max_workers > 1). With narrow_language, the
+        language is detected from the native text or, failing that, from the
+        first OCR'd page, and the other pages are OCR'd with it only.
+
+        Args:
+            session (PDFDocumentSession): Opened document session
+            deadline (float, optional): time.monotonic() value at which the
+                                        document OCR budget is exhausted
+
+        Yields:
+            dict: Page results, see iter_page_texts()
+
+        Raises:
+            ValueError: If a scanned page is found and Tesseract is not available
+            ValueError: If extraction fails
+        """
+        try:
+            kinds = self._route_pages(session)
+            scanned_pages = [page_num for page_num, kind in enumerate(kinds) if kind == 'scanned']
+
+            ocr_results = iter(())
+            if scanned_pages:
+                self._check_tesseract_available()
+                _logger.info(
+                    "JSOCR: Processing %d scanned page(s) via Tesseract", len(scanned_pages)
+                )
+                ocr_results = self._ocr_scanned_pages(
+                    session, kinds, scanned_pages, deadline=deadline
+                )
+
+            for page_num, kind in enumerate(kinds):
+                if kind == 'scanned':
+                    # OCR results come in page order
+                    _ocr_page_num, result = next(ocr_results)
+                    result = dict(result)
+                else:
+                    start = time.monotonic()
+                    text = session.get_page_text(page_num) if kind == 'native' else ""
+                    result = {
+                        'text': text,
+                        'method': kind,
+                        'tier': None,
+                        'confidence': None,
+                        'dpi': None,
+                        'lang': None,
+                    }
+                    if self.collect_words:
+                        result['words'] = self._get_native_words(session.get_page(page_num))
+                    result['duration'] = time.monotonic() - start
+                result['page'] = page_num + 1
+                result['text'] = result['text'].strip() if result['text'] else ""
+                yield result
+
+            _logger.info(
+                "JSOCR: Text extraction complete - %d page(s), %d via Tesseract",
+                len(kinds), len(scanned_pages)
+            )
+
+        except ValueError:
+            raise
+        except Exception as e:
+            _logger.error("JSOCR: Error during text extraction: %s", type(e).__name__)
+            raise ValueError(f"Error extracting text from PDF: {str(e)}") from e
+
+    def _check_tesseract_available(self):
+        """Raise a clear error if Tesseract is needed but not installed.
 
         Raises:
             ValueError: If Tesseract is not available
         """
-        if not TESSERACT_AVAILABLE:
+        if not self.is_tesseract_available():
             raise ValueError(
                 "Tesseract OCR is not available. Please install Tesseract and pytesseract. "
                 "On Ubuntu: apt-get install tesseract-ocr tesseract-ocr-fra tesseract-ocr-deu"
             )
 
-        try:
-            doc = fitz.open(stream=pdf_binary, filetype="pdf")
-        except Exception as e:
-            _logger.error("JSOCR: Failed to open PDF for OCR: %s", type(e).__name__)
-            raise ValueError(f"Invalid or corrupted PDF file: {str(e)}") from e
+    def _ocr_scanned_pages(self, session, kinds, page_nums, deadline=None):
+        """OCR the scanned pages, narrowing the language when enabled.
 
-        try:
-            if doc.is_encrypted:
-                doc.close()
-                _logger.warning("JSOCR: PDF is password protected")
-                raise ValueError("PDF is password protected and cannot be processed")
+        The language is first looked for in the native pages text, which is
+        already extracted. If it is not conclusive, the first scanned page is
+        OCR'd with all languages and its text is used instead.
+
+        Args:
+            session (PDFDocumentSession): Opened document session
+            kinds (list[str]): Page kinds from _route_pages()
+            page_nums (list): 0-based page numbers to OCR
+            deadline (float, optional): Document OCR deadline (time.monotonic())
+
+        Yields:
+            tuple: (page_num, OCR result dict) for every requested page, in order
+        """
+        if not self.narrow_language:
+            yield from self._ocr_pages(session, page_nums, deadline=deadline)
+            return
+
+        # Native pages are sampled page by page, not joined
+        lang = self._get_narrowed_tesseract_lang(
+            session.get_page_text(page_num)
+            for page_num, kind in enumerate(kinds) if kind == 'native'
+        )
+        if lang or len(page_nums) == 1:
+            yield from self._ocr_pages(session, page_nums, lang=lang, deadline=deadline)
+            return
+
+        for page_num, result in self._ocr_pages(session, page_nums[:1], deadline=deadline):
+            yield page_num, result
+            lang = self._get_narrowed_tesseract_lang(result['text'])
+        yield from self._ocr_pages(session, page_nums[1:], lang=lang, deadline=deadline)
+
+    def _get_narrowed_tesseract_lang(self, texts):
+        """Return the single Tesseract language of a text, if unambiguous.
+
+        Args:
+            texts (str or iterable of str): Text already extracted from the
+                document, whole or per page
+
+        Returns:
+            str or None: Tesseract language code (e.g. 'deu'), or None when
+                         the detection confidence is under
+                         NARROWING_MIN_CONFIDENCE
+        """
+        best_lang, confidence, scores = self._language_detector.detect(texts or ())
+        if not best_lang or confidence < self.NARROWING_MIN_CONFIDENCE:
+            _logger.info(
+                "JSOCR: Language ambiguous for OCR narrowing (scores: %s, confidence %.2f), "
+                "keeping %s", scores, confidence, self.TESSERACT_LANG
+            )
+            return None
+
+        lang = self.TESSERACT_LANG_MAP[best_lang]
+        _logger.info("JSOCR: OCR narrowed to language '%s' (confidence %.2f)", lang, confidence)
+        return lang
+
+    def _ocr_pages(self, session, page_nums, lang=None, deadline=None):
+        """OCR a set of pages, serving recurring pages from the page cache.
+
+        Pages already OCR'd by this process with the same settings (same
+        rendered pixels) are taken from the page cache; only the other pages
+        are sent to Tesseract. Degraded (timed out) pages are not cached.
+
+        Args:
+            session (PDFDocumentSession): Opened document session
+            page_nums (list): 0-based page numbers to OCR
+            lang (str, optional): Tesseract language(s) replacing the defaults
+            deadline (float, optional): Document OCR deadline (time.monotonic())
+
+        Yields:
+            tuple: (page_num, OCR result dict) for every requested page, in order
+        """
+        if not self.page_cache_size:
+            yield from self._run_ocr_pages(session, page_nums, lang=lang, deadline=deadline)
+            return
+
+        page_cache = ocr_cache.get_page_cache(self.page_cache_size)
+        signature = dict(self.get_cache_signature(), page_lang=lang)
+
+        cached_results = {}
+        missing = {}
+        for page_num in page_nums:
+            start = time.monotonic()
+            page_hash = self._get_page_hash(session.get_page(page_num))
+            key = page_cache.make_key(page_hash, signature)
+            cached = page_cache.get(key)
+            if cached is None:
+                missing[page_num] = key
+            else:
+                cached['duration'] = time.monotonic() - start
+                cached_results[page_num] = cached
+
+        stats = page_cache.get_stats()
+        _logger.info(
+            "JSOCR: Page OCR cache reused %d/%d page(s) (process hit rate %.0f%%, %d entries)",
+            len(cached_results), len(page_nums), stats['hit_rate'] * 100, stats['entries']
+        )
+
+        # Missing pages are OCR'd in page order, merge them with the hits
+        ocr_results = self._run_ocr_pages(session, list(missing), lang=lang, deadline=deadline)
+        for page_num in page_nums:
+            if page_num in cached_results:
+                yield page_num, cached_results[page_num]
+                continue
+            _ocr_page_num, result = next(ocr_results)
+            if result['method'] != 'timeout':
+                page_cache.put(missing[page_num], result)
+            yield page_num, result
+
+    def _get_page_hash(self, page):
+        """Return an exact hash of a page rendered at low resolution.
+
+        Args:
+            page: PyMuPDF page object
+
+        Returns:
+            str: Hexadecimal SHA-256 of the page size and gray pixels
+        """
+        zoom = self.PAGE_HASH_DPI / 72.0
+        pixmap = page.get_pixmap(
+            matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False
+        )
+        digest = hashlib.sha256(f"{pixmap.width}x{pixmap.height}:".encode('ascii'))
+        digest.update(pixmap.samples_mv)
+        return digest.hexdigest()
 
-            text_parts = []
-            page_count = doc.page_count
+    def _run_ocr_pages(self, session, page_nums, lang=None, deadline=None):
+        """OCR a set of pages, sequentially or with a bounded process pool.
 
-            _logger.info("JSOCR: Processing scanned PDF with %d page(s) via Tesseract", page_count)
+        Args:
+            session (PDFDocumentSession): Opened document session
+            page_nums (list): 0-based page numbers to OCR
+            lang (str, optional): Tesseract language(s) replacing the defaults
+            deadline (float, optional): Document OCR deadline (time.monotonic())
 
-            for page_num in range(page_count):
-                page = doc[page_num]
+        Yields:
+            tuple: (page_num, OCR result dict) for every requested page, in order
 
-                # Convert page to image
-                image = self._convert_page_to_image(page)
+        Raises:
+            OCRTimeoutError: If a page is over budget with the 'fail' policy
+        """
+        if self.max_workers > 1 and len(page_nums) > 1:
+            yield from self._ocr_pages_parallel(session, page_nums, lang=lang, deadline=deadline)
+            return
+
+        page_count = session.page_count
+        for page_num in page_nums:
+            start = time.monotonic()
+            try:
+                result = dict(self._ocr_page(
+                    session.get_page(page_num), lang=lang, deadline=deadline
+                ))
+            except OCRTimeoutError as e:
+                result = self._get_degraded_result(page_num, e, lang=lang)
+            result['duration'] = time.monotonic() - start
+            if self.page_memory_mb:
+                # Drop the images MuPDF decoded for this page before the next
+                fitz.TOOLS.store_shrink(100)
+            _logger.info("JSOCR: OCR completed for page %d/%d", page_num + 1, page_count)
+            yield page_num, result
+
+    def _ocr_pages_parallel(self, session, page_nums, lang=None, deadline=None):
+        """OCR pages concurrently in a bounded pool of worker processes.
+
+        Each worker opens the PDF once (pool initializer) and then renders and
+        OCRs the pages it receives. Results are yielded back in page order as
+        soon as they are ready, while the next pages are still being OCR'd.
+        Closing the generator early cancels pending pages.
+
+        Time budgets are enforced by Tesseract inside the workers. When a
+        worker is still busy POOL_TIMEOUT_GRACE seconds after its budget (e.g.
+        stuck rendering), its pool is terminated, killing the worker: the page
+        is degraded and the remaining pages go to a new pool.
 
-                # Extract text with Tesseract
-                page_text = self._extract_text_with_tesseract(image)
+        Args:
+            session (PDFDocumentSession): Opened document session
+            page_nums (list): 0-based page numbers to OCR
+            lang (str, optional): Tesseract language(s) replacing the defaults
+            deadline (float, optional): Document OCR deadline (time.monotonic())
 
-                text_parts.append(f"--- Page {page_num + 1} ---")
-                text_parts.append(page_text.strip() if page_text else "")
+        Yields:
+            tuple: (page_num, OCR result dict) for every requested page, in order
 
+        Raises:
+            OCRTimeoutError: If a page is over budget with the 'fail' policy
+        """
+        workers = min(self.max_workers, len(page_nums))
+        page_count = session.page_count
+
+        _logger.info(
+            "JSOCR: OCR of %d page(s) with a pool of %d worker process(es)",
+            len(page_nums), workers
+        )
+
+        # multiprocessing.Pool owns its worker processes: terminate() kills
+        # a worker stuck on a page, leaving the pool closes the others
+        with _get_pool_context().Pool(
+            processes=workers,
+            initializer=_init_ocr_worker,
+            initargs=(session.pdf_binary, self._get_worker_settings()),
+        ) as pool:
+            pending = [
+                (page_num, pool.apply_async(_ocr_page_worker, (page_num, lang, deadline)))
+                for page_num in page_nums
+            ]
+            for index, (page_num, async_result) in enumerate(pending):
+                try:
+                    result = async_result.get(timeout=self._get_pool_wait_timeout(deadline))
+                except multiprocessing.TimeoutError:
+                    _logger.warning(
+                        "JSOCR: OCR worker of page %d over its time budget, killing worker pool",
+                        page_num + 1
+                    )
+                    pool.terminate()
+                    yield page_num, self._get_degraded_result(
+                        page_num, OCRTimeoutError(f"OCR timeout on page {page_num + 1}, worker killed"),
+                        lang=lang
+                    )
+                    remaining = page_nums[index + 1:]
+                    if remaining:
+                        yield from self._ocr_pages_parallel(
+                            session, remaining, lang=lang, deadline=deadline
+                        )
+                    return
                 _logger.info("JSOCR: OCR completed for page %d/%d", page_num + 1, page_count)
+                yield page_num, result
+            pool.close()
+            pool.join()
+
+    def _get_pool_wait_timeout(self, deadline=None):
+        """Return how long to wait for the next pool result before killing it.
 
-            doc.close()
-            full_text = "\n".join(text_parts)
+        Args:
+            deadline (float, optional): Document OCR deadline (time.monotonic())
 
-            _logger.info("JSOCR: Scanned text extraction complete - %d page(s)", page_count)
-            return full_text
+        Returns:
+            float or None: Seconds, None when no time budget is set
+        """
+        timeouts = []
+        if self.page_timeout:
+            timeouts.append(self.page_timeout)
+        if deadline is not None:
+            timeouts.append(max(0.0, deadline - time.monotonic()))
+        if not timeouts:
+            return None
+        return min(timeouts) + self.POOL_TIMEOUT_GRACE
+
+    def _get_degraded_result(self, page_num, error, lang=None):
+        """Return the result of a page over its time budget.
 
-        except ValueError:
-            raise
+        Args:
+            page_num (int): 0-based page number
+            error (OCRTimeoutError): Budget error raised for the page
+            lang (str, optional): Tesseract language(s) of the page
+
+        Returns:
+            dict: Page result with method 'timeout', no text and the 'error'
+
+        Raises:
+            OCRTimeoutError: The error itself, with the 'fail' policy
+        """
+        if self.timeout_policy == 'fail':
+            raise error
+        _logger.warning("JSOCR: Page %d degraded: %s", page_num + 1, error)
+        return {
+            'text': "",
+            'method': 'timeout',
+            'tier': None,
+            'confidence': None,
+            'dpi': None,
+            'lang': lang,
+            'error': str(error),
+        }
+
+    def _get_page_deadline(self, deadline=None):
+        """Return the OCR deadline of a page starting now.
+
+        Args:
+            deadline (float, optional): Document OCR deadline (time.monotonic())
+
+        Returns:
+            float or None: time.monotonic() value, None when unbounded
+
+        Raises:
+            OCRTimeoutError: If the document budget is already exhausted
+        """
+        if deadline is not None and time.monotonic() >= deadline:
+            raise OCRTimeoutError(
+                f"OCR document time budget of {self.document_timeout}s exhausted"
+            )
+        if not self.page_timeout:
+            return deadline
+        page_deadline = time.monotonic() + self.page_timeout
+        return page_deadline if deadline is None else min(page_deadline, deadline)
+
+    def _get_remaining_time(self, page_deadline):
+        """Return the Tesseract timeout left before a page deadline.
+
+        Args:
+            page_deadline (float or None): Deadline from _get_page_deadline()
+
+        Returns:
+            float: Seconds left (0 = no limit)
+
+        Raises:
+            OCRTimeoutError: If the deadline has passed
+        """
+        if page_deadline is None:
+            return 0
+        remaining = page_deadline - time.monotonic()
+        if remaining <= 0:
+            raise OCRTimeoutError("OCR page time budget exhausted")
+        return remaining
+
+    def _get_worker_settings(self):
+        """Return the constructor arguments needed to rebuild this service.
+
+        Used to create an equivalent OCRService inside pool worker processes.
+        Workers OCR single pages: the pool and the page cache stay in the
+        calling process.
+
+        Returns:
+            dict: Keyword arguments for OCRService()
+        """
+        return {
+            'extraction_mode': self.extraction_mode,
+            'max_workers': 1,
+            'page_timeout': self.page_timeout,
+            'ocr_strategy': self.ocr_strategy,
+            'min_confidence': self.min_confidence,
+            'fast_tessdata_dir': self.fast_tessdata_dir,
+            'narrow_language': self.narrow_language,
+            'ocr_engine': self.ocr_engine,
+            'page_cache_size': 0,
+            'max_pages': self.max_pages,
+            'page_memory_mb': self.page_memory_mb,
+            'document_timeout': self.document_timeout,
+            'timeout_policy': self.timeout_policy,
+            'auto_rotate': self.auto_rotate,
+            'preprocessing': self.preprocessing,
+            'collect_words': self.collect_words,
+        }
+
+    def _ocr_page(self, page, lang=None, deadline=None):
+        """Render a single PDF page and run Tesseract on it.
+
+        Pages made of a single scanned image are OCR'd from that image at its
+        native resolution instead of being rendered (see
+        _extract_embedded_image()). The 'dpi' of the result is the resolution
+        actually used.
+
+        With the 'tiered' strategy, the page is first OCR'd with the cheapest
+        tier and re-OCR'd with the next tiers only while the result quality
+        (mean word confidence, amount of text) stays below the thresholds.
+        The best result seen is kept, also when a later tier runs out of time.
+
+        All passes share the page time budget (page_timeout, capped by the
+        document deadline).
+
+        With auto_rotate, a first pass that does not look like upright text
+        triggers orientation detection, and the page is OCR'd again rotated
+        (see _ocr_rotated_page()).
+
+        Args:
+            page: PyMuPDF page object
+            lang (str, optional): Tesseract language(s) used by every pass
+                                  instead of the default ones
+            deadline (float, optional): Document OCR deadline (time.monotonic())
+
+        Returns:
+            dict: {'text', 'method', 'tier', 'confidence', 'dpi', 'lang',
+                   'rotation', 'preprocessing'}
+
+        Raises:
+            OCRTimeoutError: If the page exceeds its time budget
+        """
+        page_deadline = self._get_page_deadline(deadline)
+        embedded = self._extract_embedded_image(page)
+        return self._ocr_page_passes(page, lang, page_deadline, embedded)
+
+    def _ocr_page_passes(self, page, lang, page_deadline, embedded, rotation=0):
+        """Run the OCR passes of the configured strategy on a page.
+
+        Args:
+            page: PyMuPDF page object
+            lang (str or None): Tesseract language(s) replacing the defaults
+            page_deadline (float or None): Deadline from _get_page_deadline()
+            embedded (dict or None): Embedded image from _extract_embedded_image()
+            rotation (int): Clockwise degrees the page image is rotated by
+
+        Returns:
+            dict: Page OCR result, see _ocr_page()
+
+        Raises:
+            OCRTimeoutError: If the page exceeds its time budget
+        """
+        check_orientation = self.auto_rotate and not rotation
+
+        if self.ocr_strategy == 'single':
+            lang = lang or self.TESSERACT_LANG
+
+            # Convert page to image
+            image, dpi, image_rect = self._get_ocr_image(page, self.DEFAULT_DPI, embedded, rotation)
+            rotated_size = image.size
+            image, preprocessing = self._preprocess_image(image)
+
+            # Extract text with Tesseract
+            words = None
+            timeout = self._get_remaining_time(page_deadline)
+            if self.collect_words:
+                text, _confidence, words = self._run_tesseract(
+                    image, lang=lang, psm=self.TESSERACT_PSM, timeout=timeout, with_words=True
+                )
+            else:
+                text = self._extract_text_with_tesseract(image, lang=lang, timeout=timeout)
+            result = {
+                'text': text,
+                'method': 'tesseract',
+                'tier': 'single',
+                'confidence': None,
+                'dpi': dpi,
+                'lang': lang,
+                'rotation': rotation,
+                'preprocessing': preprocessing,
+            }
+            if words is not None:
+                result['words'] = self._get_ocr_words(
+                    words, page, image_rect, rotation, rotated_size, image.size, preprocessing
+                )
+            if check_orientation and self._needs_orientation_check(result):
+                return self._ocr_rotated_page(
+                    page, lang, page_deadline, embedded, image, result
+                ) or result
+            return result
+
+        best = None
+        for tier in self.OCR_TIERS:
+            tier_lang = lang or tier['lang'] or self.TESSERACT_LANG
+            image, dpi, image_rect = self._get_ocr_image(page, tier['dpi'], embedded, rotation)
+            rotated_size = image.size
+            image, preprocessing = self._preprocess_image(image)
+            tessdata_dir = self.fast_tessdata_dir if tier['fast_models'] else None
+            try:
+                text, confidence, *words = self._run_tesseract(
+                    image,
+                    lang=tier_lang,
+                    psm=tier['psm'],
+                    tessdata_dir=tessdata_dir,
+                    timeout=self._get_remaining_time(page_deadline),
+                    with_words=self.collect_words,
+                )
+            except OCRTimeoutError:
+                if best is None:
+                    raise
+                _logger.warning(
+                    "JSOCR: Page %d out of time at tier '%s', keeping tier '%s'",
+                    page.number + 1, tier['name'], best['tier']
+                )
+                break
+
+            result = {
+                'text': text,
+                'method': 'tesseract',
+                'tier': tier['name'],
+                'confidence': confidence,
+                'dpi': dpi,
+                'lang': tier_lang,
+                'rotation': rotation,
+                'preprocessing': preprocessing,
+            }
+            if words:
+                result['words'] = self._get_ocr_words(
+                    words[0], page, image_rect, rotation, rotated_size, image.size, preprocessing
+                )
+            if best is None and check_orientation and self._needs_orientation_check(result):
+                # First pass of a page that may be rotated
+                rotated = self._ocr_rotated_page(
+                    page, lang, page_deadline, embedded, image, result
+                )
+                if rotated:
+                    return rotated
+            image = None  # Release the page pixels before the next tier
+
+            if best is None or confidence > best['confidence']:
+                best = result
+
+            if self._is_ocr_quality_sufficient(text, confidence):
+                break
+
+            _logger.info(
+                "JSOCR: Page %d low OCR quality at tier '%s' (confidence=%d), escalating",
+                page.number + 1, tier['name'], confidence
+            )
+
+        return best
+
+    def _needs_orientation_check(self, result):
+        """Check if an OCR pass looks like a rotated or upside-down scan.
+
+        Args:
+            result (dict): OCR pass result
+
+        Returns:
+            bool: True if the confidence is low or the text has few
+                  dictionary-like words, False for a page without words
+                  (blank page, only numbers): there is nothing to compare
+                  a rotated pass with
+        """
+        word_ratio = self._get_word_ratio(result['text'])
+        if word_ratio is None:
+            return False
+        confidence = result['confidence']
+        if confidence is not None and confidence < self.min_confidence:
+            return True
+        return word_ratio < self.ORIENTATION_MIN_WORD_RATIO
+
+    def _get_word_ratio(self, text):
+        """Return the share of dictionary-like words among the text tokens.
+
+        Tokens holding digits (amounts, dates, references) are ignored. A
+        token is word-like when, stripped of punctuation, it is made of at
+        least 2 letters including a vowel, or is an upper case abbreviation
+        (CHF, MWST). OCR of a rotated page gives mostly isolated symbols and
+        consonant clusters.
+
+        Args:
+            text (str): OCR text
+
+        Returns:
+            float or None: Ratio between 0.0 and 1.0, None for text without
+                           tokens
+        """
+        tokens = [token for token in text.split() if not any(char.isdigit() for char in token)]
+        if not tokens:
+            return None
+        words = 0
+        for token in tokens:
+            token = token.strip('.,;:!?()[]"\'«»-')
+            if not self.WORD_PATTERN.fullmatch(token):
+                continue
+            if token.isupper() or not self.VOWELS.isdisjoint(token.lower()):
+                words += 1
+        return words / len(tokens)
+
+    def _ocr_rotated_page(self, page, lang, page_deadline, embedded, image, result):
+        """Detect the orientation of a page and OCR it again upright.
+
+        Args:
+            page: PyMuPDF page object
+            lang (str or None): Tesseract language(s) replacing the defaults
+            page_deadline (float or None): Deadline from _get_page_deadline()
+            embedded (dict or None): Embedded image from _extract_embedded_image()
+            image (PIL.Image): Image of the first pass, used for detection
+            result (dict): Result of the first pass
+
+        Returns:
+            dict or None: Result of the rotated page, None when the page is
+                          upright, out of time or not read better rotated
+        """
+        try:
+            rotation = self._detect_rotation(
+                image, timeout=self._get_remaining_time(page_deadline)
+            )
+            if not rotation:
+                return None
+            _logger.info("JSOCR: Page %d is rotated, OCR again after a %d degree rotation",
+                         page.number + 1, rotation)
+            rotated = self._ocr_page_passes(
+                page, lang, page_deadline, embedded, rotation=rotation
+            )
+        except OCRTimeoutError:
+            _logger.warning("JSOCR: Page %d out of time for orientation correction",
+                            page.number + 1)
+            return None
+
+        if (self._get_word_ratio(rotated['text']) or 0.0) < self._get_word_ratio(result['text']):
+            _logger.info("JSOCR: Page %d not read better rotated, keeping first pass",
+                         page.number + 1)
+            return None
+        return rotated
+
+    def _detect_rotation(self, image, timeout=None):
+        """Detect the rotation needed to make a page image upright.
+
+        Args:
+            image (PIL.Image): Page image
+            timeout (float, optional): Seconds before Tesseract is stopped
+                                       (0 = none)
+
+        Returns:
+            int: Clockwise rotation in degrees (0, 90, 180 or 270), 0 when
+                 the orientation cannot be detected with enough confidence
+
+        Raises:
+            OCRTimeoutError: If Tesseract exceeds the timeout
+        """
+        try:
+            if self.ocr_engine == 'tesserocr':
+                api = _get_tesserocr_api('osd', self.OSD_PSM)
+                api.SetImage(image)
+                try:
+                    osd = api.DetectOrientationScript()
+                finally:
+                    api.Clear()
+                if not osd:
+                    return 0
+                # orient_deg is counter-clockwise, turn it into the correction
+                rotation = (360 - osd['orient_deg']) % 360
+                confidence = osd['orient_conf']
+            else:
+                osd = pytesseract.image_to_osd(
+                    image, config=f'--psm {self.OSD_PSM}',
+                    output_type=pytesseract.Output.DICT, timeout=timeout or 0
+                )
+                rotation = int(osd['rotate'])
+                confidence = float(osd['orientation_conf'])
         except Exception as e:
-            doc.close()
-            _logger.error("JSOCR: Error during OCR extraction: %s", type(e).__name__)
-            raise ValueError(f"Error during OCR extraction: {str(e)}") from e
+            if self._is_tesseract_timeout(e):
+                raise OCRTimeoutError(f"Tesseract OSD timeout after {timeout:.0f}s") from e
+            # Tesseract refuses pages with too few characters
+            _logger.info("JSOCR: Orientation detection failed: %s", type(e).__name__)
+            return 0
+
+        if confidence < self.OSD_MIN_CONFIDENCE:
+            return 0
+        return rotation
+
+    def _is_ocr_quality_sufficient(self, text, confidence):
+        """Check if an OCR pass is good enough to skip further tiers.
+
+        Args:
+            text (str): OCR text
+            confidence (int): Mean word confidence (0-100)
+
+        Returns:
+            bool: True if confidence and text density reach the thresholds
+        """
+        text_chars = sum(1 for char in text if char.isalnum())
+        return confidence >= self.min_confidence and text_chars >= self.MIN_TEXT_CHARS
+
+    def _get_ocr_image(self, page, dpi, embedded=None, rotation=0):
+        """Return the image to OCR for a page at a requested resolution.
+
+        Args:
+            page: PyMuPDF page object
+            dpi (int): Requested resolution
+            embedded (dict, optional): Embedded image from
+                                       _extract_embedded_image(), decoded
+                                       here when its resolution suits
+            rotation (int): Clockwise degrees to rotate the image by
+
+        Returns:
+            tuple: (PIL.Image, int resolution of the image, fitz.Rect page
+                    area shown by the image before rotation)
+        """
+        image = None
+        if embedded and embedded['dpi'] <= dpi * self.MAX_EMBEDDED_DPI_RATIO:
+            image = self._decode_embedded_image(page, embedded)
+        if image is not None:
+            dpi, image_rect = embedded['dpi'], embedded['rect']
+        else:
+            dpi = self._fit_dpi_to_budget(page.rect, dpi)
+            image = self._convert_page_to_image(page, dpi=dpi)
+            image_rect = page.rect
+        if rotation:
+            # PIL rotates counter-clockwise; right angles are exact transposes
+            image = image.rotate(-rotation, expand=True)
+        return image, dpi, image_rect
+
+    def _get_native_words(self, page):
+        """Return the word boxes of a page's text layer.
+
+        Args:
+            page: PyMuPDF page object
+
+        Returns:
+            list: [x0, y0, x1, y1, text, None] per word, coordinates relative
+                  to the displayed page (0.0 to 1.0)
+        """
+        # Text layer coordinates ignore the page rotation, page.rect does not
+        to_page = page.rotation_matrix * self._get_relative_matrix(page.rect)
+        return self._get_word_boxes(
+            ((*word[:4], word[4], None) for word in page.get_text('words')), to_page
+        )
+
+    def _get_ocr_words(self, words, page, image_rect, rotation, rotated_size, size,
+                       preprocessing):
+        """Convert Tesseract word boxes to page coordinates.
 
-    def _convert_page_to_image(self, page, dpi=None):
+        Undoes the transformations of the OCR'd image: deskew rotation (see
+        _preprocess_image()), right-angle rotation, then the scaling of the
+        rendered or embedded image.
+
+        Args:
+            words (list): (left, top, right, bottom, text, confidence) in
+                          pixels of the OCR'd image
+            page: PyMuPDF page object
+            image_rect (fitz.Rect): Page area shown by the unrotated image
+            rotation (int): Clockwise degrees the image was rotated by
+            rotated_size (tuple): Image size after rotation, before
+                                  pre-processing
+            size (tuple): Size of the OCR'd image
+            preprocessing (dict or None): Pre-processing report
+
+        Returns:
+            list: [x0, y0, x1, y1, text, confidence] per word, coordinates
+                  relative to the displayed page (0.0 to 1.0)
+        """
+        to_page = fitz.Matrix(1, 1)
+        skew = (preprocessing or {}).get('skew_angle')
+        if skew and abs(skew) >= self._preprocessor.DESKEW_MIN_ANGLE:
+            to_page = self._get_unrotate_matrix(size, rotated_size, skew)
+        width, height = rotated_size
+        if rotation in (90, 270):
+            width, height = height, width
+        if rotation:
+            to_page *= self._get_unrotate_matrix(rotated_size, (width, height), rotation)
+        to_page *= fitz.Matrix(image_rect.width / width, image_rect.height / height)
+        to_page *= fitz.Matrix(1, 0, 0, 1, image_rect.x0, image_rect.y0)
+        to_page *= self._get_relative_matrix(page.rect)
+        return self._get_word_boxes(words, to_page)
+
+    def _get_unrotate_matrix(self, size, original_size, angle):
+        """Matrix mapping pixels of a rotated image back to the original image.
+
+        Args:
+            size (tuple): Size of the rotated (expanded) image
+            original_size (tuple): Size of the image before rotation
+            angle (float): Clockwise degrees the image was rotated by
+
+        Returns:
+            fitz.Matrix: Rotation by -angle about the image centres
+        """
+        matrix = fitz.Matrix(1, 0, 0, 1, -size[0] / 2, -size[1] / 2)
+        # In y-down image coordinates fitz.Matrix(deg) turns clockwise
+        matrix *= fitz.Matrix(-angle)
+        matrix *= fitz.Matrix(1, 0, 0, 1, original_size[0] / 2, original_size[1] / 2)
+        return matrix
+
+    def _get_relative_matrix(self, rect):
+        """Matrix mapping page coordinates to 0.0-1.0 coordinates of a rect."""
+        return (fitz.Matrix(1, 0, 0, 1, -rect.x0, -rect.y0)
+                * fitz.Matrix(1 / rect.width, 1 / rect.height))
+
+    def _get_word_boxes(self, words, matrix):
+        """Transform word boxes and round them for storage.
+
+        Args:
+            words (iterable): (x0, y0, x1, y1, text, confidence) tuples
+            matrix (fitz.Matrix): Transformation to relative page coordinates
+
+        Returns:
+            list: [x0, y0, x1, y1, text, confidence] lists (JSON-friendly)
+        """
+        boxes = []
+        for x0, y0, x1, y1, text, confidence in words:
+            rect = fitz.Rect(x0, y0, x1, y1) * matrix
+            boxes.append([
+                round(rect.x0, 5), round(rect.y0, 5), round(rect.x1, 5), round(rect.y1, 5),
+                text, confidence,
+            ])
+        return boxes
+
+    def _preprocess_image(self, image):
+        """Run the configured pre-processing steps on an image to OCR.
+
+        Args:
+            image (PIL.Image): Gray page image
+
+        Returns:
+            tuple: (PIL.Image, dict report of ImagePreprocessor.process() or
+                    None when pre-processing is disabled)
+        """
+        if not self._preprocessor or not image_preprocessing.NUMPY_AVAILABLE:
+            return image, None
+        return self._preprocessor.process(image)
+
+    def _fit_dpi_to_budget(self, rect, dpi):
+        """Lower a render resolution until the render fits page_memory_mb.
+
+        Args:
+            rect (fitz.Rect): Rendered area in points (page or clip)
+            dpi (int): Requested resolution
+
+        Returns:
+            int: dpi, or the highest resolution fitting the memory budget
+        """
+        if not self.page_memory_mb:
+            return dpi
+        budget_pixels = self.page_memory_mb * 1024 * 1024 / self.RENDER_BYTES_PER_PIXEL
+        pixels = (rect.width * dpi / 72.0) * (rect.height * dpi / 72.0)
+        if pixels <= budget_pixels:
+            return dpi
+        fitted_dpi = max(1, int(dpi * math.sqrt(budget_pixels / pixels)))
+        _logger.info(
+            "JSOCR: Render at %d DPI exceeds %d MB page budget, using %d DPI",
+            dpi, self.page_memory_mb, fitted_dpi
+        )
+        return fitted_dpi
+
+    def _extract_embedded_image(self, page):
+        """Return the scan embedded in a page, if it can be OCR'd directly.
+
+        Scanned PDFs usually hold one JPEG/CCITT image per page. When the page
+        shows that single image upright, without text or vector drawings on
+        top of it, the image is decoded at its native resolution instead of
+        rasterising the page (often a 1.5-2x upscale of scanner output).
+
+        Only the image metadata is read here: the effective DPI comes from
+        the image size and placement, and the image is decoded by
+        _get_ocr_image() the first time a pass can use it.
+
+        Args:
+            page: PyMuPDF page object
+
+        Returns:
+            dict or None: {'xref', 'dpi' (effective DPI), 'rect' (fitz.Rect
+                          image placement on the page), 'image' (decoded
+                          PIL.Image, None until used)}, or None when the
+                          page has to be rendered
+        """
+        if page.rotation or len(page.get_images(full=True)) != 1:
+            return None
+
+        infos = page.get_image_info(xrefs=True)
+        if len(infos) != 1 or not infos[0].get('xref'):
+            return None
+        info = infos[0]
+
+        # Only upright, unflipped placements (no rotation/shear in transform)
+        a, b, c, d = info['transform'][:4]
+        if abs(b) > 1e-3 or abs(c) > 1e-3 or a <= 0 or d <= 0:
+            return None
+
+        bbox = fitz.Rect(info['bbox'])
+        if bbox.is_empty:
+            return None
+        effective_dpi = int(round(info['width'] * 72.0 / bbox.width))
+        if effective_dpi < self.MIN_EMBEDDED_DPI:
+            return None
+
+        # Too large for the page memory budget: render at a fitted resolution
+        budget_bytes = self.page_memory_mb * 1024 * 1024
+        image_bytes = info['width'] * info['height'] * self.RENDER_BYTES_PER_PIXEL
+        if budget_bytes and image_bytes > budget_bytes:
+            return None
+
+        # Text or vector overlays would be missing from the bare image
+        if page.get_fonts() or page.get_drawings():
+            return None
+
+        return {'xref': info['xref'], 'dpi': effective_dpi, 'rect': bbox, 'image': None}
+
+    def _decode_embedded_image(self, page, embedded):
+        """Decode an embedded scan found by _extract_embedded_image().
+
+        Args:
+            page: PyMuPDF page object
+            embedded (dict): Embedded image, its 'image' is set once decoded
+
+        Returns:
+            PIL.Image or None: Image in 'L' mode, None if it cannot be
+                               decoded (the page is then rendered)
+        """
+        if embedded['image'] is None and not embedded.get('failed'):
+            try:
+                pixmap = fitz.Pixmap(page.parent, embedded['xref'])
+                if pixmap.alpha:
+                    pixmap = fitz.Pixmap(pixmap, 0)
+                if pixmap.colorspace is None:
+                    embedded['failed'] = True
+                    return None
+                if pixmap.colorspace.n != 1:
+                    pixmap = fitz.Pixmap(fitz.csGRAY, pixmap)
+            except Exception as e:
+                _logger.info("JSOCR: Embedded image of page %d not decodable (%s), rendering page",
+                             page.number + 1, type(e).__name__)
+                embedded['failed'] = True
+                return None
+
+            _logger.debug("JSOCR: Page %d OCR'd from embedded image at %d DPI",
+                          page.number + 1, embedded['dpi'])
+            embedded['image'] = self._pixmap_to_image(pixmap)
+            del pixmap  # Free the decoded samples, the image holds a copy
+        return embedded['image']
+
+    def _convert_page_to_image(self, page, dpi=None, clip=None):
         """Convert a PDF page to a PIL Image.
 
+        The page is rendered in single-channel gray without alpha and the
+        image is built directly from the pixmap samples: no PNG encode/decode
+        round trip and a third of the memory of an RGB render.
+
         Args:
             page: PyMuPDF page object
             dpi (int, optional): Resolution for rendering. Defaults to 300.
+            clip (fitz.Rect, optional): Render only this area of the page
 
         Returns:
-            PIL.Image: Rendered page as image
+            PIL.Image: Rendered page as grayscale ('L') image
         """
         if dpi is None:
             dpi = self.DEFAULT_DPI
@@ -261,40 +1759,369 @@ class OCRService:
         zoom = dpi / 72.0
         mat = fitz.Matrix(zoom, zoom)
 
-        # Render page to pixmap
-        pixmap = page.get_pixmap(matrix=mat)
-
-        # Convert to PIL Image
-        img_bytes = pixmap.tobytes("png")
-        image = Image.open(io.BytesIO(img_bytes))
+        # Render page to a gray pixmap (1 byte per pixel)
+        pixmap = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False, clip=clip)
 
+        image = self._pixmap_to_image(pixmap)
+        del pixmap  # Free the render now, the image holds a copy
         return image
 
-    def _extract_text_with_tesseract(self, image):
+    def _pixmap_to_image(self, pixmap):
+        """Build a PIL Image from the samples of a gray PyMuPDF pixmap.
+
+        The samples are copied once into the image (a plain memory copy, no
+        encoding). The image must not share the pixmap memory: PyMuPDF
+        releases its samples memoryview when the pixmap is collected and
+        fails if an image still exports it.
+
+        Args:
+            pixmap (fitz.Pixmap): Gray pixmap without alpha
+
+        Returns:
+            PIL.Image: 'L' mode image
+        """
+        return Image.frombytes(
+            'L', (pixmap.width, pixmap.height), pixmap.samples_mv,
+            'raw', 'L', pixmap.stride, 1
+        )
+
+    def _extract_text_with_tesseract(self, image, lang=None, timeout=None):
         """Extract text from an image using Tesseract OCR.
 
         Args:
             image (PIL.Image): Image to process
+            lang (str, optional): Tesseract language(s). Defaults to
+                                  TESSERACT_LANG.
+            timeout (float, optional): Seconds before Tesseract is stopped
+                                       (default: page_timeout, 0 = none)
 
         Returns:
             str: Extracted text
 
         Raises:
+            OCRTimeoutError: If Tesseract exceeds the timeout
             ValueError: If Tesseract fails
         """
+        lang = lang or self.TESSERACT_LANG
+        if timeout is None:
+            timeout = self.page_timeout
+        if self.ocr_engine == 'tesserocr':
+            text, _confidence = self._run_tesserocr(
+                image, lang, self.TESSERACT_PSM, timeout=timeout
+            )
+            return text
+
         try:
-            config = f"{self.TESSERACT_CONFIG} -l {self.TESSERACT_LANG}"
-            text = pytesseract.image_to_string(image, config=config)
+            config = f"{self.TESSERACT_CONFIG} -l {lang}"
+            # pytesseract kills the tesseract process once the timeout expires
+            text = pytesseract.image_to_string(image, config=config, timeout=timeout or 0)
             return text
+        except Exception as e:
+            raise self._get_tesseract_error(e, timeout) from e
+
+    def _is_tesseract_timeout(self, error):
+        """Check if a pytesseract exception reports a killed process."""
+        # pytesseract reports a killed process as RuntimeError('... timeout')
+        return isinstance(error, RuntimeError) and 'timeout' in str(error).lower()
+
+    def _get_tesseract_error(self, error, timeout):
+        """Convert a pytesseract exception into the error raised by the service.
+
+        Args:
+            error (Exception): Exception raised by pytesseract
+            timeout (float): Timeout given to pytesseract
+
+        Returns:
+            ValueError: OCRTimeoutError if the process was killed on timeout
+        """
+        if self._is_tesseract_timeout(error):
+            _logger.warning("JSOCR: Tesseract stopped after %.0fs", timeout)
+            return OCRTimeoutError(f"Tesseract OCR timeout after {timeout:.0f}s")
+        _logger.error("JSOCR: Tesseract OCR failed: %s", type(error).__name__)
+        return ValueError(f"Tesseract OCR failed: {str(error)}")
+
+    def _run_tesseract(self, image, lang, psm, tessdata_dir=None, timeout=None,
+                       with_words=False):
+        """Run Tesseract and return the text with its mean word confidence.
+
+        Uses a single image_to_data call: the text is rebuilt from the word
+        boxes (one line per Tesseract line, blank line between blocks).
+
+        Args:
+            image (PIL.Image): Image to process
+            lang (str): Tesseract language string (e.g. 'fra+deu')
+            psm (int): Tesseract page segmentation mode
+            tessdata_dir (str, optional): Alternative traineddata directory
+            timeout (float, optional): Seconds before Tesseract is stopped
+                                       (default: page_timeout, 0 = none)
+            with_words (bool): Also return the word boxes
+
+        Returns:
+            tuple: (text: str, confidence: int), followed by the list of
+                   (left, top, right, bottom, text, confidence) word boxes
+                   in image pixels with with_words
+
+        Raises:
+            OCRTimeoutError: If Tesseract exceeds the timeout
+            ValueError: If Tesseract fails
+        """
+        if timeout is None:
+            timeout = self.page_timeout
+        if self.ocr_engine == 'tesserocr':
+            return self._run_tesserocr(
+                image, lang, psm, tessdata_dir, timeout=timeout, with_words=with_words
+            )
+
+        config = f"--psm {psm} -l {lang}"
+        if tessdata_dir:
+            config += f' --tessdata-dir "{tessdata_dir}"'
+
+        try:
+            data = pytesseract.image_to_data(
+                image, config=config, output_type=pytesseract.Output.DICT,
+                timeout=timeout or 0
+            )
+        except Exception as e:
+            raise self._get_tesseract_error(e, timeout) from e
+
+        lines = []
+        confidences = []
+        words = []
+        current_key = None
+        current_block = None
+        for i, word in enumerate(data['text']):
+            word = (word or '').strip()
+            if not word:
+                continue
+            conf = float(data['conf'][i])
+            if conf >= 0:
+                confidences.append(conf)
+            if with_words:
+                left, top = data['left'][i], data['top'][i]
+                words.append((left, top, left + data['width'][i], top + data['height'][i],
+                              word, int(conf)))
+            key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            if key != current_key:
+                if current_block is not None and data['block_num'][i] != current_block:
+                    lines.append('')
+                lines.append(word)
+                current_key = key
+                current_block = data['block_num'][i]
+            else:
+                lines[-1] += ' ' + word
+
+        confidence = int(sum(confidences) / len(confidences)) if confidences else 0
+        if with_words:
+            return "\n".join(lines), confidence, words
+        return "\n".join(lines), confidence
+
+    def _run_tesserocr(self, image, lang, psm, tessdata_dir=None, timeout=None,
+                       with_words=False):
+        """Run the in-process Tesseract API on an image.
+
+        The API (and its loaded models) is reused across pages of the same
+        thread or worker process; only the image and results are cleared.
+
+        Args:
+            image (PIL.Image): Image to process
+            lang (str): Tesseract language string (e.g. 'fra+deu')
+            psm (int): Tesseract page segmentation mode
+            tessdata_dir (str, optional): Alternative traineddata directory
+            timeout (float, optional): Seconds before recognition is cancelled
+                                       (default: page_timeout, 0 = none)
+            with_words (bool): Also return the word boxes
+
+        Returns:
+            tuple: (text: str, confidence: int), followed by the word boxes
+                   with with_words (see _run_tesseract())
+
+        Raises:
+            OCRTimeoutError: If Tesseract exceeds the timeout
+            ValueError: If Tesseract fails
+        """
+        if timeout is None:
+            timeout = self.page_timeout
+        try:
+            api = _get_tesserocr_api(lang, psm, tessdata_dir)
+            api.SetImage(image)
+            try:
+                # Recognize() returns False when the timeout (ms) cancels it
+                if not api.Recognize(timeout=int(timeout * 1000)):
+                    raise OCRTimeoutError(
+                        f"Tesseract OCR timeout after {timeout:.0f}s"
+                    )
+                text = api.GetUTF8Text()
+                confidence = max(0, api.MeanTextConf())
+                words = _get_tesserocr_words(api) if with_words else None
+            finally:
+                api.Clear()
+        except ValueError:
+            raise
         except Exception as e:
             _logger.error("JSOCR: Tesseract OCR failed: %s", type(e).__name__)
             raise ValueError(f"Tesseract OCR failed: {str(e)}") from e
 
+        if with_words:
+            return text, confidence, words
+        return text, confidence
+
+    def _extract_zones(self, session, zones, deadline=None):
+        """Extract the zones of an opened document.
+
+        Crops are rendered sequentially (PyMuPDF documents must not be used
+        from several threads), then OCR'd by a thread pool: Tesseract runs
+        outside the GIL, in its own process or in libtesseract.
+
+        Args:
+            session (PDFDocumentSession): Opened document session
+            zones (dict): Zone definitions, see extract_zones()
+            deadline (float, optional): Document OCR deadline (time.monotonic())
+
+        Returns:
+            list[dict]: Zone results, see extract_zones()
+
+        Raises:
+            ValueError: If a scanned zone is found and Tesseract is not available
+            ValueError: If extraction fails
+            OCRTimeoutError: If a zone is over budget with the 'fail' policy
+        """
+        try:
+            results = []
+            ocr_jobs = []
+            for name, zone in zones.items():
+                page_num = self._resolve_zone_page(session, zone.get('page', 1))
+                if page_num is None:
+                    _logger.info("JSOCR: Zone '%s' page %s not in document, skipped",
+                                 name, zone.get('page'))
+                    continue
+
+                start = time.monotonic()
+                page = session.get_page(page_num)
+                clip = self._get_zone_rect(page, zone['rect'])
+                kind = session.classify_page(page_num)
+                result = {
+                    'zone': name,
+                    'page': page_num + 1,
+                    'text': "",
+                    'method': kind,
+                    'tier': None,
+                    'confidence': None,
+                    'dpi': None,
+                    'lang': None,
+                }
+                if kind == 'native':
+                    result['text'] = page.get_text("text", clip=clip)
+                elif kind == 'scanned':
+                    dpi = self._fit_dpi_to_budget(clip, self.ZONE_DPI)
+                    image = self._convert_page_to_image(page, dpi=dpi, clip=clip)
+                    image, _preprocessing = self._preprocess_image(image)
+                    result.update({
+                        'method': 'tesseract',
+                        'tier': 'zone',
+                        'dpi': dpi,
+                        'lang': self.TESSERACT_LANG,
+                    })
+                    ocr_jobs.append((result, image, zone.get('psm', self.ZONE_PSM)))
+                result['duration'] = time.monotonic() - start
+                results.append(result)
+
+            if ocr_jobs:
+                self._check_tesseract_available()
+                self._ocr_zone_images(ocr_jobs, deadline=deadline)
+
+            for result in results:
+                result['text'] = result['text'].strip() if result['text'] else ""
+
+            _logger.info(
+                "JSOCR: Zone extraction complete - %d zone(s), %d via Tesseract",
+                len(results), len(ocr_jobs)
+            )
+            return results
+
+        except ValueError:
+            raise
+        except Exception as e:
+            _logger.error("JSOCR: Error during zone extraction: %s", type(e).__name__)
+            raise ValueError(f"Error extracting zones from PDF: {str(e)}") from e
+
+    def _ocr_zone_images(self, ocr_jobs, deadline=None):
+        """OCR rendered zone crops with a bounded thread pool.
+
+        Each zone gets the page budget (page_timeout), capped by the
+        document deadline; zones over budget follow timeout_policy.
+
+        Args:
+            ocr_jobs (list): (result dict, PIL.Image, psm) tuples; text,
+                             confidence and duration are set on each result
+            deadline (float, optional): Document OCR deadline (time.monotonic())
+
+        Raises:
+            OCRTimeoutError: If a zone is over budget with the 'fail' policy
+        """
+        def ocr_zone(job):
+            result, image, psm = job
+            start = time.monotonic()
+            try:
+                timeout = self._get_remaining_time(self._get_page_deadline(deadline))
+                text, confidence = self._run_tesseract(
+                    image, lang=result['lang'], psm=psm, timeout=timeout
+                )
+            except OCRTimeoutError as e:
+                degraded = self._get_degraded_result(result['page'] - 1, e, lang=result['lang'])
+                result.update(method=degraded['method'], error=degraded['error'])
+                text, confidence = "", None
+            return result, text, confidence, time.monotonic() - start
+
+        workers = min(self.max_workers, len(ocr_jobs))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for result, text, confidence, duration in executor.map(ocr_zone, ocr_jobs):
+                result['text'] = text
+                result['confidence'] = confidence
+                result['duration'] += duration
+
+    def _resolve_zone_page(self, session, page):
+        """Return the 0-based page number of a zone, or None if out of range.
+
+        Args:
+            session (PDFDocumentSession): Opened document session
+            page (int): 1-based page number, negative counts from the end
+                        (-1 is the last page)
+
+        Returns:
+            int or None: 0-based page number
+        """
+        page_count = session.page_count
+        page_num = page - 1 if page > 0 else page_count + page
+        if 0 <= page_num < page_count:
+            return page_num
+        return None
+
+    def _get_zone_rect(self, page, rect):
+        """Convert a relative zone rectangle to page coordinates.
+
+        Args:
+            page: PyMuPDF page object
+            rect (list): [x0, y0, x1, y1] relative to the page (0.0 to 1.0)
+
+        Returns:
+            fitz.Rect: Zone rectangle in page coordinates
+        """
+        page_rect = page.rect
+        x0, y0, x1, y1 = rect
+        return fitz.Rect(
+            page_rect.x0 + x0 * page_rect.width,
+            page_rect.y0 + y0 * page_rect.height,
+            page_rect.x0 + x1 * page_rect.width,
+            page_rect.y0 + y1 * page_rect.height,
+        )
+
     def _is_native_pdf(self, pdf_binary):
         """Check if PDF contains selectable text (native PDF).
 
         Checks the first few pages for any text content. If text is found,
         the PDF is considered native. Otherwise, it's assumed to be scanned.
+        Standalone helper: extraction uses PDFDocumentSession.is_native() on
+        its already-open session instead.
 
         Args:
             pdf_binary (bytes): PDF file content as bytes
@@ -309,23 +2136,8 @@ class OCRService:
             return False
 
         try:
-            doc = fitz.open(stream=pdf_binary, filetype="pdf")
-
-            # Check first few pages for text
-            has_text = False
-            pages_to_check = min(3, doc.page_count)
-
-            for page_num in range(pages_to_check):
-                page = doc[page_num]
-                text = page.get_text().strip()
-                # Consider it native if we find meaningful text (> 50 chars)
-                if text and len(text) > 50:
-                    has_text = True
-                    break
-
-            doc.close()
-            return has_text
-
+            with self.open_document(pdf_binary) as session:
+                return session.is_native()
         except Exception:
             return False
 
@@ -348,19 +2160,63 @@ class OCRService:
             raise ValueError("PDF binary data is empty or None")
 
         try:
-            doc = fitz.open(stream=pdf_binary, filetype="pdf")
-            count = doc.page_count
-            doc.close()
-            return count
+            with self.open_document(pdf_binary) as session:
+                return session.page_count
         except Exception as e:
             raise ValueError(f"Cannot read PDF: {str(e)}") from e
 
+    def get_engine_version(self):
+        """Return the Tesseract version used by the configured engine.
+
+        Returns:
+            str or None: Version string, None if Tesseract is not available
+        """
+        if self.ocr_engine == 'tesserocr':
+            return tesserocr.tesseract_version() if TESSEROCR_AVAILABLE else None
+        probe_tesseract()
+        return TESSERACT_VERSION
+
+    def get_cache_signature(self):
+        """Return the settings that determine the extraction result.
+
+        Used to key cached OCR results: two extractions of the same PDF with
+        equal signatures give the same text. Execution-only settings (worker
+        count, timeout) are not part of it.
+
+        Returns:
+            dict: JSON-serializable settings
+        """
+        return {
+            'extraction_mode': self.extraction_mode,
+            'ocr_strategy': self.ocr_strategy,
+            'min_confidence': self.min_confidence,
+            'fast_tessdata_dir': self.fast_tessdata_dir,
+            'narrow_language': self.narrow_language,
+            'auto_rotate': self.auto_rotate,
+            'preprocessing': list(self.preprocessing),
+            'collect_words': self.collect_words,
+            'engine': self.ocr_engine,
+            'engine_version': self.get_engine_version(),
+            'dpi': self.DEFAULT_DPI,
+            'max_pages': self.max_pages,
+            'page_memory_mb': self.page_memory_mb,
+            'lang': self.TESSERACT_LANG,
+            'tiers': [dict(tier) for tier in self.OCR_TIERS],
+        }
+
     def is_tesseract_available(self):
-        """Check if Tesseract OCR is available.
+        """Check if Tesseract OCR is available for the configured engine.
+
+        The Tesseract binary is probed on the first call only (see
+        probe_tesseract()).
 
         Returns:
             bool: True if Tesseract is installed and accessible
         """
+        if self.ocr_engine == 'tesserocr':
+            return TESSEROCR_AVAILABLE
+        if TESSERACT_AVAILABLE is None:
+            probe_tesseract()
         return TESSERACT_AVAILABLE
 
     # -------------------------------------------------------------------------
@@ -370,54 +2226,48 @@ class OCRService:
     def detect_language(self, text):
         """Detect the language of extracted text.
 
-        Uses keyword matching to identify the most likely language among
-        French, German, and English. Designed for Swiss invoice context.
+        Scores the whole words of a bounded sample of the text against
+        French, German and English profiles (see detect_language_with_confidence()).
+        Designed for Swiss invoice context.
 
         Args:
-            text (str): Extracted text from PDF
+            text (str or list): Extracted text from PDF, or text of each page
 
         Returns:
             str: ISO 639-1 language code ('fr', 'de', or 'en')
                  Defaults to 'fr' (French) if detection is inconclusive.
         """
-        if not text or not isinstance(text, str):
-            _logger.info("JSOCR: Language detection - empty text, defaulting to 'fr'")
-            return self.DEFAULT_LANGUAGE
+        return self.detect_language_with_confidence(text)[0]
+
+    def detect_language_with_confidence(self, text):
+        """Detect the language of extracted text, with a confidence.
 
-        # Convert to lowercase for matching
-        text_lower = text.lower()
+        The text is tokenized once, over the beginning of each page (or
+        evenly spaced windows of a whole text) up to a fixed budget, so the
+        cost does not grow with the number of pages.
 
-        # Count keyword matches per language
-        scores = {}
-        for lang, keywords in self.LANGUAGE_KEYWORDS.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            scores[lang] = score
+        Args:
+            text (str or list): Extracted text from PDF, or text of each page
 
-        # Find the language with the highest score
-        max_score = max(scores.values())
+        Returns:
+            tuple: (str ISO 639-1 language code, defaults to 'fr' if
+                    detection is inconclusive; float confidence 0.0 to 1.0)
+        """
+        if not text or not isinstance(text, (str, list, tuple)):
+            _logger.info("JSOCR: Language detection - empty text, defaulting to 'fr'")
+            return self.DEFAULT_LANGUAGE, 0.0
 
-        if max_score == 0:
+        detected, confidence, scores = self._language_detector.detect(text)
+        if not detected:
             # No keywords matched - default to French (Swiss Romandie)
             _logger.info("JSOCR: Language detection - no keywords matched, defaulting to 'fr'")
-            return self.DEFAULT_LANGUAGE
-
-        # Get languages with max score (handle ties)
-        best_langs = [lang for lang, score in scores.items() if score == max_score]
-
-        if len(best_langs) == 1:
-            detected = best_langs[0]
-        else:
-            # Tie - prefer French for Swiss context
-            detected = 'fr' if 'fr' in best_langs else best_langs[0]
-            _logger.info(
-                "JSOCR: Language detection - tie between %s, selected '%s'",
-                best_langs, detected
-            )
-
-        _logger.info("JSOCR: Language detected: %s (scores: fr=%d, de=%d, en=%d)",
-                     detected, scores.get('fr', 0), scores.get('de', 0), scores.get('en', 0))
+            return self.DEFAULT_LANGUAGE, 0.0
 
-        return detected
+        _logger.info(
+            "JSOCR: Language detected: %s (confidence %.2f, scores: fr=%d, de=%d, en=%d)",
+            detected, confidence, scores.get('fr', 0), scores.get('de', 0), scores.get('en', 0)
+        )
+        return detected, confidence
 
     def get_tesseract_lang_config(self, detected_lang=None):
         """Get Tesseract language configuration string.
@@ -444,3 +2294,191 @@ class OCRService:
 
         config = f"{primary}+{'+'.join(others)}"
         return config
+
+
+# -----------------------------------------------------------------------------
+# CAPABILITIES AND PER-PROCESS SERVICE
+# -----------------------------------------------------------------------------
+
+# Long-lived services of the current process by settings, least recently
+# used first, see get_ocr_service(). Jobs alternate between two settings
+# (normal and large document lanes), so both are kept.
+_services = {}
+_service_lock = threading.Lock()
+MAX_SERVICES = 2
+
+
+def probe_tesseract(force=False):
+    """Check once per process whether the Tesseract binary can be run.
+
+    The result is kept in TESSERACT_AVAILABLE and TESSERACT_VERSION. Later
+    calls return it without spawning Tesseract again, unless force is set
+    (e.g. after Tesseract was installed on a running server).
+
+    Args:
+        force (bool): Probe again even if a result is known
+
+    Returns:
+        bool: True if Tesseract is installed and accessible
+    """
+    global TESSERACT_AVAILABLE, TESSERACT_VERSION
+    if not PYTESSERACT_INSTALLED:
+        return False
+    with _tesseract_probe_lock:
+        if TESSERACT_AVAILABLE is not None and not force:
+            return TESSERACT_AVAILABLE
+        try:
+            TESSERACT_VERSION = str(pytesseract.get_tesseract_version())
+            TESSERACT_AVAILABLE = True
+        except Exception:
+            TESSERACT_VERSION = None
+            TESSERACT_AVAILABLE = False
+            _logger.warning("JSOCR: Tesseract not found on system. Scanned PDF OCR disabled.")
+        return TESSERACT_AVAILABLE
+
+
+def get_ocr_service(**settings):
+    """Return the OCR service of the current process for given settings.
+
+    The instance is kept for the life of the process, together with what it
+    keeps warm (tesserocr APIs of the thread, page cache). One instance is
+    kept per settings, up to MAX_SERVICES: alternating between the normal
+    and large document lanes reuses both, and the least recently used one
+    is dropped when the settings change, e.g. after a configuration update.
+
+    Args:
+        **settings: Keyword arguments for OCRService()
+
+    Returns:
+        OCRService: Shared service instance
+
+    Raises:
+        ValueError: If the settings are invalid (see OCRService())
+    """
+    key = tuple(sorted(settings.items()))
+    with _service_lock:
+        service = _services.pop(key, None)
+        if service is None:
+            service = OCRService(**settings)
+            while len(_services) >= MAX_SERVICES:
+                _services.pop(next(iter(_services)))
+        _services[key] = service
+        return service
+
+
+# -----------------------------------------------------------------------------
+# PROCESS POOL WORKERS
+# -----------------------------------------------------------------------------
+
+# Per-process state of OCR pool workers, set once by _init_ocr_worker
+_worker_state = {}
+
+# Warm tesserocr APIs of the current thread, {(lang, psm, tessdata_dir): api}.
+# Loading traineddata is the main cost of a Tesseract call, so APIs are kept
+# for the life of the thread (an Odoo worker or a pool worker process).
+# PyTessBaseAPI is not thread-safe, hence one set of APIs per thread.
+_tesserocr_local = threading.local()
+TESSEROCR_MAX_APIS = 4  # Configurations kept loaded per thread
+
+
+def _get_pool_context():
+    """Return the multiprocessing context used for OCR worker pools.
+
+    'fork' is preferred where available: workers inherit the loaded addon
+    code. 'spawn' and 'forkserver' children cannot unpickle the worker
+    functions: the addon is found through the Odoo addons path, which is
+    set up at server start and not inherited through sys.path. Forking a
+    multi-threaded Odoo server may copy locks held by other threads, so the
+    pool is opt-in (ocr_max_workers defaults to 1), for multi-process
+    deployments (--workers).
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def _init_ocr_worker(pdf_binary, service_settings):
+    """Pool initializer: open the PDF once per worker process.
+
+    The session lives as long as the worker and is released when the pool
+    shuts down.
+    """
+    _worker_state['session'] = PDFDocumentSession(pdf_binary).open()
+    _worker_state['service'] = OCRService(**service_settings)
+
+
+def _ocr_page_worker(page_num, lang=None, deadline=None):
+    """Render and OCR one page inside a pool worker.
+
+    Args:
+        page_num (int): 0-based page number
+        lang (str, optional): Tesseract language(s) replacing the defaults
+        deadline (float, optional): Document OCR deadline (time.monotonic(),
+                                    shared by the processes of the host)
+
+    Returns:
+        dict: OCR result of the page (see OCRService._ocr_page), with the
+              'duration' in seconds measured inside the worker. A page over
+              its time budget is degraded, or raises OCRTimeoutError with the
+              'fail' policy.
+    """
+    start = time.monotonic()
+    session = _worker_state['session']
+    service = _worker_state['service']
+    try:
+        result = dict(service._ocr_page(session.get_page(page_num), lang=lang, deadline=deadline))
+    except OCRTimeoutError as e:
+        result = service._get_degraded_result(page_num, e, lang=lang)
+    result['duration'] = time.monotonic() - start
+    return result
+
+
+def _get_tesserocr_api(lang, psm, tessdata_dir=None):
+    """Return a warm tesserocr API of the current thread for a configuration.
+
+    The least recently created API is ended when more than TESSEROCR_MAX_APIS
+    configurations are in use.
+
+    Args:
+        lang (str): Tesseract language string
+        psm (int): Tesseract page segmentation mode
+        tessdata_dir (str, optional): Alternative traineddata directory
+
+    Returns:
+        tesserocr.PyTessBaseAPI: Initialized API
+    """
+    apis = getattr(_tesserocr_local, 'apis', None)
+    if apis is None:
+        apis = _tesserocr_local.apis = {}
+
+    key = (lang, psm, tessdata_dir)
+    api = apis.get(key)
+    if api is None:
+        if len(apis) >= TESSEROCR_MAX_APIS:
+            apis.pop(next(iter(apis))).End()
+        kwargs = {'lang': lang, 'psm': psm}
+        if tessdata_dir:
+            kwargs['path'] = tessdata_dir
+        api = tesserocr.PyTessBaseAPI(**kwargs)
+        apis[key] = api
+        _logger.info("JSOCR: Loaded in-process Tesseract API (lang=%s, psm=%s)", lang, psm)
+    return api
+
+
+def _get_tesserocr_words(api):
+    """Return the word boxes recognized by a tesserocr API.
+
+    Args:
+        api (tesserocr.PyTessBaseAPI): API after Recognize()
+
+    Returns:
+        list: (left, top, right, bottom, text, confidence) per word
+    """
+    words = []
+    level = tesserocr.RIL.WORD
+    for word in tesserocr.iterate_level(api.GetIterator(), level):
+        text = (word.GetUTF8Text(level) or '').strip()
+        box = word.BoundingBox(level)
+        if text and box:
+            words.append((*box, text, int(word.Confidence(level))))
+    return words
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+# Part of js_invoice_ocr_ia. See LICENSE file for full copyright and licensing details.
+
+"""Compaction of the invoice text sent to the AI.
+
+Prompt evaluation time grows with the number of input tokens, and the
+extracted text holds many tokens that carry no invoice data: page markers,
+the letterhead and footer repeated on every page, OCR whitespace runs and
+legal boilerplate (general terms and conditions). They are removed before
+the text is put in the prompt, then a token budget is enforced.
+
+Tokens are estimated from the text length (CHARS_PER_TOKEN), which is close
+enough for budgeting and does not depend on the model's tokenizer.
+
+Example usage:
+    compactor = PromptCompactor(max_tokens=3000)
+    result = compactor.compact(job.extracted_text)
+    prompt_text = result['text']
+"""
+
+import logging
+import re
+
+_logger = logging.getLogger(__name__)
+
+
+class PromptCompactor:
+    """Shrink extracted invoice text before the LLM call.
+
+    Steps, in order, each reported with the tokens it removed:
+    - 'page_markers': '--- Page N ---' lines (zone markers are kept, they
+      name the data of the zone)
+    - 'headers_footers': first and last lines of a page repeated on most
+      pages, kept on the first page only
+    - 'boilerplate': paragraphs starting with a BOILERPLATE_PATTERNS line,
+      within their page and without the lines holding invoice data
+    - 'whitespace': space runs, blank lines and line indentation
+    - 'budget': middle lines removed to fit max_tokens
+    """
+
+    STEPS = ('page_markers', 'headers_footers', 'boilerplate', 'whitespace', 'budget')
+
+    # Average characters per token of LLM tokenizers on French/German text
+    CHARS_PER_TOKEN = 4
+
+    PAGE_MARKER = re.compile(r"^--- Page \d+ ---$")
+
+    # Repeated headers and footers: lines among the first/last EDGE_LINES
+    # non-empty lines of a page, found on at least REPEAT_MIN_RATIO of the
+    # pages (2 pages at least). Page numbers are ignored ('Page 2 / 5').
+    # Only lines with a word, a key of EDGE_MIN_KEY_CHARS and no amount are
+    # candidates: short values (a quantity of '1') repeat by chance.
+    EDGE_LINES = 6
+    EDGE_MIN_KEY_CHARS = 4
+    REPEAT_MIN_RATIO = 0.5
+    PAGE_NUMBER = re.compile(r"\b(page|seite|p\.)\s*\d+(\s*(/|sur|von|of)\s*\d+)?", re.IGNORECASE)
+
+    # Amounts ('1200.00', "1'292.40", '15,50'): lines holding one are data
+    AMOUNT = re.compile(r"\d[\d'’ ]*[.,]\d{2}(?!\d)")
+    WORD = re.compile(r"[^\W\d_]{2,}")
+    # Identifiers: a token of 4 digits or more (invoice and reference
+    # numbers, dates, IBAN, VAT/UID 'CHE-123.456.789', QR reference, postal
+    # codes) or a reference keyword. Lines holding one are data.
+    IDENTIFIER = re.compile(r"(?:[^\s\d]*\d){4}")
+    DATA_KEYWORD = re.compile(
+        r"\b(iban|tva|mwst|uid|vat|n[°o]|nr|ref|r[eé]f[eé]rence|referenz|facture|rechnung|"
+        r"invoice|client|kunde|customer)\b",
+        re.IGNORECASE,
+    )
+
+    # Legal boilerplate paragraphs, removed up to the next blank line when
+    # the paragraph has at most BOILERPLATE_MAX_LINES lines. Native PDF text
+    # often has no blank lines: the paragraph is then the boilerplate line
+    # and the lines continuing its sentence (starting in lower case).
+    BOILERPLATE_MAX_LINES = 8
+    BOILERPLATE_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+        r"^conditions g[eé]n[eé]rales",
+        r"^allgemeine gesch[aä]ftsbedingungen",
+        r"^(general )?terms and conditions",
+        r"^(clause de )?r[eé]serve de propri[eé]t[eé]",
+        r"^eigentumsvorbehalt",
+        r"^retention of title",
+        r"^for juridique",
+        r"^tribunaux? comp[eé]tents?",
+        r"^gerichtsstand",
+        r"^place of jurisdiction",
+    ))
+
+    # Marker of the lines removed to fit the budget
+    ELLIPSIS = '[...]'
+    # Smallest budget accepted by the configuration: room for the invoice
+    # header and totals
+    MIN_MAX_TOKENS = 500
+    # Share of the budget kept from the start of the text, the rest from the
+    # end (totals and payment details are usually at the end)
+    BUDGET_HEAD_RATIO = 0.7
+
+    def __init__(self, max_tokens=None):
+        """Initialize the compactor.
+
+        Args:
+            max_tokens (int): Token budget of the text (default: 0 = none)
+        """
+        self.max_tokens = max(0, max_tokens or 0)
+
+    def count_tokens(self, text):
+        """Estimate the number of tokens of a text.
+
+        Args:
+            text (str): Text to measure
+
+        Returns:
+            int: Estimated token count
+        """
+        return -(-len(text or '') // self.CHARS_PER_TOKEN)
+
+    def compact(self, text):
+        """Compact an extracted text for the prompt.
+
+        Args:
+            text (str): Text from OCRService.format_pages() (or the header
+                text of a table extraction)
+
+        Returns:
+            dict: {
+                'text': str,             # Compacted text
+                'tokens_before': int,
+                'tokens_after': int,
+                'tokens_removed': int,
+                'removed': dict,         # Tokens removed per step (STEPS)
+            }
+        """
+        text = text or ''
+        removed = dict.fromkeys(self.STEPS, 0)
+        tokens_before = self.count_tokens(text)
+
+        pages = self._split_pages(text.split('\n'))
+        lines = [line for page in pages for line in page]
+        removed['page_markers'] = tokens_before - self._count_lines(lines)
+
+        pages = self._remove_headers_footers(pages)
+        kept = [line for page in pages for line in page]
+        removed['headers_footers'] = self._count_lines(lines) - self._count_lines(kept)
+        lines = kept
+
+        pages = [self._remove_boilerplate(page) for page in pages]
+        kept = [line for page in pages for line in page]
+        removed['boilerplate'] = self._count_lines(lines) - self._count_lines(kept)
+        lines = kept
+
+        kept = self._collapse_whitespace(lines)
+        removed['whitespace'] = self._count_lines(lines) - self._count_lines(kept)
+        lines = kept
+
+        kept = self._apply_budget(lines)
+        removed['budget'] = self._count_lines(lines) - self._count_lines(kept)
+
+        compacted = '\n'.join(kept)
+        tokens_after = self.count_tokens(compacted)
+        result = {
+            'text': compacted,
+            'tokens_before': tokens_before,
+            'tokens_after': tokens_after,
+            'tokens_removed': tokens_before - tokens_after,
+            'removed': removed,
+        }
+        _logger.info(
+            "JSOCR: Prompt text compacted from %d to %d tokens (%s)",
+            tokens_before, tokens_after,
+            ', '.join(f"{step}: -{count}" for step, count in removed.items() if count)
+            or 'nothing removed'
+        )
+        return result
+
+    def _count_lines(self, lines):
+        """Estimate the tokens of lines joined by newlines."""
+        return self.count_tokens('\n'.join(lines))
+
+    def _split_pages(self, lines):
+        """Split text lines into pages on the page markers, dropping them.
+
+        Returns:
+            list: Lines of each page (a single page without markers)
+        """
+        pages = [[]]
+        for line in lines:
+            if self.PAGE_MARKER.match(line.strip()):
+                if pages[-1]:
+                    pages.append([])
+                continue
+            pages[-1].append(line)
+        return pages
+
+    def _remove_headers_footers(self, pages):
+        """Remove the page edge lines repeated on most pages.
+
+        Args:
+            pages (list): Lines of each page
+
+        Returns:
+            list: Lines of each page, repeated edge lines kept on the first
+                  page where they appear only
+        """
+        if len(pages) < 2:
+            return pages
+
+        edges = [
+            {index for index in self._get_edge_indexes(page) if self._is_edge_candidate(page[index])}
+            for page in pages
+        ]
+        counts = {}
+        for page, indexes in zip(pages, edges):
+            for key in {self._get_line_key(page[index]) for index in indexes}:
+                counts[key] = counts.get(key, 0) + 1
+        min_pages = max(2, len(pages) * self.REPEAT_MIN_RATIO)
+        repeated = {key for key, count in counts.items() if key and count >= min_pages}
+        if not repeated:
+            return pages
+
+        seen = set()
+        result = []
+        for page, indexes in zip(pages, edges):
+            kept = []
+            for index, line in enumerate(page):
+                key = self._get_line_key(line)
+                if index in indexes and key in repeated:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                kept.append(line)
+            result.append(kept)
+        return result
+
+    def _get_edge_indexes(self, page):
+        """Return the indexes of the first and last EDGE_LINES non-empty lines of a page."""
+        content = [index for index, line in enumerate(page) if line.strip()]
+        if len(content) > 2 * self.EDGE_LINES:
+            content = content[:self.EDGE_LINES] + content[-self.EDGE_LINES:]
+        return set(content)
+
+    def _is_edge_candidate(self, line):
+        """Check if a line may be a header or footer line (not a short value or an amount)."""
+        return (
+            len(self._get_line_key(line)) >= self.EDGE_MIN_KEY_CHARS
+            and self.WORD.search(line) is not None
+            and self.AMOUNT.search(line) is None
+        )
+
+    def _get_line_key(self, line):
+        """Return the comparison key of a line: lower case, no page number or spaces."""
+        return ''.join(self.PAGE_NUMBER.sub('page', line.lower()).split())
+
+    def _remove_boilerplate(self, lines):
+        """Remove the paragraphs starting with a boilerplate line.
+
+        Args:
+            lines (list): Lines of a page
+
+        Returns:
+            list: Lines of the page without the boilerplate paragraphs; lines
+                  holding invoice data (see _is_data_line()) are always kept
+        """
+        kept = []
+        index = 0
+        while index < len(lines):
+            stripped = lines[index].strip()
+            if not any(pattern.search(stripped) for pattern in self.BOILERPLATE_PATTERNS):
+                kept.append(lines[index])
+                index += 1
+                continue
+            end = self._get_boilerplate_end(lines, index)
+            kept.extend(line for line in lines[index:end] if self._is_data_line(line))
+            index = end
+        return kept
+
+    def _get_boilerplate_end(self, lines, start):
+        """Return the index after the boilerplate paragraph starting at a line.
+
+        Args:
+            lines (list): Lines of a page
+            start (int): Index of the boilerplate line
+
+        Returns:
+            int: Index of the next blank line when it closes a paragraph of
+                 at most BOILERPLATE_MAX_LINES lines, else of the first line
+                 after start not starting in lower case
+        """
+        for index in range(start + 1, min(len(lines), start + self.BOILERPLATE_MAX_LINES + 1)):
+            if not lines[index].strip():
+                return index
+        end = start + 1
+        while end < len(lines) and lines[end].strip()[:1].islower():
+            end += 1
+        return end
+
+    def _is_data_line(self, line):
+        """Check if a line holds invoice data (amount, identifier or reference keyword)."""
+        return any(
+            pattern.search(line) for pattern in (self.AMOUNT, self.IDENTIFIER, self.DATA_KEYWORD)
+        )
+
+    def _collapse_whitespace(self, lines):
+        """Collapse space runs inside lines and drop blank lines."""
+        return [' '.join(line.split()) for line in lines if line.strip()]
+
+    def _apply_budget(self, lines):
+        """Keep the first and last lines that fit the token budget.
+
+        Returns:
+            list: Lines within max_tokens, with ELLIPSIS in place of the
+                  removed middle lines. A first or last line longer than
+                  its share of the budget is truncated, not dropped.
+        """
+        if not self.max_tokens or self._count_lines(lines) <= self.max_tokens:
+            return lines
+
+        budget = self.max_tokens - self.count_tokens(self.ELLIPSIS + '\n')
+        head_budget = int(budget * self.BUDGET_HEAD_RATIO)
+
+        head = []
+        used = 0
+        for line in lines:
+            cost = self.count_tokens(line + '\n')
+            if used + cost > head_budget:
+                break
+            head.append(line)
+            used += cost
+        if not head and head_budget > 0:
+            head = [lines[0][:head_budget * self.CHARS_PER_TOKEN - 1]]
+            used = self.count_tokens(head[0] + '\n')
+
+        tail = []
+        rest = lines[len(head):]
+        for line in reversed(rest):
+            cost = self.count_tokens(line + '\n')
+            if used + cost > budget:
+                break
+            tail.append(line)
+            used += cost
+        if not tail and rest and budget - used > 0:
+            tail = [rest[-1][-((budget - used) * self.CHARS_PER_TOKEN - 1):]]
+        tail.reverse()
+
+        return head + [self.ELLIPSIS] + tail
@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+# Part of js_invoice_ocr_ia. See LICENSE file for full copyright and licensing details.
+
+"""Deterministic line item extraction from native PDFs.
+
+Line items are the largest and slowest part of the AI extraction: the whole
+flattened page text goes into the prompt and every row comes back as JSON.
+Native PDFs usually lay their items out as a table, which PyMuPDF's table
+finder recovers with the word coordinates of the page.
+
+A table is used when its header row names at least a description and an
+amount column (French, German or English labels). Its rows are only trusted
+when their amounts add up to a document total (not a subtotal or a carried
+total) printed on the last page holding totals: the AI is then asked for the
+header fields only, on the page text without the table rows.
+
+Example usage:
+    extractor = TableExtractor()
+    with ocr.open_document(pdf_binary) as session:
+        result = extractor.extract_line_items(session)
+    if result and result['reconciled']:
+        lines = result['lines']
+"""
+
+import logging
+import re
+import unicodedata
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+
+class TableExtractor:
+    """Recover invoice line items from the tables of a native PDF."""
+
+    # Table finder strategies, tried in order on each page: ruled tables
+    # first, then tables aligned on whitespace only
+    TABLE_STRATEGIES = ('lines', 'text')
+
+    # Largest document read through its tables. The header text replaces
+    # the whole document text in the prompt, so longer documents are left
+    # to the AI rather than truncated.
+    MAX_PAGES = 20
+
+    # Column header keywords (accents removed, lower case) per line role.
+    # Roles are matched in this order, so 'prix total' is an amount and
+    # 'prix unitaire' a unit price.
+    COLUMN_KEYWORDS = (
+        ('quantity', ('qte', 'qty', 'quantite', 'quantity', 'menge', 'anzahl', 'nombre', 'nb')),
+        ('amount', ('montant', 'total', 'amount', 'betrag', 'gesamt', 'gesamtpreis',
+                    'gesamtbetrag', 'summe', 'prix total', 'net')),
+        ('unit_price', ('prix unitaire', 'prix unit', 'pu', 'p u', 'unit price', 'price',
+                        'prix', 'einzelpreis', 'preis', 'stuckpreis', 'tarif')),
+        ('description', ('designation', 'description', 'libelle', 'article', 'prestation',
+                         'produit', 'bezeichnung', 'beschreibung', 'artikel', 'leistung',
+                         'item', 'items')),
+    )
+
+    # Rows and text lines holding document totals, not line items
+    TOTAL_KEYWORDS = (
+        'total', 'sous total', 'subtotal', 'zwischensumme', 'summe', 'gesamt',
+        'gesamtbetrag', 'rechnungsbetrag', 'montant du', 'a payer',
+    )
+    TAX_KEYWORDS = ('tva', 'mwst', 'vat', 'tax', 'taxe', 'ust')
+    # Total rows that are not document totals: subtotals and per-page
+    # carried totals ('Total a reporter', 'Übertrag')
+    SUBTOTAL_KEYWORDS = (
+        'sous total', 'subtotal', 'sub total', 'zwischensumme', 'zwischentotal',
+        'report', 'reporter', 'a reporter', 'reporte', 'ubertrag', 'uebertrag', 'vortrag',
+        'carried forward', 'brought forward', 'total page', 'seitentotal',
+    )
+
+    # Rows are reconciled with a document total within Swiss 5 cent rounding
+    RECONCILE_TOLERANCE = 0.05
+
+    # Words are in the same visual row when their vertical centres are closer
+    # than this share of the word height
+    ROW_TOLERANCE = 0.5
+
+    AMOUNT_PATTERN = re.compile(r"^[-+]?\d[\d' ’]*(?:[.,]\d+)*[-]?$")
+    # Quantity and unit price cells like '1.875' or '1,000': 3 decimals
+    # (fuel prices, weights) or a thousands separator
+    AMBIGUOUS_PATTERN = re.compile(r"^[-+]?\d{1,3}[.,]\d{3}-?$")
+    # Quantity cells followed by a unit ('2 Stk', '1,5 h', '3x')
+    UNIT_PATTERN = re.compile(r"^([-+]?\d[\d'’]*(?:[.,]\d+)?)\s*[^\W\d_]")
+
+    def extract_line_items(self, session):
+        """Extract the line items of a native PDF.
+
+        Args:
+            session (PDFDocumentSession): Opened document session (see
+                OCRService.open_document())
+
+        Returns:
+            dict or None: None if PyMuPDF is missing, the document has more
+                than MAX_PAGES pages or no line item table was found,
+                otherwise:
+                {
+                    'lines': [{'description', 'quantity', 'unit_price',
+                               'amount'}, ...],
+                    'lines_total': float,        # Sum of the line amounts
+                    'document_total': float or None,  # Document total
+                                                 # it matches
+                    'reconciled': bool,          # Lines match a total and
+                                                 # every row was parsed
+                    'header_text': str,          # Text of all pages without
+                                                 # the line item rows
+                }
+        """
+        if not PYMUPDF_AVAILABLE:
+            return None
+
+        if session.page_count > self.MAX_PAGES:
+            _logger.info(
+                "JSOCR: Table extraction skipped, %d pages (max %d)",
+                session.page_count, self.MAX_PAGES
+            )
+            return None
+
+        lines = []
+        text_parts = []
+        totals = []
+        roles = None
+        for page_num in range(session.page_count):
+            page = session.get_page(page_num)
+            page_lines, item_rects, roles = self._extract_page_items(page, roles)
+            lines.extend(page_lines)
+            rows = self._get_word_rows(page, item_rects)
+            # Document totals are printed on the last page holding totals
+            totals = self._find_totals(rows) or totals
+            text_parts.append(f"--- Page {page_num + 1} ---")
+            text_parts.extend(rows)
+
+        if not lines:
+            return None
+
+        unreliable = sum(1 for line in lines if line.pop('unreliable', False))
+        lines_total = round(sum(line['amount'] for line in lines), 2)
+        document_total = next(
+            (total for total in totals
+             if abs(total - lines_total) <= self.RECONCILE_TOLERANCE),
+            None
+        )
+        reconciled = document_total is not None and not unreliable
+        _logger.info(
+            "JSOCR: Table extraction found %d line(s) (%d unreliable), total %.2f, %s",
+            len(lines), unreliable, lines_total,
+            "reconciled" if reconciled else "not reconciled"
+        )
+        return {
+            'lines': lines,
+            'lines_total': lines_total,
+            'document_total': document_total,
+            'reconciled': reconciled,
+            'header_text': "\n".join(text_parts),
+        }
+
+    def _extract_page_items(self, page, roles=None):
+        """Extract the line items of the tables of a page.
+
+        Args:
+            page: PyMuPDF page object
+            roles (dict, optional): Column roles of the previous page's
+                table, used by tables continuing without a header row
+
+        Returns:
+            tuple: (list of line dicts, list of fitz.Rect covering the header
+                    and item rows, dict column roles of the last table)
+        """
+        for strategy in self.TABLE_STRATEGIES:
+            lines = []
+            item_rects = []
+            for table in page.find_tables(strategy=strategy).tables:
+                rows = table.extract()
+                if not rows:
+                    continue
+                header_index, table_roles = self._find_header(rows)
+                if table_roles:
+                    roles = table_roles
+                    item_rects.append(fitz.Rect(table.rows[header_index].bbox))
+                elif not roles or max(roles.values()) >= len(rows[0]):
+                    continue
+                for index in range(header_index + 1, len(rows)):
+                    if self._add_row(lines, rows[index], roles):
+                        item_rects.append(fitz.Rect(table.rows[index].bbox))
+            if lines:
+                return lines, item_rects, roles
+        return [], [], roles
+
+    def _find_header(self, rows):
+        """Find the header row of a table and the role of its columns.
+
+        Args:
+            rows (list): Table rows as lists of cell strings
+
+        Returns:
+            tuple: (int header row index or -1, dict role -> column index,
+                    None if no row names a description and an amount)
+        """
+        for index, row in enumerate(rows[:3]):
+            roles = {}
+            for column, cell in enumerate(row):
+                role = self._get_column_role(cell)
+                if role and role not in roles:
+                    roles[role] = column
+            if 'description' in roles and 'amount' in roles:
+                return index, roles
+        return -1, None
+
+    def _get_column_role(self, cell):
+        """Return the line role named by a header cell, or None."""
+        label = self._normalize(cell)
+        if not label:
+            return None
+        for role, keywords in self.COLUMN_KEYWORDS:
+            if self._has_keyword(label, keywords):
+                return role
+        return None
+
+    def _add_row(self, lines, row, roles):
+        """Add a table row to the line items.
+
+        Rows without amount continue the description of the previous line.
+        Total and tax rows are not line items. A line whose quantity or unit
+        price cell is not a number is marked 'unreliable': its numbers
+        cannot be checked against the amount.
+
+        Args:
+            lines (list): Line items, updated in place
+            row (list): Cell strings of the row
+            roles (dict): Column index of each role
+
+        Returns:
+            bool: True if the row was used as (part of) a line item
+        """
+        def cell(role):
+            column = roles.get(role)
+            if column is None or column >= len(row):
+                return ''
+            return ' '.join((row[column] or '').split())
+
+        description = cell('description')
+        if not description or self._is_total_label(description):
+            return False
+
+        amount = self.parse_amount(cell('amount'))
+        quantities = self._parse_line_number(cell('quantity'))
+        unit_prices = self._parse_line_number(cell('unit_price'))
+        unreliable = (
+            (cell('quantity') and quantities[0] is None)
+            or (cell('unit_price') and unit_prices[0] is None)
+        )
+        quantity, unit_price = self._choose_line_numbers(quantities, unit_prices, amount)
+        if amount is None and quantity is not None and unit_price is not None:
+            amount = round(quantity * unit_price, 2)
+
+        if amount is None:
+            if not lines or quantity is not None or unit_price is not None:
+                return False
+            lines[-1]['description'] += ' ' + description
+            return True
+
+        quantity = quantity if quantity else 1.0
+        line = {
+            'description': description,
+            'quantity': quantity,
+            'unit_price': unit_price if unit_price is not None else round(amount / quantity, 2),
+            'amount': amount,
+        }
+        if unreliable:
+            line['unreliable'] = True
+        lines.append(line)
+        return True
+
+    def _parse_line_number(self, value):
+        """Return the possible readings of a quantity or unit price cell.
+
+        Args:
+            value (str): Cell text, possibly followed by a unit ('2 Stk')
+
+        Returns:
+            list: Readings, the decimal one first ('1.875' -> [1.875, 1875.0]),
+                  [None] if the cell does not start with a number
+        """
+        text = self._clean_number(value)
+        match = self.UNIT_PATTERN.match(text)
+        if match and self.parse_amount(text) is None:
+            text = match.group(1)
+        amount = self.parse_amount(text)
+        if amount is None or not self.AMBIGUOUS_PATTERN.match(text):
+            return [amount]
+        text = text.replace(',', '.')
+        decimal = float(text.strip('-+'))
+        if '-' in text:
+            decimal = -decimal
+        return [decimal, amount]
+
+    def _choose_line_numbers(self, quantities, unit_prices, amount):
+        """Choose the quantity and unit price readings matching the amount.
+
+        Args:
+            quantities (list): Readings of the quantity cell
+            unit_prices (list): Readings of the unit price cell
+            amount (float or None): Line amount
+
+        Returns:
+            tuple: (quantity, unit_price), the readings whose product is the
+                   amount, otherwise the decimal readings
+        """
+        if amount is not None:
+            tolerance = max(self.RECONCILE_TOLERANCE, abs(amount) * 0.005)
+            for quantity in quantities:
+                for unit_price in unit_prices:
+                    if (quantity is not None and unit_price is not None
+                            and abs(quantity * unit_price - amount) <= tolerance):
+                        return quantity, unit_price
+        return quantities[0], unit_prices[0]
+
+    def _get_word_rows(self, page, excluded_rects):
+        """Rebuild the visual text rows of a page from its word coordinates.
+
+        Args:
+            page: PyMuPDF page object
+            excluded_rects (list): Rects whose words are left out
+
+        Returns:
+            list: Row strings, top to bottom, words left to right
+        """
+        words = [
+            word for word in page.get_text('words')
+            if not any(fitz.Rect(word[:4]).intersects(rect) for rect in excluded_rects)
+        ]
+        words.sort(key=lambda word: (word[1] + word[3]) / 2)
+
+        rows = []
+        current = []
+        current_center = None
+        for word in words:
+            center = (word[1] + word[3]) / 2
+            height = word[3] - word[1]
+            if current and abs(center - current_center) > height * self.ROW_TOLERANCE:
+                rows.append(current)
+                current = []
+            if not current:
+                current_center = center
+            current.append(word)
+        if current:
+            rows.append(current)
+
+        return [
+            ' '.join(word[4] for word in sorted(row, key=lambda word: word[0]))
+            for row in rows
+        ]
+
+    def _find_totals(self, rows):
+        """Return the amounts printed on document total rows.
+
+        Tax, subtotal and carried total rows are left out.
+
+        Args:
+            rows (list): Text rows from _get_word_rows()
+
+        Returns:
+            list: Amounts as floats
+        """
+        totals = []
+        for row in rows:
+            label = self._normalize(row)
+            if (not self._is_total_label(row)
+                    or self._has_keyword(label, self.TAX_KEYWORDS)
+                    or self._has_keyword(label, self.SUBTOTAL_KEYWORDS)):
+                continue
+            for token in reversed(row.split()):
+                amount = self.parse_amount(token)
+                if amount is not None:
+                    totals.append(amount)
+                    break
+        return totals
+
+    def _is_total_label(self, text):
+        """Check if a text names a document total."""
+        return self._has_keyword(self._normalize(text), self.TOTAL_KEYWORDS)
+
+    def _has_keyword(self, label, keywords):
+        """Check if a normalized label contains one of the keywords as words."""
+        padded = f" {label} "
+        return any(f" {keyword} " in padded for keyword in keywords)
+
+    def _normalize(self, text):
+        """Lower case text without accents, punctuation and extra spaces."""
+        text = unicodedata.normalize('NFKD', text or '')
+        text = ''.join(char for char in text if not unicodedata.combining(char))
+        return ' '.join(re.sub(r"[^\w]+", ' ', text.lower()).split())
+
+    def _clean_number(self, value):
+        """Return a cell text without currency, percent sign and outer spaces."""
+        text = (value or '').strip()
+        for noise in ('CHF', 'EUR', 'Fr.', '€', '%'):
+            text = text.replace(noise, '')
+        return text.replace('\xa0', ' ').strip()
+
+    def parse_amount(self, value):
+        """Parse an amount or quantity cell.
+
+        Handles the apostrophe and space thousand separators of Swiss
+        invoices, and both decimal separators ('1'250.50', '1.250,50').
+
+        Args:
+            value (str): Cell text, possibly with a currency or '%'
+
+        Returns:
+            float or None: Parsed number, None if the cell is not a number
+        """
+        text = self._clean_number(value)
+        if not text or not self.AMOUNT_PATTERN.match(text):
+            return None
+
+        negative = text.startswith('-') or text.endswith('-')
+        text = re.sub(r"[-+' ’]", '', text)
+        # The last separator is the decimal one when followed by 1-2 digits
+        match = re.match(r"^(.*)[.,](\d{1,2})$", text)
+        if match:
+            text = re.sub(r"[.,]", '', match.group(1)) + '.' + match.group(2)
+        else:
+            text = re.sub(r"[.,]", '', text)
+        try:
+            amount = float(text)
+        except ValueError:
+            return None
+        return -amount if negative else amount
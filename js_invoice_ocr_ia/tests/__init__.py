@@ -12,5 +12,11 @@ from . import test_jsocr_security
 from . import test_jsocr_config_views
 from . import test_jsocr_config_folder_validation
 from . import test_ocr_service
+from . import test_ocr_cache
+from . import test_image_preprocessing
+from . import test_table_extraction
+from . import test_word_index
+from . import test_language_detection
 from . import test_ai_service
+from . import test_prompt_compaction
 from . import test_ht_ttc_detection
@@ -50,11 +50,101 @@ class TestOllamaService(TransactionCase):
         self.assertEqual(service.model, 'mistral')
         self.assertEqual(service.timeout, 60)
 
+    def test_get_ollama_service_reused_per_process(self):
+        """Test that the process service is reused until settings change."""
+        from odoo.addons.js_invoice_ocr_ia.services.ai_service import get_ollama_service
+
+        service = get_ollama_service('http://ollama:11434', 'mistral', 60)
+
+        self.assertIs(get_ollama_service('http://ollama:11434', 'mistral', 60), service)
+        other = get_ollama_service('http://ollama:11434', 'llama3', 60)
+        self.assertIsNot(other, service)
+        self.assertEqual(other.model, 'llama3')
+
+    def test_http_session_shared_per_endpoint(self):
+        """Test that services of the same Ollama endpoint share one session."""
+        from odoo.addons.js_invoice_ocr_ia.services.ai_service import get_http_session
+
+        first = self.OllamaService(url='http://ollama:11434', model='llama3', pool_size=2)
+        second = self.OllamaService(url='http://OLLAMA:11434/', model='mistral', pool_size=2)
+        other_host = self.OllamaService(url='http://gpu:11434', pool_size=2)
+
+        self.assertIs(first.session, second.session)
+        self.assertIsNot(first.session, other_host.session)
+        adapter = first.session.get_adapter('http://ollama:11434/api/generate')
+        self.assertEqual(adapter._pool_maxsize, 2)
+
+        # A new pool size replaces and closes the session of the endpoint
+        with patch.object(first.session, 'close') as mock_close:
+            resized = get_http_session('http://ollama:11434', 8)
+        mock_close.assert_called_once_with()
+        self.assertIsNot(resized, first.session)
+        self.assertIs(get_http_session('http://ollama:11434/api', 8), resized)
+
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.post')
+    def test_send_request_separate_timeouts(self, mock_post):
+        """Test that requests use separate connect and read timeouts."""
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {'response': '{}'}
+
+        service = self.OllamaService(timeout=90, connect_timeout=5)
+        service._send_request("prompt")
+
+        self.assertEqual(mock_post.call_args.kwargs['timeout'], (5, 90))
+
+    def test_json_object_tracker(self):
+        """Test detecting the end of the JSON object across chunks."""
+        from odoo.addons.js_invoice_ocr_ia.services.ai_service import JSONObjectTracker
+
+        tracker = JSONObjectTracker()
+        chunks = ['Voici {', '"a": "x}{\\"', '", "b": {"c', '": 1}', '} et du texte']
+
+        ends = [tracker.feed(chunk) for chunk in chunks]
+
+        # Braces inside strings, including after an escaped quote, are ignored
+        self.assertEqual(ends, [-1, -1, -1, -1, 1])
+
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.post')
+    def test_streaming_stops_at_end_of_json(self, mock_post):
+        """Test that streaming closes the request once the JSON is complete."""
+        tokens = ['{"invoice_number": ', '"F-1"', '}\n', 'Note: ', 'the invoice', ' is...']
+        lines = [json.dumps({'response': token, 'done': False}).encode() for token in tokens]
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.iter_lines.return_value = iter(lines)
+
+        service = self.OllamaService(stream=True)
+        response = service._send_request("prompt")
+
+        self.assertEqual(response['response'], '{"invoice_number": "F-1"}')
+        self.assertEqual(response['done_reason'], 'json_complete')
+        self.assertTrue(mock_post.call_args.kwargs['stream'])
+        self.assertTrue(mock_post.call_args.kwargs['json']['stream'])
+        mock_post.return_value.close.assert_called_once()
+        # The tokens after the closing brace were never read
+        self.assertEqual(next(mock_post.return_value.iter_lines.return_value), lines[3])
+
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.post')
+    def test_streaming_incomplete_json_until_done(self, mock_post):
+        """Test that a stream without complete JSON is read until done."""
+        lines = [
+            json.dumps({'response': 'Pas de ', 'done': False}).encode(),
+            b'',
+            json.dumps({'response': 'JSON', 'done': True, 'eval_count': 2}).encode(),
+        ]
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.iter_lines.return_value = iter(lines)
+
+        service = self.OllamaService(stream=True)
+        response = service._send_request("prompt")
+
+        self.assertEqual(response['response'], 'Pas de JSON')
+        self.assertEqual(response['eval_count'], 2)
+
     # -------------------------------------------------------------------------
     # Story 4.1: Connection Tests
     # -------------------------------------------------------------------------
 
-    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.get')
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.get')
     def test_connection_success(self, mock_get):
         """Test successful connection to Ollama."""
         mock_get.return_value.status_code = 200
@@ -72,7 +162,7 @@ class TestOllamaService(TransactionCase):
         self.assertIn('2 model(s)', message)
         self.assertEqual(models, ['llama3', 'mistral'])
 
-    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.get')
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.get')
     def test_connection_timeout(self, mock_get):
         """Test connection timeout handling."""
         import requests
@@ -84,7 +174,7 @@ class TestOllamaService(TransactionCase):
         self.assertFalse(success)
         self.assertIn('timeout', message.lower())
 
-    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.get')
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.get')
     def test_connection_error(self, mock_get):
         """Test connection error handling."""
         import requests
@@ -195,6 +285,112 @@ class TestOllamaService(TransactionCase):
         self.assertIsNone(service._parse_ai_response(""))
         self.assertIsNone(service._parse_ai_response(None))
 
+    def test_output_schema(self):
+        """Test the JSON schema sent as output format."""
+        service = self.OllamaService(output_format='schema')
+
+        schema = service._get_output_schema()
+        header_schema = service._get_output_schema(header_only=True)
+
+        self.assertEqual(schema['type'], 'object')
+        self.assertIn('lines', schema['required'])
+        self.assertEqual(schema['properties']['amount_total'], {'type': ['number', 'null']})
+        self.assertIn('unit_price', schema['properties']['lines']['items']['required'])
+        self.assertNotIn('lines', header_schema['properties'])
+        self.assertNotIn('lines', header_schema['required'])
+
+    def test_unknown_output_format(self):
+        """Test that an unknown output format is rejected."""
+        with self.assertRaises(ValueError):
+            self.OllamaService(output_format='xml')
+
+    def test_parse_structured_response_typed(self):
+        """Test that a structured response is validated field by field."""
+        service = self.OllamaService(output_format='schema')
+        response = json.dumps({
+            'supplier_name': 'Muller SA',
+            'invoice_date': '2026-01-15',
+            'invoice_number': 42,
+            'lines': [
+                {'description': 'Conseil', 'quantity': 2, 'unit_price': '150.00', 'amount': 300},
+                'not a line',
+            ],
+            'amount_untaxed': 300,
+            'amount_tax': "24,30",
+            'amount_total': True,
+            'currency': 'CHF',
+        })
+
+        result = service._parse_structured_response(response)
+
+        self.assertEqual(result['supplier_name'], 'Muller SA')
+        self.assertIsNone(result['invoice_number'])  # Mistyped
+        self.assertEqual(result['lines'], [
+            {'description': 'Conseil', 'quantity': 2.0, 'unit_price': 150.0, 'amount': 300.0},
+        ])
+        self.assertEqual(result['amount_tax'], 24.3)
+        self.assertIsNone(result['amount_total'])
+        self.assertIsNone(result['payment_reference'])  # Missing
+        self.assertIsNone(service._parse_structured_response('Voici le JSON: {}'))
+        self.assertIsNone(service._parse_structured_response('[1, 2]'))
+        self.assertIsNone(service._parse_structured_response('{}'))
+        self.assertIsNone(service._parse_structured_response('{"facture": "F-1"}'))
+
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.post')
+    def test_schema_rejected_retries_with_json(self, mock_post):
+        """Test that a schema rejected by Ollama (< 0.5) falls back to 'json'."""
+        rejected = MagicMock(status_code=400)
+        accepted = MagicMock(status_code=200)
+        accepted.json.return_value = {'response': '{"supplier_name": "Test"}'}
+        formats = []
+
+        def post(url, json=None, **kwargs):
+            formats.append(json['format'])
+            return rejected if isinstance(json['format'], dict) else accepted
+        mock_post.side_effect = post
+
+        service = self.OllamaService(output_format='schema')
+        result = service.extract_invoice_data("Sample invoice text")
+        service.extract_invoice_data("Sample invoice text")
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data']['supplier_name'], 'Test')
+        # Schema tried once, then 'json' for this service
+        self.assertIsInstance(formats[0], dict)
+        self.assertEqual(formats[1:], ['json', 'json'])
+
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.post')
+    def test_http_error_without_schema_fails(self, mock_post):
+        """Test that other HTTP errors are reported without retry."""
+        mock_post.return_value.status_code = 400
+
+        service = self.OllamaService(output_format='json')
+        result = service.extract_invoice_data("Sample invoice text")
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error_type'], 'request_error')
+        self.assertEqual(mock_post.call_count, 1)
+
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.post')
+    def test_extract_structured_output_falls_back_to_text(self, mock_post):
+        """Test schema requests, and the text parser for unsupported models."""
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {
+            'response': 'Voici: {"supplier_name": "Test", "amount_total": 107.7} Fin.'
+        }
+
+        service = self.OllamaService(output_format='schema')
+        result = service.extract_invoice_data("Sample invoice text")
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data']['supplier_name'], 'Test')
+        payload = mock_post.call_args.kwargs['json']
+        self.assertEqual(payload['format'], service._get_output_schema())
+
+        service = self.OllamaService(output_format='text')
+        service.extract_invoice_data("Sample invoice text")
+        self.assertNotIn('format', mock_post.call_args.kwargs['json'])
+
     # -------------------------------------------------------------------------
     # Story 4.4: Date Parsing Tests
     # -------------------------------------------------------------------------
@@ -406,7 +602,7 @@ class TestOllamaService(TransactionCase):
     # Story 4.1-4.7: Full Extraction Tests
     # -------------------------------------------------------------------------
 
-    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.post')
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.post')
     def test_extract_invoice_data_success(self, mock_post):
         """Test successful invoice data extraction."""
         mock_response = {
@@ -434,7 +630,29 @@ class TestOllamaService(TransactionCase):
         self.assertIsNotNone(result['confidence_data'])
         self.assertIsNone(result['error'])
 
-    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.post')
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.post')
+    def test_extract_invoice_data_with_known_lines(self, mock_post):
+        """Test that known lines leave the AI with the header fields only."""
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.json.return_value = {
+            'response': json.dumps({
+                'supplier_name': 'Muller SA',
+                'invoice_number': 'F-2026-001',
+                'amount_total': 1200,
+            })
+        }
+        lines = [{'description': 'Consulting', 'quantity': 8.0, 'unit_price': 150.0, 'amount': 1200.0}]
+
+        service = self.OllamaService()
+        result = service.extract_invoice_data("Sample invoice header", language='fr', lines=lines)
+
+        prompt = mock_post.call_args.kwargs['json']['prompt']
+        self.assertNotIn('"lines"', prompt)
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data']['lines'], lines)
+        self.assertEqual(result['confidence_data']['lines']['value'], 1)
+
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.post')
     def test_extract_invoice_data_timeout(self, mock_post):
         """Test timeout handling during extraction."""
         import requests
@@ -447,7 +665,7 @@ class TestOllamaService(TransactionCase):
         self.assertEqual(result['error_type'], 'timeout')
         self.assertIn('timeout', result['error'].lower())
 
-    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.post')
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.post')
     def test_extract_invoice_data_connection_error(self, mock_post):
         """Test connection error handling during extraction."""
         import requests
@@ -467,7 +685,7 @@ class TestOllamaService(TransactionCase):
         self.assertFalse(result['success'])
         self.assertEqual(result['error_type'], 'validation_error')
 
-    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.post')
+    @patch('odoo.addons.js_invoice_ocr_ia.services.ai_service.requests.Session.post')
     def test_extract_invoice_data_parse_error(self, mock_post):
         """Test parse error handling when AI returns invalid JSON."""
         mock_post.return_value.status_code = 200
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# Part of js_invoice_ocr_ia. See LICENSE file for full copyright and licensing details.
+
+"""Tests for the OCR image pre-processing pipeline.
+
+These tests verify adaptive binarization, speckle removal and skew
+estimation of ImagePreprocessor on synthetic page images.
+"""
+
+from odoo.tests import TransactionCase, tagged
+
+try:
+    import numpy as np
+    from PIL import Image, ImageDraw
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+@tagged('post_install', '-at_install', 'jsocr', 'jsocr_ocr')
+class TestImagePreprocessor(TransactionCase):
+    """Test cases for ImagePreprocessor."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures."""
+        super().setUpClass()
+        from js_invoice_ocr_ia.services.image_preprocessing import ImagePreprocessor
+        cls.ImagePreprocessor = ImagePreprocessor
+
+    def setUp(self):
+        super().setUp()
+        if not NUMPY_AVAILABLE:
+            self.skipTest("NumPy not available")
+
+    def _create_text_page(self, angle=0.0, background=255):
+        """Create a gray page image with text-like lines.
+
+        Args:
+            angle (float): Skew in degrees, positive when lines go up to the right
+            background (int): Gray level of the page
+
+        Returns:
+            PIL.Image: 'L' image
+        """
+        image = Image.new('L', (1200, 900), background)
+        draw = ImageDraw.Draw(image)
+        for top in range(100, 800, 40):
+            for left in range(100, 1100, 60):
+                draw.rectangle((left, top, left + 45, top + 14), fill=20)
+        if angle:
+            image = image.rotate(angle, resample=Image.BILINEAR, fillcolor=background)
+        return image
+
+    def test_binarize_handles_uneven_background(self):
+        """Test adaptive thresholding on a page with a lighting gradient.
+
+        Given: A text page whose background goes from white to mid gray
+        When: Binarizing it
+        Then: The output is black and white, background white and text black
+        """
+        image = self._create_text_page()
+        pixels = np.asarray(image).astype(np.int32)
+        gradient = np.linspace(0, 110, pixels.shape[1], dtype=np.int32)[None, :]
+        pixels = np.clip(pixels - gradient, 0, 255).astype(np.uint8)
+
+        result = self.ImagePreprocessor(('binarize',)).binarize(pixels)
+
+        self.assertEqual(set(np.unique(result)), {0, 255})
+        # Dark background corner is background, text block is ink
+        self.assertEqual(result[50, 1150], 255)
+        self.assertEqual(result[107, 1070], 0)
+
+    def test_binarize_large_window(self):
+        """Test binarization of a page wide enough for windows over 84k pixels.
+
+        Given: A 6000 px wide light gray page (window of 375x375 pixels)
+               with a dark bar
+        When: Binarizing it
+        Then: Only the bar is ink (no integer overflow in the threshold)
+        """
+        pixels = np.full((400, 6000), 200, dtype=np.uint8)
+        pixels[190:210, 1000:5000] = 40
+
+        result = self.ImagePreprocessor(('binarize',)).binarize(pixels)
+
+        self.assertTrue((result[190:210, 1000:5000] == 0).all())
+        self.assertEqual(int((result == 0).sum()), 20 * 4000)
+
+    def test_despeckle_removes_isolated_pixels(self):
+        """Test that lone dots are removed and text blocks are kept.
+
+        Given: A binarized text page with isolated black pixels
+        When: Despeckling it
+        Then: The dots become white, text pixels are unchanged
+        """
+        pixels = np.array(self._create_text_page().point(lambda value: 0 if value < 128 else 255))
+        pixels[50, 50] = 0
+        pixels[850, 600] = 0
+
+        result = self.ImagePreprocessor(('despeckle',)).despeckle(pixels)
+
+        self.assertEqual(result[50, 50], 255)
+        self.assertEqual(result[850, 600], 255)
+        self.assertEqual(result[107, 120], 0)
+
+    def test_estimate_skew_of_rotated_page(self):
+        """Test skew estimation on pages rotated by a known angle.
+
+        Given: Text pages skewed by 2 and -3 degrees
+        When: Estimating their skew
+        Then: The angles are found within one estimation step
+        """
+        preprocessor = self.ImagePreprocessor(('deskew',))
+
+        for angle in (2.0, -3.0):
+            pixels = np.asarray(self._create_text_page(angle))
+            self.assertAlmostEqual(
+                preprocessor.estimate_skew(pixels), angle, delta=preprocessor.DESKEW_STEP
+            )
+
+    def test_process_reports_timings_in_step_order(self):
+        """Test the pipeline report and that a straight page is not rotated.
+
+        Given: A straight gray page and steps given out of order
+        When: Processing it
+        Then: Steps run in STEPS order, the size is kept and the skew is 0
+        """
+        image = self._create_text_page(background=200)
+
+        result, report = self.ImagePreprocessor(('deskew', 'binarize')).process(image)
+
+        self.assertEqual(list(report['timings']), ['binarize', 'deskew'])
+        self.assertEqual(report['skew_angle'], 0.0)
+        self.assertEqual(result.size, image.size)
+        self.assertEqual(result.mode, 'L')
+
+    def test_unknown_step_rejected(self):
+        """Test that an unknown step name raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.ImagePreprocessor(('binarize', 'sharpen'))
@@ -158,6 +158,27 @@ class TestJsocrConfig(TransactionCase):
             config = self.JsocrConfig.create({'ollama_url': url})
             self.assertEqual(config.ollama_url, url)
 
+    def test_ocr_limits_validation(self):
+        """Test: nombre de processus OCR >= 1 et timeout par page >= 0"""
+        config = self.JsocrConfig.create({})
+        self.assertEqual(config.ocr_max_workers, 1)
+        self.assertEqual(config.ocr_page_timeout, 60)
+
+        with self.assertRaises(ValidationError):
+            config.write({'ocr_max_workers': 0})
+        with self.assertRaises(ValidationError):
+            config.write({'ocr_page_timeout': -1})
+
+    def test_prompt_max_tokens_validation(self):
+        """Test: budget de tokens du prompt 0 (illimite) ou au moins le minimum"""
+        config = self.JsocrConfig.create({})
+        config.write({'prompt_max_tokens': 0})
+        config.write({'prompt_max_tokens': 3000})
+
+        for value in (-1, 50):
+            with self.assertRaises(ValidationError):
+                config.write({'prompt_max_tokens': value})
+
     def test_invalid_email_raises_error(self):
         """Test: email invalide leve une ValidationError"""
         config = self.JsocrConfig.create({})
@@ -183,7 +204,7 @@ class TestJsocrConfig(TransactionCase):
     # Tests Ollama Connection (Story 2.3)
     # -------------------------------------------------------------------------
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     @patch('js_invoice_ocr_ia.models.jsocr_config._logger')
     def test_ollama_connection_success_with_models(self, mock_logger, mock_get):
         """Test: connexion reussie retourne les modeles disponibles"""
@@ -211,17 +232,17 @@ class TestJsocrConfig(TransactionCase):
         self.assertIn('mistral', result['params']['message'])
         self.assertEqual(result['params']['type'], 'success')
 
-        # Verifier que le timeout est de 10s
+        # Verifier les timeouts: connexion (10s par defaut) puis lecture de 10s
         mock_get.assert_called_once_with(
             'http://localhost:11434/api/tags',
-            timeout=10
+            timeout=(10, 10)
         )
 
         # Verifier que le logging a ete appele correctement
         mock_logger.info.assert_any_call("JSOCR: Testing Ollama connection")
         mock_logger.info.assert_any_call("JSOCR: Ollama connection successful - 2 model(s) found")
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     def test_ollama_connection_success_no_models(self, mock_get):
         """Test: connexion reussie sans modeles affiche message approprie"""
         mock_response = MagicMock()
@@ -238,7 +259,7 @@ class TestJsocrConfig(TransactionCase):
         self.assertIn('Aucun modele disponible', result['params']['message'])
         self.assertEqual(result['params']['type'], 'success')
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     @patch('js_invoice_ocr_ia.models.jsocr_config._logger')
     def test_ollama_connection_timeout(self, mock_logger, mock_get):
         """Test: timeout apres 10s leve UserError avec message approprie"""
@@ -257,7 +278,7 @@ class TestJsocrConfig(TransactionCase):
         mock_logger.info.assert_called_once_with("JSOCR: Testing Ollama connection")
         mock_logger.warning.assert_called_once_with("JSOCR: Ollama connection timeout")
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     def test_ollama_connection_error(self, mock_get):
         """Test: erreur de connexion leve UserError"""
         mock_get.side_effect = requests.ConnectionError("Connection refused")
@@ -271,7 +292,7 @@ class TestJsocrConfig(TransactionCase):
 
         self.assertIn('Erreur de connexion au serveur Ollama', str(cm.exception))
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     def test_ollama_connection_http_error(self, mock_get):
         """Test: HTTP != 200 leve UserError avec status code"""
         mock_response = MagicMock()
@@ -298,7 +319,7 @@ class TestJsocrConfig(TransactionCase):
 
         self.assertIn('URL Ollama n\'est pas configuree', str(cm.exception))
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     def test_ollama_connection_invalid_json(self, mock_get):
         """Test: reponse JSON invalide geree gracieusement"""
         mock_response = MagicMock()
@@ -346,7 +367,7 @@ class TestJsocrConfig(TransactionCase):
     # Tests Model Selection (Story 2.4)
     # -------------------------------------------------------------------------
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     def test_fetch_available_models_success(self, mock_get):
         """Test: _fetch_available_models retourne liste si connexion OK"""
         mock_response = MagicMock()
@@ -369,7 +390,7 @@ class TestJsocrConfig(TransactionCase):
         self.assertIn('llama3:latest', models)
         self.assertIn('mistral:latest', models)
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     def test_fetch_available_models_connection_error(self, mock_get):
         """Test: _fetch_available_models retourne [] si erreur connexion"""
         mock_get.side_effect = requests.ConnectionError()
@@ -392,7 +413,7 @@ class TestJsocrConfig(TransactionCase):
 
         self.assertEqual(models, [])
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     def test_fetch_available_models_http_error(self, mock_get):
         """Test: _fetch_available_models retourne [] si HTTP != 200"""
         mock_response = MagicMock()
@@ -407,7 +428,7 @@ class TestJsocrConfig(TransactionCase):
 
         self.assertEqual(models, [])
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     def test_fetch_available_models_timeout(self, mock_get):
         """Test: _fetch_available_models retourne [] si timeout"""
         mock_get.side_effect = requests.Timeout()
@@ -468,7 +489,7 @@ class TestJsocrConfig(TransactionCase):
     # Tests supplementaires Story 2.4 (Corrections post-review)
     # -------------------------------------------------------------------------
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     def test_fetch_available_models_invalid_json(self, mock_get):
         """Test: _fetch_available_models retourne [] si JSON invalide"""
         mock_response = MagicMock()
@@ -484,7 +505,7 @@ class TestJsocrConfig(TransactionCase):
 
         self.assertEqual(models, [])
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     @patch('js_invoice_ocr_ia.models.jsocr_config._logger')
     def test_fetch_available_models_logs_success(self, mock_logger, mock_get):
         """Test: _fetch_available_models log le nombre de modeles recuperes"""
@@ -507,7 +528,7 @@ class TestJsocrConfig(TransactionCase):
         # Verifier le log de succes
         mock_logger.info.assert_called_once_with("JSOCR: Retrieved 2 model(s) from Ollama")
 
-    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.get')
+    @patch('js_invoice_ocr_ia.models.jsocr_config.requests.Session.get')
     @patch('js_invoice_ocr_ia.models.jsocr_config._logger')
     def test_fetch_available_models_logs_error(self, mock_logger, mock_get):
         """Test: _fetch_available_models log les erreurs de connexion"""
@@ -2,6 +2,7 @@
 # Part of js_invoice_ocr_ia. See LICENSE file for full copyright and licensing details.
 
 import base64
+import json
 from odoo.tests import TransactionCase
 from odoo.exceptions import UserError
 
@@ -507,6 +508,175 @@ class TestJsocrImportJob(TransactionCase):
 
         self.assertIn('extraction failed', str(ctx.exception).lower())
 
+    def test_extract_text_reuses_ocr_cache(self):
+        """Test: an identical PDF is read from the OCR cache the second time"""
+        import tempfile
+        from unittest.mock import patch
+        from odoo.addons.js_invoice_ocr_ia.services.ocr_service import OCRService
+
+        pages = [{
+            'page': 1, 'text': 'Rechnung 42', 'method': 'native',
+            'tier': None, 'confidence': None, 'dpi': None, 'lang': None,
+        }]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = self.env['jsocr.config'].get_config()
+            config.write({'ocr_cache_enabled': True, 'ocr_cache_path': temp_dir})
+
+            first_job = self._create_job()
+            second_job = self._create_job()
+            with patch.object(OCRService, 'extract_pages', return_value=pages) as mock_extract:
+                first_job._extract_text()
+                second_job._extract_text()
+
+        self.assertEqual(mock_extract.call_count, 1)
+        self.assertEqual(second_job.extracted_text, first_job.extracted_text)
+        self.assertIn('Rechnung 42', second_job.extracted_text)
+        self.assertEqual(second_job.detected_language, first_job.detected_language)
+
+    def test_extract_text_records_degraded_pages(self):
+        """Test: pages over the OCR time budget are recorded and not cached"""
+        import tempfile
+        from unittest.mock import patch
+        from odoo.addons.js_invoice_ocr_ia.services.ocr_service import OCRService
+
+        pages = [
+            {'page': 1, 'text': 'Facture 42', 'method': 'tesseract', 'tier': 'single',
+             'confidence': None, 'dpi': 300, 'lang': 'fra'},
+            {'page': 2, 'text': '', 'method': 'timeout', 'tier': None,
+             'confidence': None, 'dpi': None, 'lang': 'fra',
+             'error': 'Tesseract OCR timeout after 60s'},
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = self.env['jsocr.config'].get_config()
+            config.write({'ocr_cache_enabled': True, 'ocr_cache_path': temp_dir})
+
+            job = self._create_job()
+            with patch.object(OCRService, 'extract_pages', return_value=pages) as mock_extract:
+                job._extract_text()
+                job._extract_text()
+
+        self.assertEqual(job.degraded_pages, '2')
+        self.assertIn('Facture 42', job.extracted_text)
+        self.assertEqual(mock_extract.call_count, 2)
+
+    def test_extract_text_records_skipped_pages(self):
+        """Test: pages past the page cap of large documents are recorded and posted"""
+        from unittest.mock import MagicMock, patch
+        from odoo.addons.js_invoice_ocr_ia.services.ocr_service import OCRService
+
+        pages = [
+            {'page': page, 'text': f'Page {page}', 'method': 'native', 'tier': None,
+             'confidence': None, 'dpi': None, 'lang': None}
+            for page in range(1, 51)
+        ]
+        config = self.env['jsocr.config'].get_config()
+        config.write({'ocr_large_max_pages': 50})
+        session = MagicMock(page_count=120)
+        session.__enter__.return_value = session
+
+        job = self._create_job()
+        with patch.object(type(job), '_is_large_document', return_value=True), \
+                patch.object(OCRService, 'extract_pages', return_value=pages), \
+                patch.object(OCRService, 'open_document', return_value=session):
+            job._extract_text()
+
+        self.assertEqual(job.skipped_pages, '51-120')
+        self.assertIn('51-120', job.message_ids[0].body)
+
+    def test_extract_text_stores_searchable_pdf(self):
+        """Test: with searchable PDF enabled, the stored PDF gets the text layer"""
+        from unittest.mock import patch
+        from odoo.addons.js_invoice_ocr_ia.services.ocr_service import OCRService
+
+        pages = [
+            {'page': 1, 'text': 'Facture 42', 'method': 'tesseract', 'tier': 'single',
+             'confidence': None, 'dpi': 300, 'lang': 'fra'},
+        ]
+        config = self.env['jsocr.config'].get_config()
+        config.write({'ocr_searchable_pdf': True})
+
+        job = self._create_job()
+        original_pdf = job._get_pdf_binary()
+        with patch.object(OCRService, 'extract_pages', return_value=pages), \
+                patch.object(OCRService, 'add_text_layer', side_effect=ValueError("broken")):
+            job._extract_text()
+        self.assertEqual(job._get_pdf_binary(), original_pdf)
+
+        with patch.object(OCRService, 'extract_pages', return_value=pages), \
+                patch.object(OCRService, 'add_text_layer',
+                             return_value=b'%PDF-1.4 searchable') as mock_layer:
+            job._extract_text()
+
+        mock_layer.assert_called_once_with(original_pdf, pages)
+        self.assertEqual(job._get_pdf_binary(), b'%PDF-1.4 searchable')
+        self.assertIn('Facture 42', job.extracted_text)
+
+    def test_extract_text_stores_word_index(self):
+        """Test: word boxes are stored as an index, not in the page metadata"""
+        from unittest.mock import patch
+        from odoo.addons.js_invoice_ocr_ia.services.ocr_service import OCRService
+
+        pages = [
+            {'page': 1, 'text': 'Facture 42', 'method': 'native', 'tier': None,
+             'confidence': None, 'dpi': None, 'lang': None,
+             'words': [[0.1, 0.05, 0.2, 0.07, 'Facture', None], [0.21, 0.05, 0.25, 0.07, '42', None]]},
+        ]
+        job = self._create_job()
+        with patch.object(OCRService, 'extract_pages', return_value=pages):
+            job._extract_text()
+
+        self.assertNotIn('words', json.loads(job.extraction_page_data)[0])
+        index = job._get_word_index()
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.find_value('facture 42')[0]['page'], 1)
+
+    def test_table_lines_only_for_reconciled_native_pdf(self):
+        """Test: PDF table lines are used for native PDFs whose lines match a total"""
+        from unittest.mock import patch
+        from odoo.addons.js_invoice_ocr_ia.services.table_extraction import TableExtractor
+
+        table = {
+            'lines': [{'description': 'Conseil', 'quantity': 2.0, 'unit_price': 150.0, 'amount': 300.0}],
+            'lines_total': 300.0,
+            'document_total': 300.0,
+            'reconciled': True,
+            'header_text': '--- Page 1 ---\nMuster AG\nTotal 300.00',
+        }
+        job = self._create_job()
+        with patch.object(TableExtractor, 'extract_line_items', return_value=table) as mock_table:
+            job.extraction_page_data = json.dumps([{'page': 1, 'method': 'tesseract'}])
+            self.assertIsNone(job._extract_table_lines())
+            self.assertFalse(mock_table.called)
+
+            job.extraction_page_data = json.dumps([{'page': 1, 'method': 'native'}])
+            self.assertEqual(job._extract_table_lines(), table)
+
+            mock_table.return_value = dict(table, reconciled=False, document_total=None)
+            self.assertIsNone(job._extract_table_lines())
+
+    def test_large_document_goes_to_separate_lane(self):
+        """Test: PDFs over the size threshold are only picked by the large lane"""
+        config = self.env['jsocr.config'].get_config()
+        config.write({'ocr_large_document_mb': 1})
+
+        small_job = self._create_job()
+        large_job = self._create_job(
+            pdf_file=base64.b64encode(b'%PDF-1.4 ' + b'0' * 1024 * 1024)
+        )
+        small_job.state = large_job.state = 'pending'
+
+        self.assertFalse(small_job._is_large_document())
+        self.assertTrue(large_job._is_large_document())
+        normal_lane = self.Job.search(self.Job._get_lane_domain(large=False))
+        large_lane = self.Job.search(self.Job._get_lane_domain(large=True))
+        self.assertIn(small_job, normal_lane)
+        self.assertNotIn(large_job, normal_lane)
+        self.assertEqual(large_lane & (small_job | large_job), large_job)
+
+        config.write({'ocr_large_document_mb': 0})
+        self.assertIn(large_job, self.Job.search(self.Job._get_lane_domain(large=False)))
+        self.assertFalse(self.Job.search(self.Job._get_lane_domain(large=True)))
+
     # -------------------------------------------------------------------------
     # TEST: Language Detection Field (Story 3.3)
     # -------------------------------------------------------------------------
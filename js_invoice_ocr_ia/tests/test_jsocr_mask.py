@@ -168,6 +168,42 @@ class TestJsocrMask(TransactionCase):
         with self.assertRaises(ValidationError):
             self._create_mask(mask_data='{"name": "value",}')
 
+    def test_mask_data_valid_ocr_zones(self):
+        """Test: well-formed OCR zones are accepted and returned."""
+        mask = self._create_mask(mask_data=json.dumps({
+            'version': '1.0',
+            'fields': {},
+            'zones': {
+                'header': {'page': 1, 'rect': [0, 0, 1, 0.3]},
+                'totals': {'page': -1, 'rect': [0.5, 0.7, 1, 0.95], 'psm': 6},
+            },
+        }))
+
+        zones = mask.get_ocr_zones()
+        self.assertEqual(set(zones), {'header', 'totals'})
+        self.assertEqual(zones['totals']['page'], -1)
+
+    def test_mask_data_invalid_ocr_zones_raises(self):
+        """Test: OCR zones with bad rectangles, pages or psm raise ValidationError."""
+        invalid_zones = [
+            ['header'],
+            {'header': {'page': 1, 'rect': [0, 0, 1]}},
+            {'header': {'page': 1, 'rect': [0, 0, 1.5, 0.3]}},
+            {'header': {'page': 1, 'rect': [0.8, 0, 0.2, 0.3]}},
+            {'header': {'page': 0, 'rect': [0, 0, 1, 0.3]}},
+            {'header': {'page': 1, 'rect': [0, 0, 1, 0.3], 'psm': 14}},
+            {'header': {'page': 1, 'rect': [0, 0, 1, 0.3], 'psm': '6'}},
+        ]
+        for zones in invalid_zones:
+            with self.assertRaises(ValidationError):
+                self._create_mask(mask_data=json.dumps({'zones': zones}))
+
+    def test_get_ocr_zones_without_zones(self):
+        """Test: a mask without zones returns an empty dict."""
+        mask = self._create_mask(mask_data='{"version": "1.0"}')
+
+        self.assertEqual(mask.get_ocr_zones(), {})
+
     def test_mask_data_update_valid_json(self):
         """Test: updating mask_data with valid JSON succeeds."""
         mask = self._create_mask(mask_data='{}')
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Part of js_invoice_ocr_ia. See LICENSE file for full copyright and licensing details.
+
+"""Tests for the language detection engine.
+
+These tests verify the whole-word scoring of LanguageDetector, its
+confidence, and the bounded sample it reads.
+"""
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install', 'jsocr', 'jsocr_ocr')
+class TestLanguageDetection(TransactionCase):
+    """Test cases for LanguageDetector."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures."""
+        super().setUpClass()
+        from js_invoice_ocr_ia.services.language_detection import LanguageDetector
+        from js_invoice_ocr_ia.services.ocr_service import OCRService
+        cls.LanguageDetector = LanguageDetector
+        cls.detector = LanguageDetector(OCRService.LANGUAGE_KEYWORDS, default_language='fr')
+
+    def test_detect_whole_words_only(self):
+        """Test that keywords inside longer words are not counted.
+
+        Given: A text where 'net' and 'total' only appear inside other words
+        When: Scoring the text
+        Then: No language scores
+        """
+        scores = self.detector.score("internet totalement cabinet")
+
+        self.assertEqual(scores, {'fr': 0, 'de': 0, 'en': 0})
+
+    def test_detect_accented_keywords(self):
+        """Test that accented words match the unaccented profiles.
+
+        Given: A French text with 'Quantité', 'Délai' and 'Numéro'
+        When: Detecting the language
+        Then: French is detected with full confidence
+        """
+        lang, confidence, scores = self.detector.detect("Quantité Délai Numéro Unité")
+
+        self.assertEqual(lang, 'fr')
+        self.assertEqual(confidence, 1.0)
+        self.assertEqual(scores['fr'], 12)
+
+    def test_detect_confidence_reflects_ambiguity(self):
+        """Test the confidence of clear and ambiguous texts.
+
+        Given: A German invoice text, and a text of words shared by languages
+        When: Detecting the language
+        Then: The German text has a high confidence, the shared words none
+        """
+        lang, confidence, _scores = self.detector.detect(
+            "Rechnung für die Lieferung, Betrag und MwSt mit Zahlung innert 30 Tagen"
+        )
+        self.assertEqual(lang, 'de')
+        self.assertGreaterEqual(confidence, 0.9)
+
+        lang, confidence, _scores = self.detector.detect("Total net 1250.00 CHF")
+        self.assertEqual(lang, 'fr')  # Tie: default language
+        self.assertEqual(confidence, 0.0)
+
+    def test_detect_reads_bounded_sample(self):
+        """Test that only the beginning of each page is read, within a budget.
+
+        Given: Pages starting with French text, German text past the page
+               sample, and more pages than the total budget covers
+        When: Detecting the language
+        Then: Only the French page beginnings are scored
+        """
+        detector = self.LanguageDetector({'fr': ['facture'], 'de': ['rechnung']})
+        detector.PAGE_SAMPLE_CHARS = 100
+        detector.MAX_SAMPLE_CHARS = 300
+        page = "facture " + "x" * 100 + " rechnung"
+        pages = [page] * 3 + ["rechnung " * 10] * 5
+
+        scores = detector.score(pages)
+
+        self.assertEqual(scores, {'fr': 9, 'de': 0})
+
+        # A whole text is sampled at regular intervals, up to the budget:
+        # at most 40 words of 8 characters are read out of 10000
+        scores = detector.score("facture " * 10000)
+        self.assertGreater(scores['fr'], 0)
+        self.assertLessEqual(scores['fr'], 40 * detector.KEYWORD_WEIGHT)
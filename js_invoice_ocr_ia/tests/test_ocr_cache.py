@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# Part of js_invoice_ocr_ia. See LICENSE file for full copyright and licensing details.
+
+"""Tests for the OCR caches.
+
+These tests verify the content-addressed keys, the LRU eviction and the
+fail-soft behaviour of OCRResultCache, and the page-level PageOCRCache.
+"""
+
+import os
+import tempfile
+import time
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install', 'jsocr', 'jsocr_ocr')
+class TestOCRResultCache(TransactionCase):
+    """Test cases for OCRResultCache."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures."""
+        super().setUpClass()
+        from js_invoice_ocr_ia.services.ocr_cache import OCRResultCache, PageOCRCache
+        cls.OCRResultCache = OCRResultCache
+        cls.PageOCRCache = PageOCRCache
+
+    def setUp(self):
+        super().setUp()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self._temp_dir.name
+        self.addCleanup(self._temp_dir.cleanup)
+
+    def test_key_depends_on_content_and_settings(self):
+        """Test that keys change with the PDF bytes and the OCR settings.
+
+        Given: Two PDFs and two OCR settings
+        When: Building cache keys
+        Then: Identical inputs give the same key, any difference another key
+        """
+        cache = self.OCRResultCache(self.cache_dir)
+        settings = {'dpi': 300, 'lang': 'fra+deu+eng'}
+
+        key = cache.make_key(b'%PDF-1 invoice', settings)
+
+        self.assertEqual(key, cache.make_key(b'%PDF-1 invoice', dict(settings)))
+        self.assertNotEqual(key, cache.make_key(b'%PDF-1 other', settings))
+        self.assertNotEqual(key, cache.make_key(b'%PDF-1 invoice', {'dpi': 200}))
+
+    def test_put_then_get_roundtrip(self):
+        """Test storing and reading back a result.
+
+        Given: An empty cache
+        When: A result is stored and read back
+        Then: The same result is returned, and unknown keys are misses
+        """
+        cache = self.OCRResultCache(self.cache_dir)
+        key = cache.make_key(b'pdf', {})
+        result = {
+            'pages': [{'page': 1, 'text': 'Facture 42', 'method': 'native'}],
+            'detected_language': 'fr',
+        }
+
+        self.assertIsNone(cache.get(key))
+        cache.put(key, result)
+
+        self.assertEqual(cache.get(key), result)
+
+    def test_eviction_removes_least_recently_used(self):
+        """Test size-bounded LRU eviction.
+
+        Given: A 1 MB cache holding two entries of 400 KB, the first one
+               read after the second one was written
+        When: A third 400 KB entry is written
+        Then: The least recently used (second) entry is evicted
+        """
+        cache = self.OCRResultCache(self.cache_dir, max_size_mb=1)
+        payload = {'pages': [{'text': 'x' * 400 * 1024}]}
+        keys = [cache.make_key(str(index).encode(), {}) for index in range(3)]
+
+        cache.put(keys[0], payload)
+        cache.put(keys[1], payload)
+        # Make the LRU order explicit regardless of filesystem time resolution
+        now = time.time()
+        os.utime(cache._get_path(keys[1]), (now - 60, now - 60))
+        os.utime(cache._get_path(keys[0]), (now - 120, now - 120))
+        cache.get(keys[0])
+        cache.put(keys[2], payload)
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+    def test_corrupted_entry_is_a_miss(self):
+        """Test that an unreadable entry does not fail the extraction.
+
+        Given: A cache entry with invalid JSON content
+        When: Reading it
+        Then: None is returned
+        """
+        cache = self.OCRResultCache(self.cache_dir)
+        key = cache.make_key(b'pdf', {})
+        path = cache._get_path(key)
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'w', encoding='utf-8') as cache_file:
+            cache_file.write('{not json')
+
+        self.assertIsNone(cache.get(key))
+
+    def test_unwritable_directory_is_ignored(self):
+        """Test that write errors are logged, not raised.
+
+        Given: A cache directory path that is a regular file
+        When: Storing a result
+        Then: No exception is raised and the entry is a miss
+        """
+        blocker = os.path.join(self.cache_dir, 'blocker')
+        with open(blocker, 'w', encoding='utf-8') as blocker_file:
+            blocker_file.write('')
+        cache = self.OCRResultCache(blocker)
+        key = cache.make_key(b'pdf', {})
+
+        cache.put(key, {'pages': []})
+
+        self.assertIsNone(cache.get(key))
+
+    # -------------------------------------------------------------------------
+    # Page OCR Cache Tests
+    # -------------------------------------------------------------------------
+
+    def test_page_cache_lru_and_counters(self):
+        """Test page cache eviction order and hit-rate counters.
+
+        Given: A page cache of 2 entries holding pages A and B, A read last
+        When: Page C is stored
+        Then: B is evicted, and hits/misses/evictions are counted
+        """
+        cache = self.PageOCRCache(max_entries=2)
+        keys = {name: cache.make_key(name, {'dpi': 300}) for name in 'ABC'}
+
+        cache.put(keys['A'], {'text': 'A'})
+        cache.put(keys['B'], {'text': 'B'})
+        self.assertEqual(cache.get(keys['A']), {'text': 'A'})
+        cache.put(keys['C'], {'text': 'C'})
+
+        self.assertIsNone(cache.get(keys['B']))
+        stats = cache.get_stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_page_cache_key_depends_on_settings(self):
+        """Test that the same page with other OCR settings is a miss."""
+        cache = self.PageOCRCache()
+        cache.put(cache.make_key('page', {'lang': 'fra'}), {'text': 'Conditions'})
+
+        self.assertIsNone(cache.get(cache.make_key('page', {'lang': 'deu'})))
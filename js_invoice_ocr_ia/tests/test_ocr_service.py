@@ -8,6 +8,7 @@ text from both native PDFs (using PyMuPDF) and scanned PDFs (using Tesseract).
 """
 
 import logging
+import sys
 from unittest.mock import patch, MagicMock
 
 from odoo.tests import TransactionCase, tagged
@@ -70,6 +71,30 @@ def create_empty_pdf(num_pages=1):
     return pdf_bytes
 
 
+def create_mixed_pdf(native_text, scanned_text="Scanned"):
+    """Create a 2-page PDF: a native text page followed by an image-only page.
+
+    Args:
+        native_text (str): Selectable text for the first page
+        scanned_text (str): Text rendered as image on the second page
+
+    Returns:
+        bytes: PDF file content as bytes, or None if dependencies unavailable
+    """
+    native_pdf = create_test_pdf(native_text, num_pages=1)
+    scanned_pdf = create_image_only_pdf(scanned_text, num_pages=1)
+    if native_pdf is None or scanned_pdf is None:
+        return None
+
+    doc = fitz.open(stream=native_pdf, filetype="pdf")
+    scanned_doc = fitz.open(stream=scanned_pdf, filetype="pdf")
+    doc.insert_pdf(scanned_doc)
+    pdf_bytes = doc.tobytes()
+    scanned_doc.close()
+    doc.close()
+    return pdf_bytes
+
+
 def create_image_only_pdf(text_on_image="Test", num_pages=1):
     """Create a PDF containing only images with text (simulates scanned PDF).
 
@@ -128,6 +153,19 @@ class TestOCRService(TransactionCase):
         # Import here to ensure module is loaded
         from js_invoice_ocr_ia.services.ocr_service import OCRService
         cls.OCRService = OCRService
+        cls.ocr_module = sys.modules[OCRService.__module__]
+
+    @staticmethod
+    def _ocr_result(text, tier='single', confidence=None):
+        """Build a page OCR result as returned by OCRService._ocr_page."""
+        return {
+            'text': text,
+            'method': 'tesseract',
+            'tier': tier,
+            'confidence': confidence,
+            'dpi': 300,
+            'lang': None,
+        }
 
     def test_extract_text_simple_pdf(self):
         """Test extraction of text from a simple 1-page PDF.
@@ -366,6 +404,68 @@ class TestOCRService(TransactionCase):
 
         self.assertIsInstance(result, bool)
 
+    def test_tesseract_probe_is_lazy_and_cached(self):
+        """Test that Tesseract is probed on first use only.
+
+        Given: pytesseract installed and Tesseract not probed yet
+        When: Creating services and checking availability several times
+        Then: The binary is probed once, and again only when forced
+        """
+        if not self.ocr_module.PYTESSERACT_INSTALLED:
+            self.skipTest("pytesseract not installed")
+
+        with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', None), \
+                patch.object(self.ocr_module, 'TESSERACT_VERSION', None), \
+                patch.object(self.ocr_module.pytesseract, 'get_tesseract_version',
+                             return_value='5.3.0') as mock_version:
+            ocr = self.OCRService(ocr_engine='pytesseract')
+            mock_version.assert_not_called()
+
+            self.assertTrue(ocr.is_tesseract_available())
+            self.assertEqual(ocr.get_engine_version(), '5.3.0')
+            self.assertTrue(self.OCRService(ocr_engine='pytesseract').is_tesseract_available())
+            self.assertEqual(mock_version.call_count, 1)
+
+            mock_version.side_effect = OSError("tesseract not found")
+            self.assertFalse(self.ocr_module.probe_tesseract(force=True))
+            self.assertFalse(ocr.is_tesseract_available())
+            self.assertEqual(mock_version.call_count, 2)
+
+    def test_get_ocr_service_reused_per_process(self):
+        """Test that the process service is reused until settings change.
+
+        Given: The process OCR service for some settings
+        When: Asking for it again with equal, then different settings
+        Then: The same instance is returned, then a new one
+        """
+        service = self.ocr_module.get_ocr_service(max_workers=1, page_cache_size=10)
+
+        self.assertIs(
+            self.ocr_module.get_ocr_service(page_cache_size=10, max_workers=1), service
+        )
+        other = self.ocr_module.get_ocr_service(max_workers=1, page_cache_size=20)
+        self.assertIsNot(other, service)
+        self.assertEqual(other.page_cache_size, 20)
+
+    def test_get_ocr_service_kept_per_lane(self):
+        """Test that alternating document lanes reuses both services.
+
+        Given: The services of the normal and large document lanes
+        When: Alternating between the lanes, then using a third setting
+        Then: Each lane keeps its instance, the third setting drops the
+              least recently used one
+        """
+        get_ocr_service = self.ocr_module.get_ocr_service
+        normal = get_ocr_service(max_workers=2, max_pages=0)
+        large = get_ocr_service(max_workers=1, max_pages=50)
+
+        self.assertIs(get_ocr_service(max_workers=2, max_pages=0), normal)
+        self.assertIs(get_ocr_service(max_workers=1, max_pages=50), large)
+
+        get_ocr_service(max_workers=2, max_pages=0, page_cache_size=5)
+        self.assertIs(get_ocr_service(max_workers=1, max_pages=50), large)
+        self.assertIsNot(get_ocr_service(max_workers=2, max_pages=0), normal)
+
     def test_detect_native_pdf_routing(self):
         """Test that native PDFs are routed to native extraction.
 
@@ -737,6 +837,27 @@ class TestOCRService(TransactionCase):
         # French should win due to more keywords
         self.assertEqual(result, 'fr')
 
+    def test_detect_language_with_confidence_per_page(self):
+        """Test language detection over page texts, with its confidence.
+
+        Given: The texts of a German invoice, page by page, and an empty text
+        When: Detecting language with confidence
+        Then: German is detected with a high confidence, the empty text
+              defaults to French with no confidence
+        """
+        ocr = self.OCRService()
+        pages = [
+            "Rechnung Nr. 42\nLieferant: Müller AG\nDatum: 15.01.2024",
+            "",
+            "Betrag netto 1000.00\nMwSt 81.00\nZahlung innert 30 Tagen",
+        ]
+
+        lang, confidence = ocr.detect_language_with_confidence(pages)
+        self.assertEqual(lang, 'de')
+        self.assertGreaterEqual(confidence, ocr.NARROWING_MIN_CONFIDENCE)
+
+        self.assertEqual(ocr.detect_language_with_confidence(''), ('fr', 0.0))
+
     def test_get_tesseract_lang_config_french(self):
         """Test Tesseract config with French as primary.
 
@@ -797,3 +918,1172 @@ class TestOCRService(TransactionCase):
         self.assertGreaterEqual(len(ocr.LANGUAGE_KEYWORDS['fr']), 10)
         self.assertGreaterEqual(len(ocr.LANGUAGE_KEYWORDS['de']), 10)
         self.assertGreaterEqual(len(ocr.LANGUAGE_KEYWORDS['en']), 10)
+
+    # -------------------------------------------------------------------------
+    # PDF Document Session Tests
+    # -------------------------------------------------------------------------
+
+    def test_extract_text_opens_pdf_once(self):
+        """Test that detection and extraction share a single open document.
+
+        Given: A native PDF
+        When: Extracting text
+        Then: fitz.open is called exactly once
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_test_pdf("Single open test content " * 5, num_pages=3)
+        ocr = self.OCRService()
+
+        with patch(
+            'odoo.addons.js_invoice_ocr_ia.services.ocr_service.fitz.open',
+            wraps=fitz.open,
+        ) as mock_open:
+            result = ocr.extract_text_from_pdf(pdf_binary)
+
+        self.assertEqual(mock_open.call_count, 1)
+        self.assertIn("--- Page 3 ---", result)
+
+    def test_session_closes_document_on_error(self):
+        """Test that the session closes the document when an error occurs.
+
+        Given: An opened document session
+        When: An exception is raised inside the with block
+        Then: The document is closed
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        from odoo.addons.js_invoice_ocr_ia.services.ocr_service import PDFDocumentSession
+
+        pdf_binary = create_test_pdf("Content", num_pages=1)
+        session = PDFDocumentSession(pdf_binary)
+
+        with self.assertRaises(RuntimeError):
+            with session:
+                self.assertIsNotNone(session.doc)
+                raise RuntimeError("boom")
+
+        self.assertIsNone(session.doc)
+
+    def test_session_reuses_detection_text(self):
+        """Test that page text extracted for detection is reused.
+
+        Given: A session on a native PDF
+        When: Detecting the type then reading page text
+        Then: The cached text is returned without a second extraction
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_test_pdf("Reused detection text content " * 3, num_pages=1)
+        ocr = self.OCRService()
+
+        with ocr.open_document(pdf_binary) as session:
+            self.assertTrue(session.is_native())
+            cached = session._page_texts[0]
+            self.assertIs(session.get_page_text(0), cached)
+
+    def test_session_classify_page(self):
+        """Test cheap page classification.
+
+        Given: Native, image-only and blank PDFs
+        When: Classifying the first page
+        Then: Returns 'native', 'scanned' and 'empty' respectively
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        ocr = self.OCRService()
+
+        native_pdf = create_test_pdf("Native page content " * 5, num_pages=1)
+        with ocr.open_document(native_pdf) as session:
+            self.assertEqual(session.classify_page(0), 'native')
+
+        blank_pdf = create_empty_pdf(num_pages=1)
+        with ocr.open_document(blank_pdf) as session:
+            self.assertEqual(session.classify_page(0), 'empty')
+
+        scanned_pdf = create_image_only_pdf("Scanned", num_pages=1)
+        if scanned_pdf is None:
+            self.skipTest("Pillow not available")
+        with ocr.open_document(scanned_pdf) as session:
+            self.assertEqual(session.classify_page(0), 'scanned')
+
+    # -------------------------------------------------------------------------
+    # Hybrid Extraction Mode Tests
+    # -------------------------------------------------------------------------
+
+    def test_invalid_extraction_mode_raises(self):
+        """Test that an unknown extraction mode is rejected."""
+        with self.assertRaises(ValueError):
+            self.OCRService(extraction_mode='unknown')
+
+    def test_hybrid_mode_ocrs_only_scanned_pages(self):
+        """Test per-page routing in hybrid mode.
+
+        Given: A PDF with a native page followed by an image-only page
+        When: Extracting text in hybrid mode
+        Then: Only the image-only page is sent to Tesseract
+        And: The native page text comes from the text layer
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_mixed_pdf("Native cover page with plenty of text " * 3)
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        ocr = self.OCRService(extraction_mode='hybrid')
+        with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                patch.object(self.OCRService, '_ocr_page',
+                             return_value=self._ocr_result("OCR ANNEX")) as mock_ocr:
+            result = ocr.extract_text_from_pdf(pdf_binary)
+
+        self.assertEqual(mock_ocr.call_count, 1)
+        self.assertIn("Native cover page", result)
+        self.assertIn("OCR ANNEX", result)
+        self.assertLess(result.find("--- Page 1 ---"), result.find("OCR ANNEX"))
+
+    def test_hybrid_mode_blank_pages_skip_tesseract(self):
+        """Test that blank pages never require Tesseract in hybrid mode.
+
+        Given: A blank PDF and Tesseract unavailable
+        When: Extracting text in hybrid mode
+        Then: No error is raised and page markers are present
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_empty_pdf(num_pages=2)
+        ocr = self.OCRService(extraction_mode='hybrid')
+        with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', False):
+            result = ocr.extract_text_from_pdf(pdf_binary)
+
+        self.assertIn("--- Page 2 ---", result)
+
+    # -------------------------------------------------------------------------
+    # Parallel OCR Tests
+    # -------------------------------------------------------------------------
+
+    def test_parallel_ocr_keeps_page_order(self):
+        """Test that pool OCR puts page texts back in page order.
+
+        Given: A 4-page scanned PDF and 2 worker processes
+        When: Extracting text
+        Then: Each page text follows its own page marker, in order
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_image_only_pdf("Parallel", num_pages=4)
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        ocr = self.OCRService(max_workers=2)
+        with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                patch.object(self.OCRService, '_ocr_page',
+                             side_effect=lambda page, lang=None, deadline=None: self._ocr_result(
+                                 f"TEXT OF PAGE {page.number + 1}")):
+            result = ocr.extract_text_from_pdf(pdf_binary)
+
+        for page_num in range(1, 5):
+            self.assertIn(f"--- Page {page_num} ---\nTEXT OF PAGE {page_num}", result)
+
+    def test_parallel_ocr_page_timeout(self):
+        """Test that a page exceeding the timeout fails the extraction.
+
+        Given: A 2-page scanned PDF whose OCR hangs
+        When: Extracting text with a 1 second page timeout
+        Then: A ValueError mentioning the timeout is raised and the hung
+              worker processes are killed
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_image_only_pdf("Slow", num_pages=2)
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        import os
+        import tempfile
+        import time
+
+        pid_dir = tempfile.mkdtemp()
+
+        def slow_ocr(page, lang=None, deadline=None):
+            open(os.path.join(pid_dir, str(os.getpid())), 'w').close()
+            time.sleep(30)
+            return self._ocr_result("")
+
+        ocr = self.OCRService(max_workers=2, page_timeout=1, timeout_policy='fail')
+        start = time.monotonic()
+        with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                patch.object(self.OCRService, 'POOL_TIMEOUT_GRACE', 0), \
+                patch.object(self.OCRService, '_ocr_page', side_effect=slow_ocr):
+            with self.assertRaises(ValueError) as context:
+                ocr.extract_text_from_pdf(pdf_binary)
+
+        self.assertIn("timeout", str(context.exception).lower())
+        self.assertLess(time.monotonic() - start, 15)
+        pids = [int(name) for name in os.listdir(pid_dir)]
+        self.assertTrue(pids)
+        for pid in pids:
+            with self.assertRaises(ProcessLookupError):
+                os.kill(pid, 0)
+
+    def test_page_over_budget_is_degraded(self):
+        """Test that a page over its time budget does not fail the document.
+
+        Given: A 2-page scanned PDF whose first page times out in Tesseract
+        When: Extracting pages with the default 'degrade' policy
+        Then: Page 1 is recorded as 'timeout' without text, page 2 is OCR'd
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_image_only_pdf("Budget", num_pages=2)
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        results = [self.ocr_module.OCRTimeoutError("Tesseract OCR timeout after 5s"), "Page two"]
+        ocr = self.OCRService(page_timeout=5)
+        with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                patch.object(self.OCRService, '_extract_text_with_tesseract',
+                             side_effect=results) as mock_tesseract:
+            pages = ocr.extract_pages(pdf_binary)
+
+        self.assertEqual([page['method'] for page in pages], ['timeout', 'tesseract'])
+        self.assertEqual(pages[0]['text'], "")
+        self.assertIn("timeout", pages[0]['error'])
+        self.assertEqual(pages[1]['text'], "Page two")
+        self.assertLessEqual(mock_tesseract.call_args_list[1].kwargs['timeout'], 5)
+
+    def test_document_budget_exhausted(self):
+        """Test the document time budget with both policies.
+
+        Given: A 2-page scanned PDF and a document deadline already passed
+        When: Extracting the pages
+        Then: 'degrade' skips Tesseract for every page, 'fail' raises
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_image_only_pdf("Deadline", num_pages=2)
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        import time
+        deadline = time.monotonic() - 1
+        for policy in ('degrade', 'fail'):
+            ocr = self.OCRService(document_timeout=60, timeout_policy=policy)
+            with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                    patch.object(self.OCRService, '_extract_text_with_tesseract') as mock_tesseract, \
+                    ocr.open_document(pdf_binary) as session:
+                if policy == 'degrade':
+                    pages = list(ocr._iter_pages(session, deadline=deadline))
+                    self.assertEqual([page['method'] for page in pages], ['timeout'] * 2)
+                else:
+                    with self.assertRaises(self.ocr_module.OCRTimeoutError):
+                        list(ocr._iter_pages(session, deadline=deadline))
+            self.assertFalse(mock_tesseract.called)
+
+    def test_pytesseract_timeout_becomes_timeout_error(self):
+        """Test that a killed Tesseract process is reported as a timeout."""
+        ocr = self.OCRService()
+
+        timeout_error = ocr._get_tesseract_error(RuntimeError("Tesseract process timeout"), 5)
+        other_error = ocr._get_tesseract_error(OSError("no such file"), 5)
+
+        self.assertIsInstance(timeout_error, self.ocr_module.OCRTimeoutError)
+        self.assertNotIsInstance(other_error, self.ocr_module.OCRTimeoutError)
+        self.assertIsInstance(other_error, ValueError)
+
+    # -------------------------------------------------------------------------
+    # Pixmap Conversion Tests
+    # -------------------------------------------------------------------------
+
+    def test_convert_page_to_image_grayscale_without_png(self):
+        """Test that pages are rendered in gray without a PNG round trip.
+
+        Given: A PDF page
+        When: Converting it to an image
+        Then: The image is single-channel ('L') with the pixmap dimensions
+        And: The pixmap is never encoded to PNG
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        try:
+            from PIL import Image as PILImage  # noqa: F401
+        except ImportError:
+            self.skipTest("Pillow not available")
+
+        pdf_binary = create_test_pdf("Gray content", num_pages=1)
+        doc = fitz.open(stream=pdf_binary, filetype="pdf")
+        page = doc[0]
+
+        ocr = self.OCRService()
+        with patch.object(fitz.Pixmap, 'tobytes') as mock_tobytes:
+            image = ocr._convert_page_to_image(page, dpi=150)
+            self.assertFalse(mock_tobytes.called)
+
+        expected_width = round(page.rect.width * 150 / 72)
+        self.assertEqual(image.mode, 'L')
+        self.assertAlmostEqual(image.width, expected_width, delta=1)
+        # Pixels are readable (white page background at the top-left corner)
+        self.assertEqual(image.getpixel((0, 0)), 255)
+        doc.close()
+
+    # -------------------------------------------------------------------------
+    # Tiered OCR Strategy Tests
+    # -------------------------------------------------------------------------
+
+    def _tiered_extract(self, tesseract_results):
+        """Extract a 1-page scanned PDF with mocked Tesseract passes.
+
+        Args:
+            tesseract_results (list): (text, confidence) returned per pass
+
+        Returns:
+            tuple: (pages, mock of _run_tesseract)
+        """
+        pdf_binary = create_image_only_pdf("Tiered", num_pages=1)
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        ocr = self.OCRService(ocr_strategy='tiered', min_confidence=75)
+        with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                patch.object(self.OCRService, '_run_tesseract',
+                             side_effect=tesseract_results) as mock_run:
+            pages = ocr.extract_pages(pdf_binary)
+        return pages, mock_run
+
+    def test_tiered_ocr_clean_page_stays_on_fast_tier(self):
+        """Test that a good first pass is not escalated.
+
+        Given: A scanned page whose fast pass has high confidence
+        When: Extracting with the tiered strategy
+        Then: Tesseract runs once and the page records the 'fast' tier
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        good_text = "Facture 2026-001 Total CHF 1250.00 merci"
+        pages, mock_run = self._tiered_extract([(good_text, 92)])
+
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(pages[0]['tier'], 'fast')
+        self.assertEqual(pages[0]['dpi'], 200)
+        self.assertEqual(pages[0]['text'], good_text)
+
+    def test_tiered_ocr_escalates_low_confidence_page(self):
+        """Test escalation of a low-confidence page.
+
+        Given: A scanned page whose fast pass has low confidence
+        When: Extracting with the tiered strategy
+        Then: The page is re-OCR'd at higher DPI and the better result is kept
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        good_text = "Rechnung 2026-001 Summe CHF 1250.00 danke"
+        pages, mock_run = self._tiered_extract([("R3chnu 0O1", 41), (good_text, 88)])
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(pages[0]['tier'], 'accurate')
+        self.assertEqual(pages[0]['confidence'], 88)
+        self.assertEqual(pages[0]['text'], good_text)
+
+    def test_single_strategy_records_tier(self):
+        """Test that the default single strategy records its tier.
+
+        Given: A scanned page
+        When: Extracting with the default strategy
+        Then: The page records the 'single' tier at 300 DPI
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_image_only_pdf("Single", num_pages=1)
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        ocr = self.OCRService()
+        with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                patch.object(self.OCRService, '_extract_text_with_tesseract',
+                             return_value="Single pass text"):
+            pages = ocr.extract_pages(pdf_binary)
+
+        self.assertEqual(pages[0]['method'], 'tesseract')
+        self.assertEqual(pages[0]['tier'], 'single')
+        self.assertEqual(pages[0]['dpi'], 300)
+
+    # -------------------------------------------------------------------------
+    # Language Narrowing Tests
+    # -------------------------------------------------------------------------
+
+    def _narrowed_extract(self, first_page_text, num_pages=3):
+        """Extract a scanned PDF whose first page OCR returns a given text.
+
+        Returns:
+            list: lang argument received by each _ocr_page call, in order
+        """
+        pdf_binary = create_image_only_pdf("Narrowing", num_pages=num_pages)
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        langs = []
+
+        def fake_ocr(page, lang=None, deadline=None):
+            langs.append(lang)
+            return self._ocr_result(first_page_text if page.number == 0 else "Suite")
+
+        ocr = self.OCRService(narrow_language=True)
+        with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                patch.object(self.OCRService, '_ocr_page', side_effect=fake_ocr):
+            ocr.extract_pages(pdf_binary)
+        return langs
+
+    def test_narrow_language_after_first_page(self):
+        """Test that remaining pages are OCR'd with the detected language.
+
+        Given: A 3-page scanned PDF whose first page is clearly German
+        When: Extracting with language narrowing
+        Then: The first page uses all languages and the others 'deu' only
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        langs = self._narrowed_extract(
+            "Rechnung Nr. 42 Datum Lieferant Betrag MwSt Summe Zahlung netto")
+
+        self.assertEqual(langs, [None, 'deu', 'deu'])
+
+    def test_narrow_language_ambiguous_keeps_all_languages(self):
+        """Test that an ambiguous first page does not narrow the OCR.
+
+        Given: A scanned PDF whose first page has almost no keywords
+        When: Extracting with language narrowing
+        Then: Every page is OCR'd with the default languages
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        langs = self._narrowed_extract("Total 1250.00 CHF")
+
+        self.assertEqual(langs, [None, None, None])
+
+    def test_narrow_language_from_native_page(self):
+        """Test that native text decides the language before any OCR.
+
+        Given: A mixed PDF with a French native page and a scanned page
+        When: Extracting in hybrid mode with language narrowing
+        Then: The scanned page is OCR'd with 'fra' only
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_mixed_pdf(
+            "Facture fournisseur - montant TVA - paiement - livraison - remise")
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        ocr = self.OCRService(extraction_mode='hybrid', narrow_language=True)
+        with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                patch.object(self.OCRService, '_ocr_page',
+                             return_value=self._ocr_result("Annexe")) as mock_ocr:
+            ocr.extract_pages(pdf_binary)
+
+        self.assertEqual(mock_ocr.call_args.kwargs['lang'], 'fra')
+
+    # -------------------------------------------------------------------------
+    # OCR Engine Tests
+    # -------------------------------------------------------------------------
+
+    def test_ocr_engine_resolution(self):
+        """Test the choice of OCR engine.
+
+        Given: tesserocr installed or not
+        When: Creating services with the different engine settings
+        Then: 'auto' prefers tesserocr and falls back to pytesseract
+        """
+        with patch.object(self.ocr_module, 'TESSEROCR_AVAILABLE', True):
+            self.assertEqual(self.OCRService().ocr_engine, 'tesserocr')
+            self.assertEqual(
+                self.OCRService(ocr_engine='pytesseract').ocr_engine, 'pytesseract')
+        with patch.object(self.ocr_module, 'TESSEROCR_AVAILABLE', False):
+            self.assertEqual(self.OCRService().ocr_engine, 'pytesseract')
+            self.assertEqual(
+                self.OCRService(ocr_engine='tesserocr').ocr_engine, 'pytesseract')
+        with self.assertRaises(ValueError):
+            self.OCRService(ocr_engine='unknown')
+
+    def test_tesserocr_api_reused_across_pages(self):
+        """Test that the in-process API is created once per configuration.
+
+        Given: The tesserocr engine
+        When: Running Tesseract on two images with the same settings
+        Then: A single PyTessBaseAPI is created and cleared after each image
+        """
+        import threading
+
+        mock_tesserocr = MagicMock()
+        api = mock_tesserocr.PyTessBaseAPI.return_value
+        api.Recognize.return_value = True
+        api.GetUTF8Text.return_value = "Facture 42"
+        api.MeanTextConf.return_value = 91
+
+        with patch.object(self.ocr_module, 'TESSEROCR_AVAILABLE', True), \
+                patch.object(self.ocr_module, 'tesserocr', mock_tesserocr, create=True), \
+                patch.object(self.ocr_module, '_tesserocr_local', threading.local()):
+            ocr = self.OCRService(ocr_engine='tesserocr')
+            first = ocr._run_tesseract(MagicMock(), lang='fra', psm=3)
+            second = ocr._run_tesseract(MagicMock(), lang='fra', psm=3)
+
+        self.assertEqual(first, ("Facture 42", 91))
+        self.assertEqual(second, ("Facture 42", 91))
+        mock_tesserocr.PyTessBaseAPI.assert_called_once_with(lang='fra', psm=3)
+        self.assertEqual(api.Clear.call_count, 2)
+
+    def test_tesserocr_timeout_raises(self):
+        """Test that a cancelled in-process recognition fails the page.
+
+        Given: The tesserocr engine and a recognition hitting the timeout
+        When: Running Tesseract
+        Then: A ValueError mentioning the timeout is raised
+        """
+        import threading
+
+        mock_tesserocr = MagicMock()
+        mock_tesserocr.PyTessBaseAPI.return_value.Recognize.return_value = False
+
+        with patch.object(self.ocr_module, 'TESSEROCR_AVAILABLE', True), \
+                patch.object(self.ocr_module, 'tesserocr', mock_tesserocr, create=True), \
+                patch.object(self.ocr_module, '_tesserocr_local', threading.local()):
+            ocr = self.OCRService(ocr_engine='tesserocr', page_timeout=5)
+            with self.assertRaises(ValueError) as context:
+                ocr._extract_text_with_tesseract(MagicMock())
+
+        self.assertIn("timeout", str(context.exception).lower())
+
+    # -------------------------------------------------------------------------
+    # Page OCR Cache Tests
+    # -------------------------------------------------------------------------
+
+    def test_page_cache_skips_recurring_pages(self):
+        """Test that pages already OCR'd are served from the page cache.
+
+        Given: A 2-page scanned PDF already extracted once
+        When: The same pages are extracted again
+        Then: Tesseract is not called again and the texts are identical
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_image_only_pdf("Conditions generales", num_pages=2)
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        from js_invoice_ocr_ia.services import ocr_cache
+
+        ocr = self.OCRService(page_cache_size=10)
+        with patch.object(ocr_cache, '_page_cache', None), \
+                patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                patch.object(self.OCRService, '_ocr_page',
+                             side_effect=lambda page, lang=None, deadline=None: self._ocr_result(
+                                 f"CGV {page.number + 1}")) as mock_ocr:
+            first = ocr.extract_text_from_pdf(pdf_binary)
+            second = ocr.extract_text_from_pdf(pdf_binary)
+            stats = ocr_cache.get_page_cache().get_stats()
+
+        self.assertEqual(mock_ocr.call_count, 2)
+        self.assertEqual(first, second)
+        self.assertIn("--- Page 2 ---\nCGV 2", second)
+        self.assertEqual(stats['hits'], 2)
+
+    # -------------------------------------------------------------------------
+    # Page Iterator Tests
+    # -------------------------------------------------------------------------
+
+    def test_iter_page_texts_yields_pages_with_timings(self):
+        """Test the streaming page API on a native PDF.
+
+        Given: A 3-page native PDF
+        When: Iterating over iter_page_texts()
+        Then: One result per page is yielded in order, with method and duration
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_test_pdf("Streaming content for every page " * 3, num_pages=3)
+        ocr = self.OCRService()
+
+        pages = list(ocr.iter_page_texts(pdf_binary))
+
+        self.assertEqual([page['page'] for page in pages], [1, 2, 3])
+        for page in pages:
+            self.assertEqual(page['method'], 'native')
+            self.assertIn("Streaming content", page['text'])
+            self.assertGreaterEqual(page['duration'], 0)
+        self.assertEqual(ocr.format_pages(pages), ocr.extract_text_from_pdf(pdf_binary))
+
+    def test_iter_page_texts_is_lazy(self):
+        """Test that pages are OCR'd only as the consumer asks for them.
+
+        Given: A 3-page scanned PDF and sequential OCR
+        When: Only the first page is consumed and the iterator is closed
+        Then: Tesseract ran for the first page only
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_image_only_pdf("Lazy", num_pages=3)
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        ocr = self.OCRService()
+        with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                patch.object(self.OCRService, '_ocr_page',
+                             return_value=self._ocr_result("First page")) as mock_ocr:
+            pages = ocr.iter_page_texts(pdf_binary)
+            first = next(pages)
+            pages.close()
+
+        self.assertEqual(first['page'], 1)
+        self.assertEqual(first['text'], "First page")
+        self.assertIn('duration', first)
+        self.assertEqual(mock_ocr.call_count, 1)
+
+    # -------------------------------------------------------------------------
+    # Zone OCR Tests
+    # -------------------------------------------------------------------------
+
+    def test_extract_zones_native_page_reads_only_zone(self):
+        """Test that a native zone only returns the text inside its rectangle.
+
+        Given: A native page with a header line and a footer line
+        When: Extracting a zone covering the top of the page
+        Then: Only the header text is returned, with a zone marker
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((50, 72), "Facture No 2026-042 fournisseur Muster SA", fontsize=12)
+        page.insert_text((50, 780), "Total a payer CHF 1250.00 conditions 30 jours", fontsize=12)
+        pdf_binary = doc.tobytes()
+        doc.close()
+
+        ocr = self.OCRService()
+        zones = ocr.extract_zones(pdf_binary, {'header': {'page': 1, 'rect': [0, 0, 1, 0.2]}})
+
+        self.assertEqual(len(zones), 1)
+        self.assertEqual(zones[0]['zone'], 'header')
+        self.assertEqual(zones[0]['method'], 'native')
+        self.assertIn("2026-042", zones[0]['text'])
+        self.assertNotIn("1250.00", zones[0]['text'])
+        self.assertIn("--- Zone header (page 1) ---", ocr.format_pages(zones))
+
+    def test_extract_zones_scanned_page_ocrs_crops(self):
+        """Test that scanned zones OCR cropped images only.
+
+        Given: A 2-page scanned PDF and zones on the first and last page
+        When: Extracting the zones
+        Then: Tesseract receives one crop per zone, smaller than the page,
+              with the block segmentation mode, and zones keep mask order
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_image_only_pdf("Zones", num_pages=2)
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        zones = {
+            'header': {'page': 1, 'rect': [0, 0, 1, 0.25]},
+            'totals': {'page': -1, 'rect': [0.5, 0.75, 1, 1]},
+            'missing': {'page': 5, 'rect': [0, 0, 1, 1]},
+        }
+        seen = []
+
+        def fake_tesseract(image, lang, psm, tessdata_dir=None, timeout=None):
+            seen.append((image.size, psm))
+            return f"ZONE {len(seen)}", 90
+
+        ocr = self.OCRService(max_workers=2)
+        with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                patch.object(self.OCRService, '_run_tesseract', side_effect=fake_tesseract):
+            results = ocr.extract_zones(pdf_binary, zones)
+
+        full_width = round(595 * ocr.ZONE_DPI / 72)
+        self.assertEqual([r['zone'] for r in results], ['header', 'totals'])
+        self.assertEqual([r['page'] for r in results], [1, 2])
+        self.assertEqual(len(seen), 2)
+        for (width, height), psm in seen:
+            self.assertEqual(psm, ocr.ZONE_PSM)
+            self.assertLessEqual(width, full_width + 1)
+            self.assertLess(height, width)
+        self.assertTrue(all(r['confidence'] == 90 for r in results))
+
+    def test_extract_zones_document_budget_exhausted(self):
+        """Test that zone OCR counts against the document time budget.
+
+        Given: A scanned PDF, a zone and a document deadline already passed
+        When: Extracting the zones with both policies
+        Then: 'degrade' records the zone as 'timeout' without running
+              Tesseract, 'fail' raises
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_image_only_pdf("Zones", num_pages=1)
+        if pdf_binary is None:
+            self.skipTest("Pillow not available")
+
+        import time
+        zones = {'header': {'page': 1, 'rect': [0, 0, 1, 0.25]}}
+        deadline = time.monotonic() - 1
+        for policy in ('degrade', 'fail'):
+            ocr = self.OCRService(document_timeout=60, timeout_policy=policy)
+            with patch.object(self.ocr_module, 'TESSERACT_AVAILABLE', True), \
+                    patch.object(self.OCRService, '_run_tesseract') as mock_tesseract, \
+                    ocr.open_document(pdf_binary) as session:
+                if policy == 'degrade':
+                    results = ocr._extract_zones(session, zones, deadline=deadline)
+                    self.assertEqual(results[0]['method'], 'timeout')
+                    self.assertEqual(results[0]['text'], "")
+                else:
+                    with self.assertRaises(self.ocr_module.OCRTimeoutError):
+                        ocr._extract_zones(session, zones, deadline=deadline)
+            self.assertFalse(mock_tesseract.called)
+
+    # -------------------------------------------------------------------------
+    # Embedded Scan Image Tests
+    # -------------------------------------------------------------------------
+
+    def _create_scan_pdf(self, dpi, overlay_text=None):
+        """Create a 1-page A4 PDF holding one gray scan image at a given DPI."""
+        try:
+            import io
+            from PIL import Image as PILImage
+        except ImportError:
+            self.skipTest("Pillow not available")
+
+        size = (round(595 * dpi / 72), round(842 * dpi / 72))
+        image_bytes = io.BytesIO()
+        PILImage.new('L', size, 255).save(image_bytes, format='PNG')
+
+        doc = fitz.open()
+        page = doc.new_page(width=595, height=842)
+        page.insert_image(page.rect, stream=image_bytes.getvalue())
+        if overlay_text:
+            page.insert_text((50, 72), overlay_text, fontsize=12)
+        pdf_binary = doc.tobytes()
+        doc.close()
+        return pdf_binary, size
+
+    def _ocr_scan_page(self, pdf_binary, **service_kwargs):
+        """OCR the first page with the single strategy, capturing the image."""
+        images = []
+
+        def fake_tesseract(image, lang=None, timeout=None):
+            images.append(image)
+            return "Scan text"
+
+        ocr = self.OCRService(**service_kwargs)
+        doc = fitz.open(stream=pdf_binary, filetype="pdf")
+        with patch.object(self.OCRService, '_extract_text_with_tesseract',
+                          side_effect=fake_tesseract), \
+                patch.object(self.OCRService, '_convert_page_to_image',
+                             wraps=ocr._convert_page_to_image) as mock_render:
+            result = ocr._ocr_page(doc[0])
+        doc.close()
+        return result, images[0], mock_render
+
+    def test_embedded_scan_ocrd_at_native_resolution(self):
+        """Test that a single-image page is OCR'd from its embedded image.
+
+        Given: A page holding only a 200 DPI scan
+        When: OCR'ing the page with the single strategy (300 DPI)
+        Then: The page is not rendered, the image keeps its native size
+              and the result records 200 DPI
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary, size = self._create_scan_pdf(200)
+        result, image, mock_render = self._ocr_scan_page(pdf_binary)
+
+        self.assertFalse(mock_render.called)
+        self.assertEqual(image.size, size)
+        self.assertEqual(image.mode, 'L')
+        self.assertEqual(result['dpi'], 200)
+
+    def test_embedded_scan_low_resolution_or_overlay_rendered(self):
+        """Test the fallbacks to page rendering.
+
+        Given: A 96 DPI scan page, and a 200 DPI scan page with text on top
+        When: OCR'ing them
+        Then: Both pages are rendered at 300 DPI
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        for dpi, overlay in ((96, None), (200, "Stamp: PAID")):
+            pdf_binary, _size = self._create_scan_pdf(dpi, overlay_text=overlay)
+            result, _image, mock_render = self._ocr_scan_page(pdf_binary)
+
+            self.assertTrue(mock_render.called)
+            self.assertEqual(result['dpi'], 300)
+
+    def test_embedded_scan_too_large_not_decoded(self):
+        """Test that a scan far above the requested resolution is not decoded.
+
+        Given: A page holding only a 700 DPI scan
+        When: OCR'ing the page with the single strategy (300 DPI)
+        Then: The page is rendered at 300 DPI without decoding the image
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary, _size = self._create_scan_pdf(700)
+        with patch.object(self.OCRService, '_decode_embedded_image') as mock_decode:
+            result, _image, mock_render = self._ocr_scan_page(pdf_binary)
+
+        self.assertFalse(mock_decode.called)
+        self.assertTrue(mock_render.called)
+        self.assertEqual(result['dpi'], 300)
+
+    # -------------------------------------------------------------------------
+    # Large Document Tests
+    # -------------------------------------------------------------------------
+
+    def test_max_pages_caps_extraction(self):
+        """Test that pages after the page cap are not extracted.
+
+        Given: A 5-page native PDF and a cap of 2 pages
+        When: Extracting pages
+        Then: Only pages 1 and 2 are returned
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary = create_test_pdf("Releve de compte " * 10, num_pages=5)
+
+        pages = self.OCRService(max_pages=2).extract_pages(pdf_binary)
+
+        self.assertEqual([page['page'] for page in pages], [1, 2])
+
+    def test_page_memory_budget_lowers_render_dpi(self):
+        """Test that a page too large for the memory budget is rendered smaller.
+
+        Given: A 200 DPI scan page and a 4 MB page memory budget
+        When: OCR'ing the page (300 DPI requested)
+        Then: The page is rendered at a lower resolution fitting the budget
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary, _size = self._create_scan_pdf(200)
+        result, image, mock_render = self._ocr_scan_page(pdf_binary, page_memory_mb=4)
+
+        self.assertTrue(mock_render.called)
+        self.assertLess(result['dpi'], 200)
+        width, height = image.size
+        self.assertLessEqual(width * height * 2, 4 * 1024 * 1024)
+
+    # -------------------------------------------------------------------------
+    # Orientation Tests
+    # -------------------------------------------------------------------------
+
+    def _ocr_rotated_scan(self, texts, rotation):
+        """OCR a scan page with auto_rotate, mocking Tesseract and OSD.
+
+        Args:
+            texts (list): Text returned by each Tesseract pass
+            rotation (int): Rotation returned by orientation detection
+
+        Returns:
+            tuple: (result, images passed to Tesseract, mock of _detect_rotation)
+        """
+        pdf_binary, _size = self._create_scan_pdf(200)
+        images = []
+
+        def fake_tesseract(image, lang=None, timeout=None):
+            images.append(image)
+            return texts[len(images) - 1]
+
+        ocr = self.OCRService(auto_rotate=True)
+        doc = fitz.open(stream=pdf_binary, filetype="pdf")
+        with patch.object(self.OCRService, '_extract_text_with_tesseract',
+                          side_effect=fake_tesseract), \
+                patch.object(self.OCRService, '_detect_rotation',
+                             return_value=rotation) as mock_detect:
+            result = ocr._ocr_page(doc[0])
+        doc.close()
+        return result, images, mock_detect
+
+    def test_rotated_page_is_ocrd_again_upright(self):
+        """Test that a garbage first pass triggers OSD and a rotated re-OCR.
+
+        Given: A scan whose first pass gives symbols only, detected at 90 degrees
+        When: OCR'ing the page with auto_rotate
+        Then: The page is OCR'd again from a rotated image and records 90
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        result, images, mock_detect = self._ocr_rotated_scan(
+            ["~ | ,^ ʇ ɹ ǝ ;; _", "Facture numero 42 Total a payer"], 90
+        )
+
+        self.assertEqual(mock_detect.call_count, 1)
+        self.assertEqual(len(images), 2)
+        self.assertEqual(images[1].size, images[0].size[::-1])
+        self.assertEqual(result['rotation'], 90)
+        self.assertEqual(result['text'], "Facture numero 42 Total a payer")
+
+    def test_upright_page_skips_orientation_detection(self):
+        """Test that a page read as words never runs OSD.
+
+        Given: A scan whose first pass gives dictionary-like text
+        When: OCR'ing the page with auto_rotate
+        Then: Orientation is not detected and the page records no rotation
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        result, images, mock_detect = self._ocr_rotated_scan(
+            ["Rechnung Nummer 42 Gesamtbetrag CHF 1250.00"], 180
+        )
+
+        self.assertFalse(mock_detect.called)
+        self.assertEqual(len(images), 1)
+        self.assertEqual(result['rotation'], 0)
+
+    def test_detect_rotation_uses_osd_confidence(self):
+        """Test reading pytesseract OSD output.
+
+        Given: OSD results with high and low orientation confidence, and a
+               page Tesseract refuses
+        When: Detecting the rotation
+        Then: Only the confident rotation is returned, failures give 0
+        """
+        if not self.ocr_module.PYTESSERACT_INSTALLED:
+            self.skipTest("pytesseract not installed")
+
+        ocr = self.OCRService(ocr_engine='pytesseract')
+        pytesseract = self.ocr_module.pytesseract
+        outputs = [
+            {'rotate': 180, 'orientation_conf': 9.5},
+            {'rotate': 90, 'orientation_conf': 0.4},
+            pytesseract.TesseractError(1, "Too few characters. Skipping this page"),
+        ]
+        with patch.object(pytesseract, 'image_to_osd', side_effect=outputs):
+            rotations = [ocr._detect_rotation(object()) for _output in outputs]
+
+        self.assertEqual(rotations, [180, 0, 0])
+
+    def test_word_ratio_separates_text_from_garbage(self):
+        """Test the dictionary-like word ratio."""
+        ocr = self.OCRService()
+
+        self.assertGreater(ocr._get_word_ratio("Facture du 12.03.2026, total: CHF 250.00"), 0.9)
+        self.assertLess(ocr._get_word_ratio("~ | ,^ ʇ ɹ ǝ ;; _ xzq"), 0.2)
+        self.assertIsNone(ocr._get_word_ratio("123 456"))
+        self.assertIsNone(ocr._get_word_ratio(""))
+
+    def test_blank_page_skips_orientation_check(self):
+        """Test that pages without words get no orientation pass.
+
+        Given: OCR results of a blank page and of a numbers-only page, with
+               a low confidence
+        When: Checking if they need an orientation check
+        Then: No check is needed, while garbage text still needs one
+        """
+        ocr = self.OCRService(auto_rotate=True)
+
+        for text in ("", "  \n ", "123 456"):
+            self.assertFalse(ocr._needs_orientation_check({'text': text, 'confidence': 0}))
+        self.assertTrue(ocr._needs_orientation_check({'text': "~ | ,^ xzq", 'confidence': None}))
+
+    # -------------------------------------------------------------------------
+    # Image Pre-processing Tests
+    # -------------------------------------------------------------------------
+
+    def test_preprocessing_runs_before_tesseract(self):
+        """Test that enabled pre-processing steps run on the OCR image.
+
+        Given: A scan page and a service with binarize and deskew enabled
+        When: OCR'ing the page
+        Then: Tesseract receives a black and white image and the result
+              records the step timings and the skew angle
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+        from js_invoice_ocr_ia.services.image_preprocessing import NUMPY_AVAILABLE
+        if not NUMPY_AVAILABLE:
+            self.skipTest("NumPy not available")
+
+        pdf_binary, _size = self._create_scan_pdf(200)
+        result, image, _mock_render = self._ocr_scan_page(
+            pdf_binary, preprocessing=('deskew', 'binarize')
+        )
+
+        self.assertLessEqual(set(image.getdata()), {0, 255})
+        report = result['preprocessing']
+        self.assertEqual(list(report['timings']), ['binarize', 'deskew'])
+        self.assertIsNotNone(report['skew_angle'])
+
+    def test_preprocessing_disabled_by_default(self):
+        """Test that pages are OCR'd as rendered without pre-processing."""
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary, _size = self._create_scan_pdf(200)
+        result, _image, _mock_render = self._ocr_scan_page(pdf_binary)
+
+        self.assertIsNone(result['preprocessing'])
+
+    def test_unknown_preprocessing_step_rejected(self):
+        """Test that an unknown pre-processing step raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.OCRService(preprocessing=('sharpen',))
+
+    # -------------------------------------------------------------------------
+    # Searchable PDF Tests
+    # -------------------------------------------------------------------------
+
+    def test_text_layer_makes_scan_native(self):
+        """Test writing OCR text back into a scanned PDF.
+
+        Given: A scanned page and its OCR result
+        When: Adding the text layer
+        Then: The page reads as native text with the OCR lines, and is not
+              OCR'd again on the next extraction
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary, _size = self._create_scan_pdf(200)
+        ocr = self.OCRService()
+        text = "Facture numero 42\nTotal a payer CHF 1250.00 €\n\nMerci pour votre confiance"
+        pages = [{'page': 1, 'text': text, 'method': 'tesseract'}]
+
+        searchable = ocr.add_text_layer(pdf_binary, pages)
+
+        self.assertFalse(ocr._is_native_pdf(pdf_binary))
+        self.assertTrue(ocr._is_native_pdf(searchable))
+        with patch.object(self.OCRService, '_ocr_page') as mock_ocr:
+            result = ocr.extract_pages(searchable)
+        self.assertFalse(mock_ocr.called)
+        self.assertEqual(result[0]['method'], 'native')
+        self.assertEqual(result[0]['text'].split(), text.split())
+
+    def test_text_layer_places_words_on_their_boxes(self):
+        """Test that OCR words are written where the image shows them.
+
+        Given: A scanned page and OCR words with their relative boxes
+        When: Adding the text layer
+        Then: Each word of the text layer lies inside its box
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary, _size = self._create_scan_pdf(200)
+        words = [
+            [0.1, 0.1, 0.3, 0.12, 'Facture', 90],
+            [0.6, 0.8, 0.7, 0.82, '1250.00', 88],
+        ]
+        pages = [{'page': 1, 'text': 'Facture\n1250.00', 'method': 'tesseract', 'words': words}]
+
+        searchable = self.OCRService().add_text_layer(pdf_binary, pages)
+
+        doc = fitz.open(stream=searchable, filetype="pdf")
+        page_rect = doc[0].rect
+        placed = {word[4]: fitz.Rect(word[:4]) for word in doc[0].get_text('words')}
+        doc.close()
+        self.assertEqual(set(placed), {'Facture', '1250.00'})
+        for x0, y0, x1, y1, text, _confidence in words:
+            box = fitz.Rect(x0, y0, x1, y1) * fitz.Matrix(page_rect.width, page_rect.height)
+            center = (placed[text].tl + placed[text].br) / 2
+            self.assertTrue(box.contains(center), text)
+
+    def test_text_layer_skips_pages_not_ocrd(self):
+        """Test that native, degraded and zone results add no text layer."""
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        pdf_binary, _size = self._create_scan_pdf(200)
+        pages = [
+            {'page': 1, 'text': 'Native text', 'method': 'native'},
+            {'page': 1, 'text': '', 'method': 'timeout'},
+            {'page': 1, 'text': 'IBAN CH93', 'method': 'tesseract', 'zone': 'iban'},
+        ]
+
+        self.assertIsNone(self.OCRService().add_text_layer(pdf_binary, pages))
+
+    # -------------------------------------------------------------------------
+    # Word Box Tests
+    # -------------------------------------------------------------------------
+
+    def test_native_words_relative_to_page(self):
+        """Test collecting the word boxes of a native page.
+
+        Given: A native page, displayed rotated by 90 degrees
+        When: Extracting it with collect_words
+        Then: Each word has a box relative to the displayed page, the
+              header line being on the right side once rotated
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        doc = fitz.open()
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((50, 72), "Facture No 2026-042 fournisseur Muster SA, conditions 30 jours",
+                         fontsize=12)
+        page.set_rotation(90)
+        pdf_binary = doc.tobytes()
+        doc.close()
+
+        pages = self.OCRService(collect_words=True).extract_pages(pdf_binary)
+
+        words = pages[0]['words']
+        self.assertEqual([word[4] for word in words[:3]], ['Facture', 'No', '2026-042'])
+        x0, y0, x1, y1, _text, confidence = words[0]
+        self.assertIsNone(confidence)
+        self.assertTrue(0.8 < x0 < x1 <= 1.0)
+        self.assertTrue(0.0 <= y0 < y1 < 0.2)
+        self.assertNotIn('words', self.OCRService().extract_pages(pdf_binary)[0])
+
+    def test_ocr_words_mapped_back_through_rotation(self):
+        """Test that OCR word boxes are given in page coordinates.
+
+        Given: A scan OCR'd after a 90 degree rotation, Tesseract finding a
+               word in the top right corner of the rotated image
+        When: Converting its box
+        Then: The word is in the top left corner of the page
+        """
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+        def fake_tesseract(image, lang, psm, tessdata_dir=None, timeout=None, with_words=False):
+            width, height = image.size
+            box = (width * 0.9, 0, width, height * 0.2)
+            return "Muster", 90, [(*box, 'Muster', 90)]
+
+        pdf_binary, _size = self._create_scan_pdf(200)
+        ocr = self.OCRService(collect_words=True)
+        doc = fitz.open(stream=pdf_binary, filetype="pdf")
+        with patch.object(self.OCRService, '_run_tesseract', side_effect=fake_tesseract):
+            result = ocr._ocr_page_passes(doc[0], None, None, ocr._extract_embedded_image(doc[0]),
+                                          rotation=90)
+        doc.close()
+
+        x0, y0, x1, y1, text, confidence = result['words'][0]
+        self.assertEqual((text, confidence), ('Muster', 90))
+        for value, expected in zip((x0, y0, x1, y1), (0.0, 0.0, 0.2, 0.1)):
+            self.assertAlmostEqual(value, expected, delta=0.01)
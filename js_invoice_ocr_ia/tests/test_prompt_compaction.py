@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+# Part of js_invoice_ocr_ia. See LICENSE file for full copyright and licensing details.
+
+"""Tests for the prompt text compaction.
+
+These tests verify that PromptCompactor removes the text carrying no invoice
+data, enforces its token budget and reports the tokens removed.
+"""
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install', 'jsocr', 'jsocr_ai')
+class TestPromptCompaction(TransactionCase):
+    """Test cases for PromptCompactor."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures."""
+        super().setUpClass()
+        from js_invoice_ocr_ia.services.prompt_compaction import PromptCompactor
+        cls.PromptCompactor = PromptCompactor
+
+    TEXT = "\n".join([
+        "--- Page 1 ---",
+        "Muller SA   Rue du Lac 1   1200 Geneve",
+        "Facture F-2026-001",
+        "Date:     15.01.2026",
+        "",
+        "Conseil    8   150.00   1200.00",
+        "Page 1 / 2",
+        "--- Page 2 ---",
+        "Muller SA   Rue du Lac 1   1200 Geneve",
+        "Total TTC    1292.40",
+        "",
+        "Conditions generales de vente",
+        "Toute reclamation doit etre faite",
+        "dans les 8 jours.",
+        "",
+        "Merci de votre confiance",
+        "Page 2 / 2",
+    ])
+
+    def test_compact_removes_noise(self):
+        """Test removing page markers, repeated edges, boilerplate and spaces.
+
+        Given: A two-page text with a repeated letterhead and page footer,
+               general terms and OCR space runs
+        When: Compacting the text
+        Then: Only the first letterhead and footer and the invoice data
+              remain, each step reports the tokens it removed
+        """
+        result = self.PromptCompactor().compact(self.TEXT)
+
+        self.assertEqual(result['text'], "\n".join([
+            "Muller SA Rue du Lac 1 1200 Geneve",
+            "Facture F-2026-001",
+            "Date: 15.01.2026",
+            "Conseil 8 150.00 1200.00",
+            "Page 1 / 2",
+            "Total TTC 1292.40",
+            "Merci de votre confiance",
+        ]))
+        for step in ('page_markers', 'headers_footers', 'boilerplate', 'whitespace'):
+            self.assertGreater(result['removed'][step], 0, step)
+        self.assertEqual(result['removed']['budget'], 0)
+        self.assertEqual(
+            result['tokens_removed'], result['tokens_before'] - result['tokens_after']
+        )
+        self.assertEqual(result['tokens_after'], self.PromptCompactor().count_tokens(result['text']))
+
+    def test_compact_boilerplate_without_blank_lines(self):
+        """Test that boilerplate removal keeps the header data that follows it.
+
+        Given: Native text without blank lines, a general terms line and its
+               continuation near the top, followed by the invoice header data
+        When: Compacting the text
+        Then: Only the general terms line and its continuation are removed
+        """
+        header = [
+            "Facture 2026-001",
+            "Hans Muster AG",
+            "Client: Hans Muster",
+            "TVA CHE-123.456.789",
+            "IBAN CH93 0076 2011 6238 5295 7",
+            "Reference 21 00000 00003 13947 14300 09017",
+            "Date 15.01.2026",
+            "Total CHF 100.00",
+        ]
+        text = "\n".join([
+            "ACME SA",
+            "Conditions générales: voir www.muster.ch",
+            "applicables a toute commande",
+            *header,
+        ])
+
+        kept = self.PromptCompactor().compact(text)['text'].split("\n")
+
+        self.assertEqual(kept, ["ACME SA", *header])
+
+    def test_compact_boilerplate_paragraph_keeps_data_lines(self):
+        """Test that identifiers inside a boilerplate paragraph are kept.
+
+        Given: A general terms paragraph closed by a blank line, holding an
+               IBAN line
+        When: Compacting the text
+        Then: The paragraph is removed except the IBAN line
+        """
+        text = "\n".join([
+            "Allgemeine Geschäftsbedingungen",
+            "Zahlbar innert 30 Tagen auf",
+            "IBAN CH93 0076 2011 6238 5295 7",
+            "",
+            "Total CHF 100.00",
+        ])
+
+        kept = self.PromptCompactor().compact(text)['text'].split("\n")
+
+        self.assertEqual(kept, ["IBAN CH93 0076 2011 6238 5295 7", "Total CHF 100.00"])
+
+    def test_compact_short_pages_keep_repeated_values(self):
+        """Test that short repeated values of short pages are not headers.
+
+        Given: Two short pages whose items share a quantity and an amount,
+               and a repeated letterhead
+        When: Compacting the text
+        Then: Only the letterhead of page 2 is removed
+        """
+        text = "\n".join([
+            "--- Page 1 ---",
+            "ACME SA Lausanne",
+            "Article A", "1", "50.00",
+            "--- Page 2 ---",
+            "ACME SA Lausanne",
+            "Article B", "1", "50.00",
+        ])
+
+        result = self.PromptCompactor().compact(text)
+
+        self.assertEqual(result['text'].split("\n"), [
+            "ACME SA Lausanne", "Article A", "1", "50.00", "Article B", "1", "50.00",
+        ])
+
+    def test_compact_keeps_zone_markers(self):
+        """Test that supplier mask zone markers are kept.
+
+        Given: Zone extraction text
+        When: Compacting the text
+        Then: The zone markers naming the data remain
+        """
+        text = "--- Zone invoice_number (page 1) ---\nF-2026-001"
+
+        result = self.PromptCompactor().compact(text)
+
+        self.assertEqual(result['text'], text)
+        self.assertEqual(result['tokens_removed'], 0)
+
+    def test_compact_token_budget(self):
+        """Test enforcing the token budget.
+
+        Given: A long text and a budget of 100 tokens
+        When: Compacting the text
+        Then: The result fits the budget, keeps the beginning and the end
+              and marks the removed middle lines
+        """
+        lines = [f"Ligne {index} description du service {index}" for index in range(200)]
+        compactor = self.PromptCompactor(max_tokens=100)
+
+        result = compactor.compact("\n".join(lines))
+
+        self.assertLessEqual(result['tokens_after'], 100)
+        kept = result['text'].split("\n")
+        self.assertEqual(kept[0], lines[0])
+        self.assertEqual(kept[-1], lines[-1])
+        self.assertIn(compactor.ELLIPSIS, kept)
+        self.assertGreater(result['removed']['budget'], 0)
+
+    def test_compact_token_budget_truncates_long_lines(self):
+        """Test the budget when the first and last lines exceed their share.
+
+        Given: Three lines of 100 tokens each and a budget of 50 tokens
+        When: Compacting the text
+        Then: The first and last lines are truncated around the ellipsis,
+              the result fits the budget
+        """
+        lines = ["A" * 400, "B" * 400, "C" * 400]
+        compactor = self.PromptCompactor(max_tokens=50)
+
+        result = compactor.compact("\n".join(lines))
+
+        kept = result['text'].split("\n")
+        self.assertEqual(len(kept), 3)
+        self.assertTrue(kept[0].startswith("A"))
+        self.assertEqual(kept[1], compactor.ELLIPSIS)
+        self.assertTrue(kept[2].startswith("C"))
+        self.assertLessEqual(result['tokens_after'], 50)
+
+    def test_compact_empty_text(self):
+        """Test compacting an empty text."""
+        result = self.PromptCompactor(max_tokens=10).compact('')
+
+        self.assertEqual(result['text'], '')
+        self.assertEqual(result['tokens_removed'], 0)
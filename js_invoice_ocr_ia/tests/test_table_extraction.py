@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+# Part of js_invoice_ocr_ia. See LICENSE file for full copyright and licensing details.
+
+"""Tests for the table line item extraction of native PDFs.
+
+These tests verify that ruled and borderless line item tables are read
+into lines, reconciled with the document totals, and left out of the
+header text sent to the AI.
+"""
+
+from odoo.tests import TransactionCase, tagged
+
+try:
+    import fitz  # PyMuPDF
+    FITZ_AVAILABLE = True
+except ImportError:
+    FITZ_AVAILABLE = False
+
+
+@tagged('post_install', '-at_install', 'jsocr', 'jsocr_ocr')
+class TestTableExtractor(TransactionCase):
+    """Test cases for TableExtractor."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures."""
+        super().setUpClass()
+        from js_invoice_ocr_ia.services.ocr_service import PDFDocumentSession
+        from js_invoice_ocr_ia.services.table_extraction import TableExtractor
+        cls.PDFDocumentSession = PDFDocumentSession
+        cls.TableExtractor = TableExtractor
+
+    def setUp(self):
+        super().setUp()
+        if not FITZ_AVAILABLE:
+            self.skipTest("PyMuPDF not available")
+
+    def _create_invoice_pdf(self, rows, totals, ruled=True):
+        """Create a native invoice PDF with a line item table.
+
+        Args:
+            rows (list): Table rows (header first) as tuples of 4 cells
+            totals (list): (label, amount) printed under the table
+            ruled (bool): Draw the table borders
+
+        Returns:
+            bytes: PDF content
+        """
+        doc = fitz.open()
+        page = doc.new_page(width=595, height=842)
+        page.insert_text((50, 60), "Muster AG", fontsize=14)
+        page.insert_text((50, 80), "Facture 2026-042   Date: 12.03.2026", fontsize=10)
+
+        columns = [50, 300, 380, 480, 560]
+        top = 120
+        for index, row in enumerate(rows):
+            for column, cell in enumerate(row):
+                page.insert_text((columns[column] + 4, top + 20 * index + 14), cell, fontsize=10)
+        if ruled:
+            bottom = top + 20 * len(rows)
+            for index in range(len(rows) + 1):
+                page.draw_line((columns[0], top + 20 * index), (columns[-1], top + 20 * index))
+            for x in columns:
+                page.draw_line((x, top), (x, bottom))
+
+        y = top + 20 * len(rows) + 30
+        for label, amount in totals:
+            page.insert_text((380, y), label, fontsize=10)
+            page.insert_text((480, y), amount, fontsize=10)
+            y += 15
+
+        pdf_binary = doc.tobytes()
+        doc.close()
+        return pdf_binary
+
+    def _extract(self, pdf_binary):
+        """Extract the line items of a PDF through an opened session."""
+        with self.PDFDocumentSession(pdf_binary) as session:
+            return self.TableExtractor().extract_line_items(session)
+
+    ROWS = [
+        ("Désignation", "Qté", "Prix unitaire", "Montant"),
+        ("Conseil informatique", "2", "150.00", "300.00"),
+        ("Licence logiciel annuelle", "1", "1'200.00", "1'200.00"),
+        ("Frais de port", "3", "5,50", "16,50"),
+    ]
+    TOTALS = [("Total HT", "1'516.50"), ("TVA 8.1%", "122.84"), ("Total TTC", "1'639.34")]
+
+    def test_ruled_table_lines_reconciled(self):
+        """Test reading a ruled line item table.
+
+        Given: A native invoice with a bordered table and its totals
+        When: Extracting the line items
+        Then: Rows become lines with parsed numbers, their sum matches
+              'Total HT' and the header text keeps the totals but no rows
+        """
+        pdf_binary = self._create_invoice_pdf(self.ROWS, self.TOTALS)
+
+        result = self._extract(pdf_binary)
+
+        self.assertEqual(len(result['lines']), 3)
+        self.assertEqual(result['lines'][1], {
+            'description': 'Licence logiciel annuelle',
+            'quantity': 1.0,
+            'unit_price': 1200.0,
+            'amount': 1200.0,
+        })
+        self.assertTrue(result['reconciled'])
+        self.assertEqual(result['document_total'], 1516.5)
+        self.assertIn("Muster AG", result['header_text'])
+        self.assertIn("Total TTC 1'639.34", result['header_text'])
+        self.assertNotIn("Conseil", result['header_text'])
+
+    def test_borderless_table_lines_reconciled(self):
+        """Test that a table aligned on whitespace only is also read."""
+        pdf_binary = self._create_invoice_pdf(self.ROWS, self.TOTALS, ruled=False)
+
+        result = self._extract(pdf_binary)
+
+        self.assertEqual([line['amount'] for line in result['lines']], [300.0, 1200.0, 16.5])
+        self.assertTrue(result['reconciled'])
+
+    def test_lines_not_matching_total_not_reconciled(self):
+        """Test that rows missing from the table leave the lines untrusted.
+
+        Given: A table whose rows do not add up to any printed total
+        When: Extracting the line items
+        Then: The lines are returned but not reconciled
+        """
+        pdf_binary = self._create_invoice_pdf(
+            self.ROWS, [("Total HT", "1'716.50"), ("Total TTC", "1'855.54")]
+        )
+
+        result = self._extract(pdf_binary)
+
+        self.assertEqual(len(result['lines']), 3)
+        self.assertFalse(result['reconciled'])
+        self.assertIsNone(result['document_total'])
+
+    def test_lines_matching_subtotal_not_reconciled(self):
+        """Test that subtotals and carried totals do not reconcile the lines.
+
+        Given: A table whose rows add up to a 'Sous-total' and a
+               'Total a reporter' row only
+        When: Extracting the line items
+        Then: The lines are not reconciled
+        """
+        pdf_binary = self._create_invoice_pdf(self.ROWS, [
+            ("Sous-total", "1'516.50"),
+            ("Total à reporter", "1'516.50"),
+            ("Total TTC", "2'855.54"),
+        ])
+
+        result = self._extract(pdf_binary)
+
+        self.assertFalse(result['reconciled'])
+        self.assertIsNone(result['document_total'])
+
+    def test_no_line_item_table(self):
+        """Test that a PDF without a recognizable header gives None."""
+        rows = [("Nom", "Ville", "Pays", "Code")] + [("Muster", "Bern", "CH", "3000")] * 2
+        pdf_binary = self._create_invoice_pdf(rows, [])
+
+        self.assertIsNone(self._extract(pdf_binary))
+
+    def test_long_document_skipped(self):
+        """Test that documents over MAX_PAGES pages are left to the AI.
+
+        Given: An invoice with a line item table followed by enough pages
+               to exceed MAX_PAGES
+        When: Extracting the line items
+        Then: None is returned, the header text would miss the last pages
+        """
+        doc = fitz.open(stream=self._create_invoice_pdf(self.ROWS, self.TOTALS), filetype="pdf")
+        for _index in range(self.TableExtractor.MAX_PAGES):
+            doc.new_page(width=595, height=842).insert_text((50, 60), "Annexe", fontsize=10)
+        pdf_binary = doc.tobytes()
+        doc.close()
+
+        self.assertIsNone(self._extract(pdf_binary))
+
+    def test_parse_amount_formats(self):
+        """Test Swiss and European number formats."""
+        extractor = self.TableExtractor()
+
+        self.assertEqual(extractor.parse_amount("1'250.50"), 1250.5)
+        self.assertEqual(extractor.parse_amount("1.250,50"), 1250.5)
+        self.assertEqual(extractor.parse_amount("CHF 16,50"), 16.5)
+        self.assertEqual(extractor.parse_amount("10.00-"), -10.0)
+        self.assertIsNone(extractor.parse_amount("Forfait"))
+
+    def test_three_decimal_quantity_and_unit_price(self):
+        """Test quantity and unit price cells with 3 decimals.
+
+        Given: Rows with a 3-decimal fuel price, a 3-decimal quantity and a
+               thousands separator in a unit price
+        When: Adding the rows to the line items
+        Then: The readings whose product is the line amount are used
+        """
+        extractor = self.TableExtractor()
+        roles = {'description': 0, 'quantity': 1, 'unit_price': 2, 'amount': 3}
+        lines = []
+
+        extractor._add_row(lines, ['Diesel', '40', '1.875', '75.00'], roles)
+        extractor._add_row(lines, ['Cable', '1.000', '50.00', '50.00'], roles)
+        extractor._add_row(lines, ['Serveur', '2', '1.250', '2500.00'], roles)
+
+        self.assertEqual(
+            [(line['quantity'], line['unit_price']) for line in lines],
+            [(40.0, 1.875), (1.0, 50.0), (2.0, 1250.0)]
+        )
+
+    def test_quantity_with_unit_and_unparseable_cells(self):
+        """Test quantity cells holding a unit or no number.
+
+        Given: Rows with '2 Stk' and '1,5 h' quantities, then a row whose
+               quantity cell is not a number
+        When: Adding the rows to the line items
+        Then: The leading numbers are read, the last row is unreliable
+        """
+        extractor = self.TableExtractor()
+        roles = {'description': 0, 'quantity': 1, 'unit_price': 2, 'amount': 3}
+        lines = []
+
+        extractor._add_row(lines, ['Stecker', '2 Stk', '12.50', '25.00'], roles)
+        extractor._add_row(lines, ['Montage', '1,5 h', '120.00', '180.00'], roles)
+        extractor._add_row(lines, ['Pauschale', 'nach Aufwand', '', '90.00'], roles)
+
+        self.assertEqual(
+            [(line['quantity'], line['unit_price']) for line in lines],
+            [(2.0, 12.5), (1.5, 120.0), (1.0, 90.0)]
+        )
+        self.assertEqual([line.get('unreliable', False) for line in lines], [False, False, True])
+
+    def test_unreliable_row_not_reconciled(self):
+        """Test that a table with an unreadable quantity is not reconciled.
+
+        Given: A table whose rows add up to 'Total HT', one of them with a
+               quantity cell that is not a number
+        When: Extracting the line items
+        Then: The lines are returned without flag but not reconciled
+        """
+        rows = self.ROWS[:3] + [("Frais de port", "forfait", "5,50", "16,50")]
+        pdf_binary = self._create_invoice_pdf(rows, self.TOTALS)
+
+        result = self._extract(pdf_binary)
+
+        self.assertEqual(result['document_total'], 1516.5)
+        self.assertFalse(result['reconciled'])
+        self.assertNotIn('unreliable', result['lines'][-1])
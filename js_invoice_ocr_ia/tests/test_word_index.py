@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Part of js_invoice_ocr_ia. See LICENSE file for full copyright and licensing details.
+
+"""Tests for the word bounding box index.
+
+These tests verify the columnar serialization of WordIndex and the lookup
+of words by region and by value.
+"""
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install', 'jsocr', 'jsocr_ocr')
+class TestWordIndex(TransactionCase):
+    """Test cases for WordIndex."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures."""
+        super().setUpClass()
+        from js_invoice_ocr_ia.services.word_index import WordIndex
+        cls.WordIndex = WordIndex
+
+    PAGES = [
+        {'page': 1, 'words': [
+            [0.08, 0.05, 0.20, 0.07, 'Müller', None],
+            [0.21, 0.05, 0.27, 0.07, 'SA', None],
+            [0.60, 0.05, 0.75, 0.07, 'Facture', None],
+            [0.76, 0.05, 0.90, 0.07, 'F-2026-001', None],
+        ]},
+        {'page': 2, 'text': '', 'method': 'timeout'},
+        {'page': 3, 'words': [
+            [0.60, 0.80, 0.70, 0.82, 'Total', 91],
+            [0.72, 0.80, 0.78, 0.82, 'CHF', 88],
+            [0.80, 0.80, 0.90, 0.82, "1'292.40", 76],
+        ]},
+    ]
+
+    def test_roundtrip_keeps_words(self):
+        """Test serializing and loading an index.
+
+        Given: Words of two pages, one page without words
+        When: Serializing the index and loading it back
+        Then: Every word keeps its page, box, text and confidence
+        """
+        index = self.WordIndex.from_pages(self.PAGES)
+
+        loaded = self.WordIndex.from_bytes(index.to_bytes())
+
+        self.assertEqual(len(loaded), 7)
+        word = loaded.get_word(0)
+        self.assertEqual(word['page'], 1)
+        self.assertEqual(word['text'], 'Müller')
+        self.assertIsNone(word['confidence'])
+        self.assertAlmostEqual(word['rect'][2], 0.20, places=5)
+        self.assertEqual(loaded.get_word(6)['text'], "1'292.40")
+        self.assertEqual(loaded.get_word(6)['confidence'], 76)
+
+    def test_find_in_rect(self):
+        """Test reading the words of a page region.
+
+        Given: An index with a header and a total line
+        When: Looking up the top right area of page 1 and of page 3
+        Then: Only the words mostly inside the area of that page are found
+        """
+        index = self.WordIndex.from_pages(self.PAGES)
+
+        words = index.find_in_rect(1, [0.5, 0.0, 1.0, 0.1])
+        self.assertEqual([word['text'] for word in words], ['Facture', 'F-2026-001'])
+        self.assertEqual(index.find_in_rect(3, [0.5, 0.0, 1.0, 0.1]), [])
+        # Half of 'SA' is outside the rect: below the default overlap
+        words = index.find_in_rect(1, [0.0, 0.0, 0.24, 0.1])
+        self.assertEqual([word['text'] for word in words], ['Müller'])
+
+    def test_find_value(self):
+        """Test locating extracted values.
+
+        Given: An index with a supplier name, an invoice number and a total
+        When: Looking up text values and an amount
+        Then: Multi-word values give the union box, amounts match any format
+        """
+        index = self.WordIndex.from_pages(self.PAGES)
+
+        matches = index.find_value('muller sa')
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0]['page'], 1)
+        self.assertEqual(matches[0]['text'], 'Müller SA')
+        self.assertAlmostEqual(matches[0]['rect'][2], 0.27, places=5)
+
+        self.assertEqual(index.find_value('F-2026-001')[0]['page'], 1)
+        total = index.find_value(1292.4)
+        self.assertEqual(len(total), 1)
+        self.assertEqual(total[0]['page'], 3)
+        self.assertEqual(total[0]['confidence'], 76)
+        self.assertEqual(index.find_value('Facture', page=3), [])
+
+    def test_invalid_data_rejected(self):
+        """Test that data which is not a word index raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.WordIndex.from_bytes(b'not an index')